@@ -2,8 +2,10 @@
 """
 CryptoGene-Omega: Eternal Autonomous Agent
 """
+import argparse
 import asyncio
 import logging
+import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
@@ -11,6 +13,10 @@ import json
 from .executor import StrategyExecutor
 from .orchestrator import TaskOrchestrator
 from .state_manager import StateManager
+from .events import Event, EventBus
+from .market_cache import MarketDataCache
+from .scheduler import Scheduler
+from .profiler import CycleProfiler
 from ..strategies import (
     YieldHarvester,
     SignalSeeker,
@@ -20,8 +26,10 @@ from ..strategies import (
     BeliefRewrite
 )
 from ..intelligence.genetic_algorithm import GeneticAlgorithm
+from ..intelligence.fitness_pool import ParallelFitnessEvaluator
+from ..intelligence.fitness_cache import FitnessCache
 from ..integrations.telegram import TelegramClient
-from ..integrations.database import DatabaseClient
+from ..integrations.database import create_database_client
 
 logging.basicConfig(
     level=logging.INFO,
@@ -35,13 +43,54 @@ class CryptoGeneOmega:
     Eternal autonomous agent with self-adaptation capabilities.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        concurrent_cycle: bool = True,
+        max_concurrency: int = 6,
+        strategy_timeout: Optional[float] = 60.0,
+        evolution_workers: Optional[int] = None,
+        evolution_seed: Optional[int] = None,
+        evolution_population: int = 2000,
+        evolution_generations: int = 20,
+        fitness_cache_path: Optional[str] = None,
+        market_data_ttl: Optional[float] = None,
+        performance_log: Optional[str] = None
+    ):
+        """
+        Args:
+            concurrent_cycle: Run strategy pipelines as parallel tasks
+                instead of one after another
+            max_concurrency: Maximum number of strategy pipelines in flight
+            strategy_timeout: Seconds a strategy's signal generation may take
+                (None disables); trades, database reads and logging are not
+                bounded
+            evolution_workers: Processes scoring fitness during evolve
+                (default: CPU count; 1 scores in-process)
+            evolution_seed: Seed making evolve reproducible
+            evolution_population: Individuals per strategy in evolve
+            evolution_generations: Generations per evolve run
+            fitness_cache_path: File persisting the fitness cache between
+                evolve runs (None keeps it in memory only)
+            market_data_ttl: Seconds strategies' market data stays cached
+                (None refetches every cycle)
+            performance_log: JSONL file receiving per-stage cycle timings
+                (performance.jsonl format)
+        """
+        self.profiler = CycleProfiler(path=performance_log)
         self.executor = StrategyExecutor()
-        self.orchestrator = TaskOrchestrator()
+        self.executor.profiler = self.profiler
         self.state_manager = StateManager()
-        self.genetic_algorithm = GeneticAlgorithm()
+        workers = evolution_workers or os.cpu_count() or 1
+        self.genetic_algorithm = GeneticAlgorithm(
+            seed=evolution_seed,
+            evaluator=ParallelFitnessEvaluator(workers) if workers > 1 else None,
+            cache=FitnessCache(path=fitness_cache_path)
+        )
+        self.evolution_population = evolution_population
+        self.evolution_generations = evolution_generations
         self.telegram = TelegramClient()
-        self.database = DatabaseClient()
+        self.database = create_database_client()
+        self.orchestrator = TaskOrchestrator(self.database)
         
         # Initialize strategies
         self.strategies = {
@@ -53,8 +102,25 @@ class CryptoGeneOmega:
             'belief': BeliefRewrite()
         }
         
+        # One market data cache shared by every strategy
+        self.market_data = MarketDataCache(ttl=market_data_ttl)
+        for strategy in self.strategies.values():
+            strategy.market_data = self.market_data
+        
+        # Cycle execution settings
+        self.concurrent_cycle = concurrent_cycle
+        self.max_concurrency = max(1, max_concurrency)
+        self.strategy_timeout = strategy_timeout
+        
+        # Event-driven mode scores signals against a periodically read snapshot
+        self.belief_refresh_interval = 60.0
+        self._event_snapshot_state: Dict[str, Dict] = {}
+        self._event_snapshot_expires = 0.0
+        self._event_snapshot_lock = asyncio.Lock()
+        
         # Agent state
         self.is_running = False
+        self.scheduler = None
         self.execution_count = 0
         self.last_evolution = None
         
@@ -74,9 +140,10 @@ class CryptoGeneOmega:
             self.last_evolution = state.get('last_evolution')
             logger.info(f"Loaded state: {self.execution_count} executions")
         
-        # Load strategy parameters from database
+        # Load strategy parameters from database in one round trip
+        snapshot = await self.database.get_strategy_snapshot(list(self.strategies))
         for name, strategy in self.strategies.items():
-            params = await self.database.get_strategy_params(name)
+            params = snapshot.get(name, {}).get('parameters')
             if params:
                 strategy.update_parameters(params)
         
@@ -95,10 +162,14 @@ class CryptoGeneOmega:
         6. Save state
         """
         logger.info(f"⚡ Starting execution cycle #{self.execution_count + 1}")
+        self.market_data.new_cycle()
+        profiler = self.profiler
+        profiler.begin_cycle(self.execution_count + 1)
         
         try:
             # 1. Pre-execution checks
-            health = await self.orchestrator.health_check()
+            with profiler.stage('health_check'):
+                health = await self.orchestrator.health_check()
             if not health['ok']:
                 logger.error(f"Health check failed: {health['error']}")
                 await self.telegram.send_alert(
@@ -106,66 +177,55 @@ class CryptoGeneOmega:
                 )
                 return
             
-            # 2. Execute each strategy
-            results = []
-            for name, strategy in self.strategies.items():
-                try:
-                    # Check if strategy is enabled
-                    if not await self.is_strategy_enabled(name):
-                        continue
-                    
-                    # Get belief score (confidence level)
-                    belief_score = await self.database.get_belief_score(name)
-                    
-                    # Execute strategy
-                    logger.info(f"Executing {name} strategy (belief: {belief_score:.2f})")
-                    result = await self.executor.execute_strategy(
-                        strategy,
-                        belief_score=belief_score
-                    )
-                    
-                    results.append({
-                        'strategy': name,
-                        'success': result.get('success', False),
-                        'profit_loss': result.get('profit_loss', 0),
-                        'timestamp': datetime.utcnow().isoformat()
-                    })
-                    
-                    # Log to database
-                    await self.database.log_execution(name, result)
-                    
-                except Exception as e:
-                    logger.error(f"Strategy {name} failed: {e}")
-                    results.append({
-                        'strategy': name,
-                        'success': False,
-                        'error': str(e)
-                    })
+            # 2. Size risk limits against current equity
+            with profiler.stage('portfolio'):
+                await self._refresh_portfolio_value()
+            
+            # 3. Prefetch enablement and belief scores for all strategies
+            with profiler.stage('db_snapshot'):
+                snapshot = await self.database.get_strategy_snapshot(list(self.strategies))
             
-            # 3. Run belief rewrite (self-adaptation)
-            belief_strategy = self.strategies['belief']
-            new_beliefs = await belief_strategy.rewrite(results)
+            # 4. Execute each strategy
+            with profiler.stage('strategies'):
+                if self.concurrent_cycle:
+                    results = await self._run_strategies_concurrently(snapshot)
+                else:
+                    results = []
+                    for name, strategy in self.strategies.items():
+                        result = await self._run_strategy(
+                            name, strategy, snapshot.get(name)
+                        )
+                        if result is not None:
+                            results.append(result)
             
-            # Update belief scores in database
-            for strategy_name, score in new_beliefs.items():
-                await self.database.update_belief_score(strategy_name, score)
+            # 5. Run belief rewrite (self-adaptation)
+            with profiler.stage('belief_rewrite'):
+                belief_strategy = self.strategies['belief']
+                new_beliefs = await belief_strategy.rewrite(results)
+                
+                # Update belief scores in database
+                for strategy_name, score in new_beliefs.items():
+                    await self.database.update_belief_score(strategy_name, score)
             
-            # 4. Generate summary
+            # 6. Generate summary
             summary = self._generate_summary(results)
             logger.info(f"Cycle summary: {summary}")
+            logger.info(f"Market data cache: {self.market_data.stats()}")
             
-            # 5. Send Telegram notification
-            await self.telegram.send_notification(
-                self._format_telegram_message(results, summary)
-            )
+            # 7. Send Telegram notification
+            with profiler.stage('notification'):
+                await self.telegram.send_notification(
+                    self._format_telegram_message(results, summary)
+                )
             
-            # 6. Update state
+            # 8. Update state
             self.execution_count += 1
-            await self.state_manager.save_state({
-                'execution_count': self.execution_count,
-                'last_execution': datetime.utcnow().isoformat(),
-                'last_summary': summary
-            })
+            with profiler.stage('state_save'):
+                await self.state_manager.save_state({
+                    'execution_count': self.execution_count,
+                    'last_execution': datetime.utcnow().isoformat(),
+                    'last_summary': summary
+                })
             
             logger.info(f"✅ Cycle #{self.execution_count} complete")
             
@@ -173,6 +233,214 @@ class CryptoGeneOmega:
             logger.error(f"❌ Cycle execution failed: {e}")
             await self.telegram.send_alert(f"🚨 Agent error: {e}")
             raise
+        finally:
+            profiler.end_cycle()
+    
+    async def _run_strategies_concurrently(
+        self,
+        snapshot: Optional[Dict[str, Dict]] = None
+    ) -> List[Dict]:
+        """
+        Run every strategy pipeline as an independent task.
+        
+        Concurrency is bounded by ``max_concurrency``. Results are
+        returned in strategy registration order regardless of which
+        pipeline finishes first, so belief rewrites stay deterministic.
+        
+        Args:
+            snapshot: Prefetched state from ``get_strategy_snapshot``;
+                strategies without an entry query the database themselves
+        """
+        snapshot = snapshot or {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def bounded(name: str, strategy: Any) -> Optional[Dict]:
+            async with semaphore:
+                return await self._run_strategy(
+                    name, strategy, snapshot.get(name)
+                )
+        
+        outcomes = await asyncio.gather(*(
+            bounded(name, strategy)
+            for name, strategy in self.strategies.items()
+        ))
+        return [result for result in outcomes if result is not None]
+    
+    async def _run_strategy(
+        self,
+        name: str,
+        strategy: Any,
+        state: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Run the evaluation pipeline for a single strategy.
+        
+        Args:
+            name: Strategy key
+            strategy: Strategy instance
+            state: Prefetched snapshot entry for this strategy, if any
+        
+        Returns:
+            Result entry for the cycle, or None if the strategy is disabled
+        """
+        try:
+            with self.profiler.stage('total', strategy.name):
+                return await self._evaluate_strategy(name, strategy, state)
+        except Exception as e:
+            logger.error(f"Strategy {name} failed: {e}")
+            return {
+                'strategy': name,
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def _evaluate_strategy(
+        self,
+        name: str,
+        strategy: Any,
+        state: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """Check, score, execute and log one strategy."""
+        # Check if strategy is enabled
+        if state is not None:
+            enabled = state.get('enabled', True)
+        else:
+            with self.profiler.stage('db_read', strategy.name):
+                enabled = await self.is_strategy_enabled(name)
+        if not enabled:
+            return None
+        
+        # Get belief score (confidence level)
+        if state is not None and state.get('belief_score') is not None:
+            belief_score = state['belief_score']
+        else:
+            with self.profiler.stage('db_read', strategy.name):
+                belief_score = await self.database.get_belief_score(name)
+        
+        # Execute strategy
+        logger.info(f"Executing {name} strategy (belief: {belief_score:.2f})")
+        # Only signal generation is bounded: once a trade starts it always
+        # completes and is recorded, however long the fill or log write takes
+        result = await self.executor.execute_strategy(
+            strategy,
+            belief_score=belief_score,
+            signal_timeout=self.strategy_timeout
+        )
+        
+        # Log to database
+        with self.profiler.stage('db_log', strategy.name):
+            await self.database.log_execution(name, result)
+        
+        entry = {
+            'strategy': name,
+            'success': result.get('success', False),
+            'profit_loss': result.get('profit_loss', 0),
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        if result.get('error'):
+            entry['error'] = result['error']
+        return entry
+    
+    async def run_event_driven(
+        self,
+        sources: List[Any],
+        queue_size: int = 1000,
+        overflow: str = 'block',
+        market_data_interval: float = 1.0,
+        belief_refresh_interval: float = 60.0
+    ) -> Dict[str, Any]:
+        """
+        Run strategies off market/on-chain event streams instead of cycles.
+        
+        Each enabled strategy subscribes to its ``event_types`` with its
+        own queue; signals it emits are risk-checked, executed and logged
+        as they arrive. Runs until every source finishes (a replay) or is
+        cancelled (a webhook receiver), then drains the queues.
+        
+        Args:
+            sources: Event sources with ``async run(bus)``, e.g.
+                ReplaySource or HeliusWebhookSource
+            queue_size: Per-strategy queue capacity
+            overflow: 'block' (backpressure) or 'drop_oldest'
+            market_data_interval: Seconds a market data cache cycle lasts;
+                events published within one share fetched market data
+            belief_refresh_interval: Seconds signals are scored against one
+                strategy snapshot before it is read again
+        
+        Returns:
+            Bus statistics per strategy
+        """
+        # Events share a market data cache cycle for market_data_interval
+        self.market_data.new_cycle()
+        bus = EventBus(
+            queue_size=queue_size,
+            overflow=overflow,
+            on_publish=lambda event: self.market_data.new_cycle_after(market_data_interval)
+        )
+        await self._refresh_portfolio_value()
+        self.belief_refresh_interval = belief_refresh_interval
+        snapshot = await self._event_snapshot(refresh=True)
+        for name, strategy in self.strategies.items():
+            if strategy.event_types == () or not snapshot.get(name, {}).get('enabled', True):
+                continue
+            
+            async def on_signal(signal: Dict, event: Event, name=name, strategy=strategy):
+                await self._execute_event_signal(name, strategy, signal)
+            
+            bus.subscribe(name, strategy.on_event, strategy.event_types, on_signal)
+        
+        self.is_running = True
+        bus.start()
+        logger.info(f"📡 Event-driven mode: {len(bus.subscriptions)} strategies subscribed")
+        try:
+            await asyncio.gather(*(source.run(bus) for source in sources))
+        finally:
+            await bus.stop(drain=True)
+        
+        stats = bus.stats()
+        logger.info(f"Event bus stats: {stats}")
+        return stats
+    
+    async def _refresh_portfolio_value(self):
+        """Feed the executor's risk limits the current portfolio value."""
+        try:
+            value = await self.database.get_portfolio_value()
+        except Exception as e:
+            logger.warning(f"Portfolio valuation failed, keeping last value: {e}")
+            value = None
+        self.executor.update_portfolio_value(value)
+    
+    async def _event_snapshot(self, refresh: bool = False) -> Dict[str, Dict]:
+        """
+        Strategy snapshot for event-driven mode, read at most once per
+        ``belief_refresh_interval``; a failed read keeps the last one.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._event_snapshot_lock:
+            if refresh or loop.time() >= self._event_snapshot_expires:
+                try:
+                    self._event_snapshot_state = await self.database.get_strategy_snapshot(
+                        list(self.strategies)
+                    )
+                except Exception as e:
+                    if refresh:
+                        raise
+                    logger.warning(f"Strategy snapshot refresh failed, keeping last: {e}")
+                self._event_snapshot_expires = loop.time() + self.belief_refresh_interval
+        return self._event_snapshot_state
+    
+    async def _execute_event_signal(self, name: str, strategy: Any, signal: Dict):
+        """Score, execute and log a signal emitted in event-driven mode."""
+        state = (await self._event_snapshot()).get(name, {})
+        belief_score = state.get('belief_score')
+        if belief_score is None:
+            belief_score = await self.database.get_belief_score(name)
+        result = await self.executor.execute_signal(
+            strategy,
+            signal,
+            belief_score=belief_score
+        )
+        await self.database.log_execution(name, result)
     
     async def evolve(self):
         """
@@ -191,8 +459,8 @@ class CryptoGeneOmega:
             evolved_params = await self.genetic_algorithm.evolve(
                 current_strategies=self.strategies,
                 performance_data=performance_data,
-                generations=5,
-                population_size=10
+                generations=self.evolution_generations,
+                population_size=self.evolution_population
             )
             
             # Apply evolved parameters
@@ -206,9 +474,10 @@ class CryptoGeneOmega:
                     strategy = self.strategies.get(strategy_name)
                     if strategy:
                         strategy.update_parameters(new_params['parameters'])
+                        # Evolved genes are a subset; store the merged set
                         await self.database.save_strategy_params(
                             strategy_name,
-                            new_params['parameters']
+                            strategy.parameters
                         )
                         mutations_applied += 1
                         logger.info(
@@ -217,9 +486,15 @@ class CryptoGeneOmega:
                         )
             
             # Send evolution report
+            cache_stats = self.genetic_algorithm.last_cache_stats
+            cache_line = (
+                f"Fitness cache hit rate: {cache_stats['hit_rate']*100:.1f}%\n"
+                if cache_stats else ""
+            )
             await self.telegram.send_notification(
                 f"🧬 Evolution complete\n"
                 f"Mutations applied: {mutations_applied}\n"
+                f"{cache_line}"
                 f"Helix eternal. Empire compounds."
             )
             
@@ -229,6 +504,38 @@ class CryptoGeneOmega:
             logger.error(f"Evolution failed: {e}")
             await self.telegram.send_alert(f"🧬 Evolution error: {e}")
     
+    async def run_forever(
+        self,
+        cycle_interval: float = 300.0,
+        evolve_interval: float = 86400.0,
+        jitter: float = 0.0,
+        drain_timeout: Optional[float] = 300.0
+    ):
+        """
+        Stay resident and run cycles and evolution on fixed cadences.
+        
+        Cycles that would overlap a still-running cycle are skipped;
+        evolution requests arriving mid-run coalesce into one follow-up.
+        Returns after SIGTERM/SIGINT once in-flight work has drained.
+        
+        Args:
+            cycle_interval: Seconds between execute_cycle fires
+            evolve_interval: Seconds between evolve fires
+            jitter: Up to this many seconds of random delay per fire
+            drain_timeout: Seconds to let in-flight work finish on stop
+        """
+        scheduler = Scheduler(drain_timeout=drain_timeout)
+        scheduler.add('cycle', self.execute_cycle, cycle_interval, jitter=jitter, overlap='skip')
+        scheduler.add(
+            'evolve', self.evolve, evolve_interval, jitter=jitter,
+            overlap='coalesce', run_immediately=False
+        )
+        scheduler.install_signal_handlers()
+        
+        self.is_running = True
+        self.scheduler = scheduler
+        await scheduler.run()
+    
     async def is_strategy_enabled(self, strategy_name: str) -> bool:
         """Check if strategy is enabled in database."""
         return await self.database.is_strategy_enabled(strategy_name)
@@ -262,17 +569,51 @@ class CryptoGeneOmega:
         """Graceful shutdown."""
         logger.info("Shutting down agent...")
         self.is_running = False
+        
+        # Drain buffered execution logs and belief updates
+        await self.database.flush()
+        if self.database.buffer is not None:
+            logger.info(f"Write buffer stats: {self.database.buffer.stats()}")
+        
         await self.database.disconnect()
+        
+        # Deliver queued notifications before the loop goes away
+        await self.telegram.close()
+        
+        if self.profiler.histograms:
+            self.profiler.write_summary()
+            await self.profiler.flush()
+            logger.info(f"Cycle timings: {self.profiler.summary().get('cycle')}")
         logger.info("Agent shutdown complete")
 
 
-async def main():
+async def main(argv: Optional[List[str]] = None):
     """Main entry point for agent execution."""
-    agent = CryptoGeneOmega()
+    parser = argparse.ArgumentParser(description='CryptoGene-Omega agent')
+    parser.add_argument('--daemon', action='store_true', help='Stay resident and run on a schedule')
+    parser.add_argument('--cycle-interval', type=float, default=300.0, help='Seconds between cycles')
+    parser.add_argument('--evolve-interval', type=float, default=86400.0, help='Seconds between evolutions')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Max random delay per run, in seconds')
+    parser.add_argument('--drain-timeout', type=float, default=300.0, help='Seconds to drain on shutdown')
+    parser.add_argument('--performance-log', help='Append per-stage timings to this JSONL file')
+    parser.add_argument('--profile-cycle', metavar='PATH', help='cProfile the first cycle into PATH')
+    args = parser.parse_args(argv)
+    
+    agent = CryptoGeneOmega(performance_log=args.performance_log)
+    if args.profile_cycle:
+        agent.profiler.profile_next_cycle(args.profile_cycle)
     
     try:
         await agent.initialize()
-        await agent.execute_cycle()
+        if args.daemon:
+            await agent.run_forever(
+                cycle_interval=args.cycle_interval,
+                evolve_interval=args.evolve_interval,
+                jitter=args.jitter,
+                drain_timeout=args.drain_timeout
+            )
+        else:
+            await agent.execute_cycle()
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         raise
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Historical backtesting for strategies.
+
+Replays columnar market snapshots in event time through
+``BaseStrategy.generate_signal`` and the executor's risk engine, then
+simulates fills at each bar's close and reports PnL, drawdown and fill
+statistics per strategy.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from .risk_engine import ROUND_TRIPS
+
+logger = logging.getLogger(__name__)
+
+SIDES = {'buy': 1, 'sell': -1}
+
+
+class BacktestError(RuntimeError):
+    """Raised when a strategy cannot be replayed offline."""
+
+
+@dataclass
+class MarketData:
+    """
+    Wide columnar bars: one row per timestamp, one column per asset.
+
+    Attributes:
+        timestamps: (bars,) epoch seconds, ascending
+        assets: Asset symbols, in column order
+        fields: Field name -> (bars, assets) float64; must include 'close'
+    """
+    timestamps: np.ndarray
+    assets: List[str]
+    fields: Dict[str, np.ndarray]
+
+    def __post_init__(self):
+        if 'close' not in self.fields:
+            raise ValueError("Market data needs a 'close' field")
+        self.asset_index = {asset: i for i, asset in enumerate(self.assets)}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.fields['close']
+
+    @classmethod
+    def load(cls, path: str) -> 'MarketData':
+        """
+        Load an ``.npz`` (arrays ``timestamp``, ``assets`` and one
+        (bars, assets) array per field) or a long-format Parquet file
+        (columns ``timestamp``, ``asset`` and numeric fields).
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.npz':
+            with np.load(path, allow_pickle=False) as f:
+                fields = {
+                    name: np.asarray(f[name], dtype=np.float64)
+                    for name in f.files if name not in ('timestamp', 'assets')
+                }
+                return cls(np.asarray(f['timestamp']), [str(a) for a in f['assets']], fields)
+        if ext in ('.parquet', '.pq'):
+            return cls._load_parquet(path)
+        raise ValueError(f"Unsupported market data file: {path}")
+
+    @classmethod
+    def _load_parquet(cls, path: str) -> 'MarketData':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("pyarrow is required to read Parquet market data") from e
+
+        table = pq.read_table(path)
+        columns = {name: table.column(name).to_numpy() for name in table.column_names}
+        timestamps, rows = np.unique(columns.pop('timestamp'), return_inverse=True)
+        assets, cols = np.unique(columns.pop('asset').astype(str), return_inverse=True)
+
+        fields = {}
+        for name, values in columns.items():
+            grid = np.full((len(timestamps), len(assets)), np.nan)
+            grid[rows, cols] = values.astype(np.float64)
+            fields[name] = _forward_fill(grid) if name == 'close' else grid
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype('datetime64[s]').astype(np.int64)
+        return cls(timestamps, [str(a) for a in assets], fields)
+
+
+class MarketView:
+    """
+    A strategy's window onto the bar being replayed.
+
+    One instance is reused for every bar; only ``index`` moves, so the
+    replay allocates nothing per bar. Reads never look past ``index``.
+    """
+    def __init__(self, data: MarketData):
+        self.data = data
+        self.index = 0
+
+    @property
+    def timestamp(self) -> int:
+        return int(self.data.timestamps[self.index])
+
+    def price(self, asset: str) -> float:
+        return float(self.data.close[self.index, self.data.asset_index[asset]])
+
+    def field(self, name: str, asset: str) -> float:
+        return float(self.data.fields[name][self.index, self.data.asset_index[asset]])
+
+    def history(self, name: str, asset: str, lookback: int) -> np.ndarray:
+        """The last ``lookback`` values up to and including this bar."""
+        start = max(0, self.index + 1 - lookback)
+        return self.data.fields[name][start:self.index + 1, self.data.asset_index[asset]]
+
+
+class Backtester:
+    """
+    Event-time replay of strategies over MarketData.
+
+    Strategies that implement ``generate_signals(market)`` return signals
+    for every bar at once as arrays; the rest are replayed bar by bar
+    with ``strategy.market`` set to a MarketView and ``generate_signal``
+    driven without an event loop. Non-hold signals are checked by a fresh
+    copy of the executor's RiskEngine per strategy (limits sized to the
+    current equity, rate limits in bar time) and fill at the bar's close,
+    moved against the trade by the signal's slippage (or
+    ``default_slippage``).
+    """
+    def __init__(
+        self,
+        executor,
+        initial_capital: float = 10000.0,
+        fee_rate: float = 0.001,
+        default_slippage: float = 0.001
+    ):
+        self.executor = executor
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+        self.default_slippage = default_slippage
+
+    def run(self, strategies: Dict[str, Any], data: MarketData) -> Dict[str, Any]:
+        """
+        Backtest every strategy independently on the same data.
+
+        Returns:
+            ``{'bars', 'elapsed_seconds', 'bars_per_second', 'strategies':
+            {name: stats}, 'portfolio': stats}``
+        """
+        start = time.perf_counter()
+        results = {}
+        equity_total = np.zeros(len(data))
+        for name, strategy in strategies.items():
+            signals = self._collect_signals(strategy, data)
+            stats, equity = self._simulate(signals, data)
+            results[name] = stats
+            equity_total += equity
+        elapsed = time.perf_counter() - start
+
+        capital = self.initial_capital * len(strategies)
+        portfolio = _curve_stats(equity_total, capital) if strategies else {}
+        logger.info(
+            f"Backtest: {len(strategies)} strategies x {len(data)} bars in {elapsed:.2f}s"
+        )
+        return {
+            'bars': len(data),
+            'elapsed_seconds': elapsed,
+            'bars_per_second': len(data) * len(strategies) / elapsed if elapsed > 0 else 0.0,
+            'strategies': results,
+            'portfolio': portfolio
+        }
+
+    def _collect_signals(self, strategy, data: MarketData) -> List[Tuple[int, Dict]]:
+        """(bar, signal) pairs for every non-hold signal, in bar order."""
+        batch = getattr(strategy, 'generate_signals', None)
+        arrays = batch(data) if batch else None
+        if arrays is not None:
+            return _signals_from_arrays(arrays, data)
+
+        view = MarketView(data)
+        previous = getattr(strategy, 'market', None)
+        strategy.market = view
+        signals = []
+        generate = strategy.generate_signal
+        try:
+            for i in range(len(data)):
+                view.index = i
+                # Drive the coroutine directly: no event loop in the hot path
+                coro = generate()
+                try:
+                    coro.send(None)
+                except StopIteration as stop:
+                    signal = stop.value
+                else:
+                    coro.close()
+                    raise BacktestError(
+                        f"{strategy.name}.generate_signal awaited I/O; backtests "
+                        f"must read prices from strategy.market"
+                    )
+                if signal and signal.get('type', 'hold') != 'hold':
+                    signals.append((i, signal))
+        finally:
+            strategy.market = previous
+        return signals
+
+    def _simulate(self, signals: List[Tuple[int, Dict]], data: MarketData) -> Tuple[Dict[str, Any], np.ndarray]:
+        close = data.close
+        cash = self.initial_capital
+        positions = np.zeros(len(data.assets))
+        risk = self.executor.risk_engine.fresh(self.initial_capital)
+        rejected = Counter()
+        fill_bars, fill_assets, fill_qty, cash_after = [], [], [], []
+        turnover = fees = slippage_total = 0.0
+
+        for bar, signal in signals:
+            round_trip = signal['type'] in ROUND_TRIPS
+            side = 0 if round_trip else SIDES.get(signal['type'])
+            asset = data.asset_index.get(signal.get('asset'))
+            if side is None or asset is None:
+                rejected['unknown_signal'] += 1
+                continue
+            price = close[bar, asset]
+            if not price > 0:
+                rejected['no_price'] += 1
+                continue
+
+            marks = np.where(positions != 0, close[bar], 0.0)
+            equity = cash + float(positions @ marks)
+            risk.portfolio_value = equity
+            now = float(data.timestamps[bar])
+            if error := risk.check({**signal, 'price': price}, now=now):
+                rejected[error] += 1
+                continue
+
+            slippage = float(signal.get('slippage', self.default_slippage))
+            fill_price = price * (1 + side * slippage)
+            if signal.get('amount') is not None:
+                qty = float(signal['amount'])
+            else:
+                qty = float(signal.get('size', 0)) * equity / fill_price
+            if qty <= 0:
+                rejected['zero_size'] += 1
+                continue
+
+            notional = qty * fill_price
+            fee = notional * self.fee_rate
+            if round_trip:
+                # The route ends in the asset it started from: no position,
+                # only its expected return net of slippage
+                cash += notional * (float(signal.get('expected_return') or 0) - slippage) - fee
+            else:
+                cash -= side * notional + fee
+                positions[asset] += side * qty
+            risk.record_fill(data.assets[asset], side * notional, now=now)
+            turnover += notional
+            fees += fee
+            slippage_total += slippage
+
+            fill_bars.append(bar)
+            fill_assets.append(asset)
+            fill_qty.append(side * qty)
+            cash_after.append(cash)
+
+        equity = self._equity_curve(data, fill_bars, fill_assets, fill_qty, cash_after)
+        fills = len(fill_bars)
+        stats = _curve_stats(equity, self.initial_capital)
+        stats.update({
+            'signals': len(signals),
+            'fills': fills,
+            'rejected': dict(rejected),
+            'fill_rate': fills / len(signals) if signals else 0.0,
+            'turnover': float(turnover),
+            'fees': float(fees),
+            'avg_slippage': slippage_total / fills if fills else 0.0
+        })
+        return stats, equity
+
+    def _equity_curve(self, data, fill_bars, fill_assets, fill_qty, cash_after) -> np.ndarray:
+        """Mark-to-market equity at every bar, built from the sparse fills."""
+        bars = len(data)
+        if not fill_bars:
+            return np.full(bars, self.initial_capital)
+
+        fill_bars = np.asarray(fill_bars)
+        # Cash after the last fill of each bar, carried forward
+        last = np.append(fill_bars[1:] != fill_bars[:-1], True)
+        cash = np.full(bars, np.nan)
+        if fill_bars[0] != 0:
+            cash[0] = self.initial_capital
+        cash[fill_bars[last]] = np.asarray(cash_after)[last]
+        equity = _forward_fill(cash[:, None])[:, 0]
+
+        fill_assets = np.asarray(fill_assets)
+        fill_qty = np.asarray(fill_qty)
+        for asset in np.unique(fill_assets):
+            mask = fill_assets == asset
+            delta = np.zeros(bars)
+            np.add.at(delta, fill_bars[mask], fill_qty[mask])
+            held = np.cumsum(delta)
+            marks = _forward_fill(data.close[:, asset:asset + 1])[:, 0]
+            equity += np.where(held != 0, held * np.nan_to_num(marks), 0.0)
+        return equity
+
+
+def _signals_from_arrays(arrays: Dict[str, np.ndarray], data: MarketData) -> List[Tuple[int, Dict]]:
+    """
+    Convert batch signals to (bar, signal) pairs.
+
+    ``arrays`` holds per-bar ``side`` (+1 buy, -1 sell, 0 hold) and
+    ``asset`` (column index), plus ``amount``, ``size`` or ``slippage``.
+    """
+    side = np.asarray(arrays['side'])
+    bars = np.flatnonzero(side)
+    asset = np.asarray(arrays['asset'])[bars]
+    extra = {
+        key: np.asarray(arrays[key])[bars].tolist()
+        for key in ('amount', 'size', 'slippage') if key in arrays
+    }
+    signals = []
+    for j, bar in enumerate(bars.tolist()):
+        signal = {
+            'type': 'buy' if side[bar] > 0 else 'sell',
+            'asset': data.assets[asset[j]]
+        }
+        for key, values in extra.items():
+            signal[key] = values[j]
+        signals.append((bar, signal))
+    return signals
+
+
+def _forward_fill(grid: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column."""
+    valid = ~np.isnan(grid)
+    index = np.where(valid, np.arange(len(grid))[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    return grid[index, np.arange(grid.shape[1])]
+
+
+def _curve_stats(equity: np.ndarray, capital: float) -> Dict[str, float]:
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+    final = float(equity[-1]) if len(equity) else capital
+    return {
+        'final_equity': final,
+        'pnl': final - capital,
+        'return': (final - capital) / capital if capital else 0.0,
+        'max_drawdown': float(drawdown.max()) if len(drawdown) else 0.0
+    }
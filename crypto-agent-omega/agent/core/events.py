@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Event-driven signal dispatch.
+
+Sources (a Helius webhook receiver or a local replay) publish market and
+on-chain events to an EventBus. Every subscribed strategy has its own
+bounded queue and worker task, so a slow strategy only delays itself;
+when its queue is full, publishing waits (or drops the oldest event),
+which pushes back on the source instead of growing memory.
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest')
+
+
+@dataclass
+class Event:
+    """A market or on-chain event."""
+    type: str
+    payload: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+    source: str = 'local'
+    received_at: float = field(default_factory=time.monotonic)
+
+
+class Subscription:
+    """A subscriber's queue, worker task and delivery counters."""
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Event], Awaitable[Optional[Dict]]],
+        event_types: Optional[Iterable[str]],
+        on_signal: Optional[Callable[[Dict, Event], Awaitable[Any]]],
+        queue_size: int
+    ):
+        self.name = name
+        self.handler = handler
+        self.event_types = frozenset(event_types) if event_types is not None else None
+        self.on_signal = on_signal
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Set whenever the worker takes an event, freeing a slot
+        self.space = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.dropped = 0
+        self.signals = 0
+        self.errors = 0
+        self.max_latency_ms = 0.0
+        self.total_latency_ms = 0.0
+
+    def wants(self, event: Event) -> bool:
+        return self.event_types is None or event.type in self.event_types
+
+    def free(self) -> float:
+        """Free queue slots (infinite for an unbounded queue)."""
+        if self.queue.maxsize <= 0:
+            return float('inf')
+        return self.queue.maxsize - self.queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        handled = self.delivered - self.queue.qsize()
+        return {
+            'queue_depth': self.queue.qsize(),
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'signals': self.signals,
+            'errors': self.errors,
+            'avg_latency_ms': self.total_latency_ms / handled if handled > 0 else 0.0,
+            'max_latency_ms': self.max_latency_ms
+        }
+
+
+class EventBus:
+    """
+    Fan-out of events to per-subscriber queues.
+
+    Args:
+        queue_size: Capacity of each subscriber's queue
+        overflow: 'block' makes ``publish`` wait for space (backpressure);
+            'drop_oldest' evicts the subscriber's oldest queued event
+        on_publish: Called with each event before it is queued
+    """
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        overflow: str = 'block',
+        on_publish: Optional[Callable[[Event], Any]] = None
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.on_publish = on_publish
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.published = 0
+        self._running = False
+
+    def subscribe(
+        self,
+        name: str,
+        handler: Callable[[Event], Awaitable[Optional[Dict]]],
+        event_types: Optional[Iterable[str]] = None,
+        on_signal: Optional[Callable[[Dict, Event], Awaitable[Any]]] = None
+    ) -> Subscription:
+        """
+        Register a handler; ``event_types`` None receives every event.
+
+        Non-hold signals returned by the handler are passed to
+        ``on_signal(signal, event)``.
+        """
+        subscription = Subscription(name, handler, event_types, on_signal, self.queue_size)
+        self.subscriptions[name] = subscription
+        if self._running:
+            subscription.task = asyncio.create_task(self._worker(subscription))
+        return subscription
+
+    def start(self):
+        self._running = True
+        for subscription in self.subscriptions.values():
+            if subscription.task is None:
+                subscription.task = asyncio.create_task(self._worker(subscription))
+
+    async def stop(self, drain: bool = True):
+        """Stop the workers, after handling queued events when ``drain``."""
+        self._running = False
+        if drain:
+            await asyncio.gather(*(s.queue.join() for s in self.subscriptions.values()))
+        for subscription in self.subscriptions.values():
+            if subscription.task is not None:
+                subscription.task.cancel()
+        await asyncio.gather(
+            *(s.task for s in self.subscriptions.values() if s.task is not None),
+            return_exceptions=True
+        )
+        for subscription in self.subscriptions.values():
+            subscription.task = None
+
+    async def publish(self, event: Event):
+        """Queue ``event`` for every interested subscriber."""
+        self.published += 1
+        if self.on_publish is not None:
+            self.on_publish(event)
+        for subscription in self.subscriptions.values():
+            if not subscription.wants(event):
+                continue
+            if self.overflow == 'drop_oldest':
+                self._put_nowait(subscription, event)
+            else:
+                await subscription.queue.put(event)
+                subscription.delivered += 1
+
+    async def publish_batch(self, events: List[Event], timeout: Optional[float] = None) -> bool:
+        """
+        Queue every event of a batch, or none of them.
+        
+        With the 'block' policy this waits until each interested
+        subscriber has room for all the events it wants, then queues them
+        without yielding, so a batch is never left half delivered.
+        
+        Args:
+            events: Events in publish order
+            timeout: Seconds to wait for room (None waits indefinitely)
+        
+        Returns:
+            False if room did not free up within ``timeout``; nothing was
+            queued in that case
+        
+        Raises:
+            ValueError: If a subscriber's queue could never hold the batch
+        """
+        if self.overflow == 'block':
+            needed = {}
+            for subscription in self.subscriptions.values():
+                count = sum(1 for event in events if subscription.wants(event))
+                if count > subscription.queue.maxsize > 0:
+                    raise ValueError(
+                        f"Batch of {count} events exceeds {subscription.name}'s "
+                        f"queue of {subscription.queue.maxsize}"
+                    )
+                if count:
+                    needed[subscription] = count
+            try:
+                await asyncio.wait_for(self._wait_for_room(needed), timeout)
+            except asyncio.TimeoutError:
+                return False
+        for event in events:
+            self.published += 1
+            if self.on_publish is not None:
+                self.on_publish(event)
+            for subscription in self.subscriptions.values():
+                if subscription.wants(event):
+                    self._put_nowait(subscription, event)
+        return True
+
+    @staticmethod
+    async def _wait_for_room(needed: Dict[Subscription, int]):
+        while True:
+            short = [s for s, count in needed.items() if s.free() < count]
+            if not short:
+                return
+            short[0].space.clear()
+            await short[0].space.wait()
+
+    @staticmethod
+    def _put_nowait(subscription: Subscription, event: Event):
+        """Queue without waiting, evicting the oldest event when full."""
+        queue = subscription.queue
+        if queue.full():
+            queue.get_nowait()
+            queue.task_done()
+            subscription.dropped += 1
+        queue.put_nowait(event)
+        subscription.delivered += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'published': self.published,
+            'subscribers': {name: s.stats() for name, s in self.subscriptions.items()}
+        }
+
+    async def _worker(self, subscription: Subscription):
+        queue = subscription.queue
+        while True:
+            event = await queue.get()
+            subscription.space.set()
+            try:
+                signal = await subscription.handler(event)
+                if signal and signal.get('type', 'hold') != 'hold':
+                    subscription.signals += 1
+                    if subscription.on_signal is not None:
+                        await subscription.on_signal(signal, event)
+            except Exception as e:
+                subscription.errors += 1
+                logger.error(f"Event handler {subscription.name} failed on {event.type}: {e}")
+            finally:
+                latency = (time.monotonic() - event.received_at) * 1000
+                subscription.total_latency_ms += latency
+                subscription.max_latency_ms = max(subscription.max_latency_ms, latency)
+                queue.task_done()
+
+
+class ReplaySource:
+    """
+    Replays recorded events from a JSONL file or an iterable of Events.
+
+    Each JSONL line is ``{"type", "payload", "timestamp"}``. With
+    ``speed`` None events are published as fast as the bus accepts them;
+    otherwise gaps between timestamps are replayed divided by ``speed``.
+    """
+    def __init__(self, events, speed: Optional[float] = None):
+        self.events = events
+        self.speed = speed
+
+    def _iter_events(self) -> Iterable[Event]:
+        if not isinstance(self.events, str):
+            yield from self.events
+            return
+        with open(self.events) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                yield Event(
+                    type=record['type'],
+                    payload=record.get('payload', {}),
+                    timestamp=float(record.get('timestamp', 0)),
+                    source='replay'
+                )
+
+    async def run(self, bus: EventBus):
+        previous = None
+        count = 0
+        for event in self._iter_events():
+            if self.speed and previous is not None and event.timestamp > previous:
+                await asyncio.sleep((event.timestamp - previous) / self.speed)
+            previous = event.timestamp
+            event.received_at = time.monotonic()
+            await bus.publish(event)
+            count += 1
+        logger.info(f"Replayed {count} events")
+
+
+class HeliusWebhookSource:
+    """
+    aiohttp receiver for Helius enhanced-transaction webhooks.
+
+    Helius POSTs a JSON array of transactions; each becomes an Event
+    typed by the transaction's ``type`` (SWAP, TRANSFER, ...). A batch
+    is published all or nothing: if the bus has no room for all of it
+    within ``publish_timeout``, none of it is queued and the request is
+    answered 503 so Helius resends the batch later without duplicating
+    events, keeping backpressure end to end. A batch larger than a
+    subscriber's queue is answered 413. ``auth_token`` must match the
+    webhook's configured authHeader.
+    """
+    def __init__(
+        self,
+        host: str = '0.0.0.0',
+        port: int = 8080,
+        path: str = '/webhooks/helius',
+        auth_token: Optional[str] = None,
+        publish_timeout: float = 5.0
+    ):
+        if web is None:
+            raise RuntimeError("aiohttp is required for the Helius webhook source")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.auth_token = auth_token
+        self.publish_timeout = publish_timeout
+
+    def build_app(self, bus: EventBus):
+        async def receive(request):
+            if self.auth_token and request.headers.get('Authorization') != self.auth_token:
+                return web.Response(status=401)
+            try:
+                body = await request.json()
+            except json.JSONDecodeError:
+                return web.Response(status=400, text='invalid json')
+            events = self.to_events(body)
+            try:
+                accepted = await bus.publish_batch(events, self.publish_timeout)
+            except ValueError as e:
+                logger.error(f"Rejecting Helius batch: {e}")
+                return web.Response(status=413, text=str(e))
+            if not accepted:
+                logger.warning("Event bus saturated, asking Helius to retry")
+                return web.Response(status=503)
+            return web.json_response({'accepted': len(events)})
+
+        app = web.Application()
+        app.router.add_post(self.path, receive)
+        return app
+
+    @staticmethod
+    def to_events(body) -> List[Event]:
+        transactions = body if isinstance(body, list) else [body]
+        return [
+            Event(
+                type=tx.get('type', 'UNKNOWN'),
+                payload=tx,
+                timestamp=float(tx.get('timestamp') or time.time()),
+                source='helius'
+            )
+            for tx in transactions
+            if isinstance(tx, dict)
+        ]
+
+    async def run(self, bus: EventBus):
+        """Serve webhooks until cancelled."""
+        runner = web.AppRunner(self.build_app(bus))
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port)
+        await site.start()
+        logger.info(f"Listening for Helius webhooks on {self.host}:{self.port}{self.path}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
@@ -2,10 +2,16 @@
 """
 Strategy execution engine with risk management.
 """
+import asyncio
 import logging
-from typing import Dict, Any
+import os
+from typing import Dict, Any, List, Optional, Union
 from decimal import Decimal
 
+from .backtest import Backtester, MarketData
+from .risk_engine import RiskEngine
+from .profiler import CycleProfiler
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,15 +20,53 @@ class StrategyExecutor:
     Executes trading strategies with risk management.
     """
     
-    def __init__(self):
+    def __init__(self, portfolio_value: Optional[float] = None):
+        """
+        Args:
+            portfolio_value: Starting portfolio value risk limits are sized
+                against (default: PORTFOLIO_VALUE env var, else 10000). The
+                agent replaces it with current equity every cycle
+        """
+        if portfolio_value is None:
+            portfolio_value = float(os.getenv('PORTFOLIO_VALUE', '10000'))
         self.max_position_size = Decimal('0.1')  # 10% of portfolio
         self.max_slippage = Decimal('0.02')  # 2% max slippage
         self.min_confidence = 0.6  # Minimum belief score to execute
+        self.risk_engine = RiskEngine(
+            max_position_size=float(self.max_position_size),
+            max_slippage=float(self.max_slippage),
+            portfolio_value=portfolio_value
+        )
+        # Stage timings; the agent replaces this with its own profiler
+        self.profiler = CycleProfiler(enabled=False)
+
+    @property
+    def portfolio_value(self) -> float:
+        """Portfolio value the risk limits are currently sized against."""
+        return self.risk_engine.portfolio_value
+
+    def update_portfolio_value(self, value: Optional[float]) -> float:
+        """
+        Size risk limits against current equity.
+        
+        Args:
+            value: Current portfolio value; None or a non-positive value
+                keeps the running value (last equity plus realized PnL)
+        
+        Returns:
+            The portfolio value now in effect
+        """
+        if value is not None and value > 0:
+            self.risk_engine.portfolio_value = float(value)
+        elif value is not None:
+            logger.warning(f"Ignoring non-positive portfolio value {value}")
+        return self.risk_engine.portfolio_value
     
     async def execute_strategy(
         self,
         strategy: Any,
-        belief_score: float
+        belief_score: float,
+        signal_timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Execute a strategy with risk management checks.
@@ -30,68 +74,145 @@ class StrategyExecutor:
         Args:
             strategy: Strategy instance to execute
             belief_score: Confidence level (0.0 - 1.0)
+            signal_timeout: Seconds signal generation may take (None
+                disables). A trade that has started always runs to completion
         
         Returns:
             Execution result dictionary
         """
         try:
-            # Check minimum confidence
-            if belief_score < self.min_confidence:
-                logger.info(
-                    f"Skipping {strategy.name}: "
-                    f"belief {belief_score:.2f} < {self.min_confidence}"
-                )
-                return {
-                    'success': False,
-                    'reason': 'insufficient_confidence',
-                    'belief_score': belief_score
-                }
+            if skipped := self._check_confidence(strategy, belief_score):
+                return skipped
             
             # Get strategy signal
-            signal = await strategy.generate_signal()
-            
-            # If no signal, do nothing
-            if not signal or signal['type'] == 'hold':
-                return {
-                    'success': True,
-                    'action': 'hold',
-                    'reason': 'no_signal'
-                }
-            
-            # Risk management checks
-            if error := self._run_risk_management(signal):
-                return {
-                    'success': False,
-                    'reason': error
-                }
-
-            # TODO: Execute transaction via blockchain coordinator
-            logger.info(f"Executing trade: {signal}")
-            
-            # Placeholder for actual trade execution
-            trade_result = await self._execute_trade(signal)
-            
-            return trade_result
+            with self.profiler.stage('signal', strategy.name):
+                signal = await asyncio.wait_for(strategy.generate_signal(), signal_timeout)
+            return await self._execute_signal(strategy, signal)
             
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Signal generation for {strategy.name} timed out after {signal_timeout}s"
+            )
+            return {
+                'success': False,
+                'error': 'timeout'
+            }
         except Exception as e:
             logger.error(f"Strategy execution failed for {strategy.name}: {e}")
             return {
                 'success': False,
                 'error': str(e)
             }
-    
-    def _run_risk_management(self, signal: Dict) -> Optional[str]:
-        """Run pre-trade risk checks."""
-        # Check position size
-        if signal.get('size', 0) > self.max_position_size:
-            return 'max_position_size_exceeded'
-            
-        # Check slippage tolerance
-        if signal.get('slippage', 0) > self.max_slippage:
-            return 'max_slippage_exceeded'
+
+    async def execute_signal(
+        self,
+        strategy: Any,
+        signal: Optional[Dict],
+        belief_score: float
+    ) -> Dict[str, Any]:
+        """
+        Execute a signal a strategy has already produced (event-driven mode).
         
+        Args:
+            strategy: Strategy that produced the signal
+            signal: The signal dictionary
+            belief_score: Confidence level (0.0 - 1.0)
+        
+        Returns:
+            Execution result dictionary
+        """
+        try:
+            if skipped := self._check_confidence(strategy, belief_score):
+                return skipped
+            return await self._execute_signal(strategy, signal)
+        except Exception as e:
+            logger.error(f"Signal execution failed for {strategy.name}: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def _check_confidence(self, strategy: Any, belief_score: float) -> Optional[Dict[str, Any]]:
+        """The skip result when the belief score is below min_confidence."""
+        if belief_score < self.min_confidence:
+            logger.info(
+                f"Skipping {strategy.name}: "
+                f"belief {belief_score:.2f} < {self.min_confidence}"
+            )
+            return {
+                'success': False,
+                'reason': 'insufficient_confidence',
+                'belief_score': belief_score
+            }
         return None
 
+    async def _execute_signal(self, strategy: Any, signal: Optional[Dict]) -> Dict[str, Any]:
+        # If no signal, do nothing
+        if not signal or signal['type'] == 'hold':
+            return {
+                'success': True,
+                'action': 'hold',
+                'reason': 'no_signal'
+            }
+        
+        # Risk management checks
+        with self.profiler.stage('risk', strategy.name):
+            error = self._run_risk_management(signal)
+        if error:
+            return {
+                'success': False,
+                'reason': error
+            }
+
+        # TODO: Execute transaction via blockchain coordinator
+        logger.info(f"Executing trade: {signal}")
+        
+        # Placeholder for actual trade execution
+        with self.profiler.stage('trade', strategy.name):
+            trade_result = await self._execute_trade(signal)
+        if signal.get('expected_return') is not None:
+            # Logged with the execution so evolution can replay min_profit
+            trade_result.setdefault('expected_return', signal['expected_return'])
+        if trade_result.get('success'):
+            if signal.get('asset'):
+                self.risk_engine.record_fill(
+                    signal['asset'], self.risk_engine.signal_notional(signal)
+                )
+            # Realized PnL moves equity until the next portfolio refresh
+            self.risk_engine.portfolio_value += float(trade_result.get('profit_loss') or 0)
+        
+        return trade_result
+    
+    def _run_risk_management(self, signal: Dict) -> Optional[str]:
+        """Run pre-trade risk checks (size, slippage, exposure, concentration, rate)."""
+        return self.risk_engine.check(signal)
+
+    def check_signals(self, signals: List[Dict]) -> List[Optional[str]]:
+        """Run pre-trade risk checks on many signals in one vectorized pass."""
+        return self.risk_engine.check_signals(signals)
+
+    def backtest(
+        self,
+        strategies: Dict[str, Any],
+        market_data: Union[MarketData, str],
+        **options
+    ) -> Dict[str, Any]:
+        """
+        Replay strategies over historical market snapshots.
+
+        Args:
+            strategies: Strategy instances by name
+            market_data: MarketData or a path to an .npz/.parquet snapshot
+            **options: Backtester settings (initial_capital, fee_rate,
+                default_slippage)
+
+        Returns:
+            Backtest report with PnL, drawdown and fill statistics
+        """
+        if isinstance(market_data, str):
+            market_data = MarketData.load(market_data)
+        return Backtester(self, **options).run(strategies, market_data)
+
     async def _execute_trade(self, signal: Dict) -> Dict:
         """Placeholder for trade execution logic."""
         # This will be implemented in Phase 3
@@ -102,7 +223,7 @@ class StrategyExecutor:
             'success': True,
             'action': signal['type'],
             'asset': signal['asset'],
-            'amount': signal['amount'],
+            'amount': signal.get('amount'),
             'price': signal.get('price', 0),
             'profit_loss': Decimal('0.01') # Simulated profit
         }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Shared market data cache for strategies.
+
+Strategies read prices and pool state through ``BaseStrategy.fetch``,
+which goes through one MarketDataCache owned by the agent. Within a
+cycle each key is fetched upstream at most once: concurrent requests for
+a key in flight await the same fetch, and later ones get the cached
+value. Entries expire at the next cycle unless given a TTL. In
+event-driven mode a cycle is a time window (see ``new_cycle_after``)
+rather than one event.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MarketDataCache:
+    """
+    Per-cycle (optionally TTL-based) cache with request coalescing.
+
+    Failed fetches are not cached; every caller waiting on one gets its
+    exception and the next request retries upstream. The hit/miss
+    counters cover the current cycle.
+    """
+    def __init__(self, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl: Default lifetime in seconds; None keeps entries for the
+                current cycle only
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self.cycle = 0
+        self.cycle_started = clock()
+        # key -> (value, cycle stored, expiry or None)
+        self._entries: Dict[Hashable, Tuple[Any, int, Optional[float]]] = {}
+        # key -> (fetch task, ttl or None); cycle-scoped fetches are
+        # dropped at the next cycle so they never serve it
+        self._inflight: Dict[Hashable, Tuple[asyncio.Task, Optional[float]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def get(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        The cached value for ``key``, calling ``fetch()`` on a miss.
+
+        Args:
+            key: Hashable request identity, e.g. ('price', 'SOL')
+            fetch: Zero-argument coroutine function doing the upstream call
+            ttl: Lifetime override for this entry
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self._fresh(entry):
+            self.hits += 1
+            return entry[0]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            task = inflight[0]
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            expires = ttl if ttl is not None else self.ttl
+            self._inflight[key] = (task, expires)
+            # Stamped with the cycle the fetch started in, not the one it
+            # finishes in
+            cycle = self.cycle
+            task.add_done_callback(lambda t: self._store(key, t, cycle, expires))
+        # Shielded so a caller timing out does not cancel the fetch for
+        # everyone else waiting on it
+        return await asyncio.shield(task)
+
+    def new_cycle(self):
+        """Start a cycle: cycle-scoped and expired entries and the counters are reset."""
+        self.cycle += 1
+        self.cycle_started = self.clock()
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if self._fresh(entry)
+        }
+        # Cycle-scoped fetches still running finish for their own waiters;
+        # requests in the new cycle start a fresh one
+        self._inflight = {
+            key: inflight for key, inflight in self._inflight.items()
+            if inflight[1] is not None
+        }
+        self.reset_stats()
+
+    def new_cycle_after(self, interval: float) -> bool:
+        """
+        Start a cycle if the current one is at least ``interval`` seconds old.
+
+        Returns:
+            True if a new cycle was started
+        """
+        if self.clock() - self.cycle_started < interval:
+            return False
+        self.new_cycle()
+        return True
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or all of them."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / requests if requests else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'cycle': self.cycle,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'hit_rate': self.hit_rate,
+            'entries': len(self._entries),
+            'in_flight': len(self._inflight)
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def _fresh(self, entry: Tuple[Any, int, Optional[float]]) -> bool:
+        _, cycle, expiry = entry
+        if expiry is None:
+            return cycle == self.cycle
+        return self.clock() < expiry
+
+    def _store(self, key: Hashable, task: asyncio.Task, cycle: int, ttl: Optional[float]):
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.errors += 1
+            logger.warning(f"Market data fetch for {key!r} failed: {task.exception()}")
+            return
+        if ttl is None and cycle != self.cycle:
+            # Already stale; a fetch started this cycle may have stored
+            return
+        expiry = self.clock() + ttl if ttl is not None else None
+        self._entries[key] = (task.result(), cycle, expiry)
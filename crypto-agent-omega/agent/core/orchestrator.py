@@ -3,7 +3,8 @@
 Task orchestrator for CryptoGene-Omega.
 """
 import logging
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +12,9 @@ class TaskOrchestrator:
     """
     Manages and orchestrates agent tasks.
     """
+    def __init__(self, database: Optional[Any] = None):
+        self.database = database
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Performs a system-wide health check.
@@ -20,17 +24,27 @@ class TaskOrchestrator:
         - Blockchain RPC endpoints
         - API integrations (Moralis, etc.)
         """
-        # Placeholder for health check logic
         logger.info("Performing health check...")
         
-        # In a real implementation, you would check connections here
+        database = {'ok': True}
+        if self.database is not None:
+            database = await self.database.health_check()
+        
+        # In a real implementation, you would also check RPC endpoints here
         # For example:
-        # db_ok = await self.database.is_connected()
         # rpc_ok = await self.blockchain.check_rpc_endpoints()
         
+        if not database.get('ok'):
+            return {
+                'ok': False,
+                'error': f"database unavailable: {database.get('error')}",
+                'database': database,
+                'timestamp': datetime.utcnow().isoformat()
+            }
+        
         return {
             'ok': True,
-            'database': 'connected',
+            'database': database,
             'rpc': 'ok',
-            'timestamp': '... a timestamp ...'
+            'timestamp': datetime.utcnow().isoformat()
         }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing for the agent loop.
+
+Stages (health check, database reads, signal generation, risk, trade,
+notification, ...) are timed with ``perf_counter`` into log-bucketed
+latency histograms, overall and per strategy. Each cycle's timings can
+be appended to a JSONL performance stream in the ``performance.jsonl``
+format read by the ralph-analytics scripts:
+
+    {"ts": ..., "iteration": 12, "metric": {"type": "iteration_duration", "duration_ms": 840.2}}
+    {"ts": ..., "iteration": 12, "metric": {"type": "stage_duration", "stage": "signal",
+                                            "strategy": "yield", "duration_ms": 3.1}}
+
+followed by one ``latency_histogram`` record per stage on ``write_summary``.
+Records are written in a worker thread, in order, off the event loop;
+``flush`` waits for them.
+"""
+import asyncio
+import cProfile
+import json
+import logging
+import math
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sub-buckets per power of two: bucket edges grow by 2 ** (1/4), ~19%
+SUB_BUCKETS = 4
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in milliseconds."""
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        bucket = math.ceil(math.log2(ms) * SUB_BUCKETS) if ms > 0 else -10**6
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bucket holding the ``q`` quantile (0-1)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** (bucket / SUB_BUCKETS), self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': self.max_ms,
+            'buckets': {
+                f"{2 ** (b / SUB_BUCKETS):.4g}": n for b, n in sorted(self.buckets.items())
+            }
+        }
+
+
+class CycleProfiler:
+    """
+    Stage timer and performance stream for execute_cycle.
+
+    Args:
+        path: JSONL file to append per-cycle records to (None keeps the
+            histograms in memory only)
+        enabled: When False, ``stage`` is a shared no-op context
+    """
+    def __init__(self, path: Optional[str] = None, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.histograms: Dict[Tuple[str, Optional[str]], LatencyHistogram] = {}
+        self.iteration: Optional[int] = None
+        self._records: List[Dict[str, Any]] = []
+        self._cycle_start = 0.0
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._cprofile_path: Optional[str] = None
+        self._null = nullcontext()
+        # Last queued write; each write waits for the one before it
+        self._writer: Optional[asyncio.Task] = None
+
+    def stage(self, name: str, strategy: Optional[str] = None):
+        """Context manager timing one stage (safe around awaits)."""
+        if not self.enabled:
+            return self._null
+        return self._timed(name, strategy)
+
+    @contextmanager
+    def _timed(self, name: str, strategy: Optional[str]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, strategy)
+
+    def record(self, name: str, ms: float, strategy: Optional[str] = None):
+        """Add a duration to the stage's histogram and the current cycle."""
+        key = (name, strategy)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.record(ms)
+        if self.iteration is not None and self.path:
+            metric = {'type': 'stage_duration', 'stage': name, 'duration_ms': ms}
+            if strategy is not None:
+                metric['strategy'] = strategy
+            self._records.append({'ts': time.time(), 'iteration': self.iteration, 'metric': metric})
+
+    def profile_next_cycle(self, path: str):
+        """Run cProfile over the next cycle and dump pstats to ``path``."""
+        self._cprofile_path = path
+
+    def begin_cycle(self, iteration: int):
+        if not self.enabled:
+            return
+        self.iteration = iteration
+        self._records = []
+        if self._cprofile_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._cycle_start = time.perf_counter()
+
+    def end_cycle(self):
+        """Close the cycle: record its duration and flush its records."""
+        if not self.enabled or self.iteration is None:
+            return
+        ms = (time.perf_counter() - self._cycle_start) * 1000
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._cprofile_path)
+            logger.info(f"📈 Cycle #{self.iteration} profile written to {self._cprofile_path}")
+            self._cprofile = None
+            self._cprofile_path = None
+        self.record('cycle', ms)
+        if self.path:
+            self._records.append({
+                'ts': time.time(),
+                'iteration': self.iteration,
+                'metric': {'type': 'iteration_duration', 'duration_ms': ms}
+            })
+            self._append(self._records)
+        self._records = []
+        self.iteration = None
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Histogram summaries keyed by stage or ``strategy.stage``."""
+        return {
+            (f"{strategy}.{name}" if strategy else name): histogram.summary()
+            for (name, strategy), histogram in sorted(
+                self.histograms.items(), key=lambda item: (item[0][1] or '', item[0][0])
+            )
+        }
+
+    def write_summary(self):
+        """Append one latency_histogram record per stage to the stream."""
+        if not self.path or not self.histograms:
+            return
+        now = time.time()
+        records = []
+        for (name, strategy), histogram in self.histograms.items():
+            metric = {'type': 'latency_histogram', 'stage': name, **histogram.summary()}
+            if strategy is not None:
+                metric['strategy'] = strategy
+            records.append({'ts': now, 'metric': metric})
+        self._append(records)
+
+    async def flush(self):
+        """Wait until every queued record has been written."""
+        if self._writer is not None:
+            await self._writer
+            self._writer = None
+
+    def _append(self, records: List[Dict[str, Any]]):
+        """Queue records for the file (written inline without a running loop)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(records)
+            return
+        self._writer = loop.create_task(self._write_after(self._writer, records))
+
+    async def _write_after(self, previous: Optional[asyncio.Task], records: List[Dict[str, Any]]):
+        if previous is not None:
+            await previous
+        await asyncio.to_thread(self._write, records)
+
+    def _write(self, records: List[Dict[str, Any]]):
+        try:
+            with open(self.path, 'a') as f:
+                f.write(''.join(json.dumps(r, default=str) + '\n' for r in records))
+        except OSError as e:
+            logger.warning(f"Could not write performance records to {self.path}: {e}")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Pre-trade risk engine.
+
+Checks position size, slippage, per-asset exposure, portfolio
+concentration and order rate limits. Exposure per asset is kept in a
+NumPy array that is updated in place on every fill, and batches of
+signals are checked in one vectorized pass over preallocated buffers.
+"""
+import logging
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Reason codes returned by check_batch; REASONS maps them to the strings
+# _run_risk_management has always returned
+OK = 0
+POSITION_SIZE = 1
+SLIPPAGE = 2
+ASSET_EXPOSURE = 3
+CONCENTRATION = 4
+RATE_LIMIT = 5
+
+REASONS = (
+    None,
+    'max_position_size_exceeded',
+    'max_slippage_exceeded',
+    'max_asset_exposure_exceeded',
+    'max_concentration_exceeded',
+    'rate_limit_exceeded'
+)
+
+SIDES = {'buy': 1.0, 'sell': -1.0}
+# Signals routing capital through trades that end in the starting asset
+# (arbitrage cycles): they commit capital but leave exposure unchanged
+ROUND_TRIPS = frozenset({'arbitrage'})
+
+
+class RiskEngine:
+    """
+    Stateful risk checks for single signals or batches.
+
+    Exposure is signed notional per asset. Trades that shrink an asset's
+    absolute exposure are never rejected for exposure or concentration.
+    Concentration (one asset's share of gross exposure) only applies
+    once gross exposure exceeds ``concentration_min_gross`` of the
+    portfolio, so the first positions are not rejected for being alone.
+    Round trips (``ROUND_TRIPS``) are held to the position size limit on
+    the capital they route and count towards the rate limit.
+    """
+    def __init__(
+        self,
+        max_position_size: float = 0.1,
+        max_slippage: float = 0.02,
+        max_asset_exposure: float = 0.25,
+        max_concentration: float = 0.5,
+        concentration_min_gross: float = 0.2,
+        max_orders: int = 60,
+        rate_window: float = 60.0,
+        portfolio_value: float = 10000.0,
+        batch_capacity: int = 4096
+    ):
+        """
+        Args:
+            max_position_size: Largest order as a fraction of the portfolio
+            max_slippage: Largest accepted slippage tolerance
+            max_asset_exposure: Largest absolute exposure per asset, as a
+                fraction of the portfolio
+            max_concentration: Largest share of gross exposure in one asset
+            concentration_min_gross: Gross exposure (fraction of the
+                portfolio) above which concentration is enforced
+            max_orders: Fills allowed per ``rate_window`` seconds
+            rate_window: Rate limit window in seconds
+            portfolio_value: Portfolio value used to size limits
+            batch_capacity: Batch size served without reallocating buffers
+        """
+        self.max_position_size = max_position_size
+        self.max_slippage = max_slippage
+        self.max_asset_exposure = max_asset_exposure
+        self.max_concentration = max_concentration
+        self.concentration_min_gross = concentration_min_gross
+        self.max_orders = max(1, max_orders)
+        self.rate_window = rate_window
+        self.portfolio_value = portfolio_value
+
+        self.asset_ids: Dict[str, int] = {}
+        self.exposure = np.zeros(16)
+        self.gross_exposure = 0.0
+        # Ring buffer of the last max_orders fill times
+        self._fill_times = np.full(self.max_orders, -np.inf)
+        self._fill_head = 0
+        self._allocate(batch_capacity)
+
+    def fresh(self, portfolio_value: Optional[float] = None) -> 'RiskEngine':
+        """A new engine with the same limits and no exposure or fills."""
+        return RiskEngine(
+            max_position_size=self.max_position_size,
+            max_slippage=self.max_slippage,
+            max_asset_exposure=self.max_asset_exposure,
+            max_concentration=self.max_concentration,
+            concentration_min_gross=self.concentration_min_gross,
+            max_orders=self.max_orders,
+            rate_window=self.rate_window,
+            portfolio_value=self.portfolio_value if portfolio_value is None else portfolio_value,
+            batch_capacity=self._capacity
+        )
+
+    def asset_id(self, asset: str) -> int:
+        """Column of ``asset`` in ``exposure``, registering it if new."""
+        asset_id = self.asset_ids.get(asset)
+        if asset_id is None:
+            asset_id = self.asset_ids[asset] = len(self.asset_ids)
+            if asset_id >= len(self.exposure):
+                self.exposure = np.concatenate([self.exposure, np.zeros(len(self.exposure))])
+        return asset_id
+
+    def signal_notional(self, signal: Dict[str, Any]) -> float:
+        """Signed notional of a signal's exposure change (zero for round trips)."""
+        return SIDES.get(signal.get('type'), 0.0) * self.order_notional(signal)
+
+    def order_notional(self, signal: Dict[str, Any]) -> float:
+        """Capital a signal commits: size of the portfolio, else amount x price."""
+        if signal.get('size') is not None:
+            return float(signal['size']) * self.portfolio_value
+        return float(signal.get('amount') or 0) * float(signal.get('price') or 0)
+
+    def order_size(self, signal: Dict[str, Any]) -> float:
+        """Order size as a portfolio fraction, as checked against max_position_size."""
+        if signal.get('type') in ROUND_TRIPS and signal.get('size') is None:
+            return self.order_notional(signal) / self.portfolio_value if self.portfolio_value > 0 else 0.0
+        return float(signal.get('size', 0) or 0)
+
+    # Single signals
+
+    def check(self, signal: Dict[str, Any], now: Optional[float] = None) -> Optional[str]:
+        """Check one signal; returns the rejection reason or None."""
+        if self.order_size(signal) > self.max_position_size:
+            return REASONS[POSITION_SIZE]
+        if float(signal.get('slippage', 0) or 0) > self.max_slippage:
+            return REASONS[SLIPPAGE]
+
+        # Signals without an asset (holds) are not orders
+        asset = signal.get('asset')
+        if asset is None:
+            return None
+
+        notional = self.signal_notional(signal)
+        current = float(self.exposure[self.asset_id(asset)])
+        projected = abs(current + notional)
+        if projected > abs(current):
+            if projected > self.max_asset_exposure * self.portfolio_value:
+                return REASONS[ASSET_EXPOSURE]
+            gross = self.gross_exposure - abs(current) + projected
+            if (gross > self.concentration_min_gross * self.portfolio_value
+                    and projected > self.max_concentration * gross):
+                return REASONS[CONCENTRATION]
+
+        # The slot about to be overwritten holds the oldest of the last
+        # max_orders fills; if it is inside the window the budget is spent
+        if self._fill_times[self._fill_head] > (time.time() if now is None else now) - self.rate_window:
+            return REASONS[RATE_LIMIT]
+        return None
+
+    def record_fill(self, asset: str, notional: float, now: Optional[float] = None):
+        """Apply a fill's signed notional to exposure and the rate limit."""
+        asset_id = self.asset_id(asset)
+        before = float(self.exposure[asset_id])
+        self.exposure[asset_id] = before + notional
+        self.gross_exposure += abs(before + notional) - abs(before)
+        self._fill_times[self._fill_head] = time.time() if now is None else now
+        self._fill_head = (self._fill_head + 1) % self.max_orders
+
+    def _recent_fills(self, now: float) -> int:
+        return int(np.count_nonzero(self._fill_times > now - self.rate_window))
+
+    # Batches
+
+    def check_signals(self, signals: List[Dict[str, Any]], now: Optional[float] = None) -> List[Optional[str]]:
+        """Check signal dicts in one vectorized pass; returns reasons in order."""
+        n = len(signals)
+        self._ensure_capacity(n)
+        for i, signal in enumerate(signals):
+            self._size[i] = self.order_size(signal)
+            self._slippage[i] = float(signal.get('slippage', 0) or 0)
+            asset = signal.get('asset')
+            self._assets[i] = self.asset_id(asset) if asset is not None else -1
+            self._notional[i] = self.signal_notional(signal)
+        codes = self.check_batch(
+            self._size[:n], self._slippage[:n], self._assets[:n], self._notional[:n], now
+        )
+        return [REASONS[code] for code in codes.tolist()]
+
+    def check_batch(
+        self,
+        sizes: np.ndarray,
+        slippages: np.ndarray,
+        assets: np.ndarray,
+        notionals: np.ndarray,
+        now: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Check a batch of signals in order.
+
+        Exposure checks count every earlier signal in the batch that passed
+        the size and slippage checks as filled, so the batch as a whole can
+        never exceed a limit (at worst a signal is rejected that would
+        have passed had an earlier one been rejected too).
+
+        Args:
+            sizes: Order sizes as portfolio fractions
+            slippages: Slippage tolerances
+            assets: Asset ids from ``asset_id`` (-1 for none)
+            notionals: Signed notionals
+            now: Epoch seconds for the rate limit (default: wall clock)
+
+        Returns:
+            int8 reason codes (index into REASONS). The array is an
+            internal buffer, valid until the next call.
+        """
+        n = len(sizes)
+        self._ensure_capacity(n)
+        codes, mask, free = self._codes[:n], self._mask[:n], self._free[:n]
+        codes.fill(OK)
+
+        np.greater(sizes, self.max_position_size, out=mask)
+        self._flag(codes, mask, free, POSITION_SIZE)
+        np.greater(slippages, self.max_slippage, out=mask)
+        self._flag(codes, mask, free, SLIPPAGE)
+
+        has_asset = assets >= 0
+        if has_asset.any():
+            np.equal(codes, OK, out=mask)
+            np.logical_and(mask, has_asset, out=mask)
+            current, projected = self._project(assets, notionals, mask, n)
+            before, after = self._before[:n], self._after[:n]
+            np.abs(current, out=before)
+            np.abs(projected, out=after)
+            growing = self._growing[:n]
+            np.greater(after, before, out=growing)
+            np.logical_and(growing, has_asset, out=growing)
+
+            np.greater(after, self.max_asset_exposure * self.portfolio_value, out=mask)
+            np.logical_and(mask, growing, out=mask)
+            self._flag(codes, mask, free, ASSET_EXPOSURE)
+
+            # Gross exposure after each trade, other assets held fixed
+            gross = self._gross[:n]
+            np.subtract(after, before, out=gross)
+            gross += self.gross_exposure
+            np.greater(gross, self.concentration_min_gross * self.portfolio_value, out=mask)
+            np.logical_and(mask, growing, out=mask)
+            np.multiply(gross, self.max_concentration, out=gross)
+            np.greater(after, gross, out=free)
+            np.logical_and(mask, free, out=mask)
+            self._flag(codes, mask, free, CONCENTRATION)
+
+        # Rate limit: only orders still passing use up the remaining budget
+        remaining = self.max_orders - self._recent_fills(time.time() if now is None else now)
+        np.equal(codes, OK, out=free)
+        np.logical_and(free, has_asset, out=free)
+        rank = self._rank[:n]
+        np.cumsum(free, out=rank)
+        np.greater(rank, remaining, out=mask)
+        np.logical_and(mask, has_asset, out=mask)
+        self._flag(codes, mask, free, RATE_LIMIT)
+        return codes
+
+    def _project(self, assets: np.ndarray, notionals: np.ndarray, active: np.ndarray, n: int):
+        """Exposure before and after each signal, including earlier ones in the batch."""
+        safe = self._safe_assets[:n]
+        np.maximum(assets, 0, out=safe)
+        current = self._current[:n]
+        np.take(self.exposure, safe, out=current)
+
+        # Running per-asset total of earlier active signals in the batch;
+        # rows without an asset share id 0 but contribute nothing
+        order = np.argsort(safe, kind='stable')
+        ordered = np.where(active, notionals, 0.0)[order]
+        running = np.cumsum(ordered)
+        ids = safe[order]
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        lengths = np.diff(np.r_[starts, n])
+        offsets = np.repeat(running[starts] - ordered[starts], lengths)
+        prior = self._prior[:n]
+        prior[order] = running - offsets - ordered
+
+        current += prior
+        projected = self._projected[:n]
+        np.add(current, notionals, out=projected)
+        return current, projected
+
+    @staticmethod
+    def _flag(codes: np.ndarray, mask: np.ndarray, free: np.ndarray, code: int):
+        """Set ``code`` where ``mask`` holds and no earlier check failed."""
+        np.equal(codes, OK, out=free)
+        np.logical_and(mask, free, out=mask)
+        np.copyto(codes, code, where=mask)
+
+    def _ensure_capacity(self, n: int):
+        if n > self._capacity:
+            self._allocate(max(n, 2 * self._capacity))
+
+    def _allocate(self, capacity: int):
+        self._capacity = capacity
+        self._codes = np.zeros(capacity, dtype=np.int8)
+        self._mask = np.zeros(capacity, dtype=bool)
+        self._free = np.zeros(capacity, dtype=bool)
+        self._growing = np.zeros(capacity, dtype=bool)
+        self._rank = np.zeros(capacity, dtype=np.int64)
+        self._assets = np.zeros(capacity, dtype=np.int64)
+        self._safe_assets = np.zeros(capacity, dtype=np.int64)
+        for name in ('_size', '_slippage', '_notional', '_current', '_prior',
+                     '_projected', '_before', '_after', '_gross'):
+            setattr(self, name, np.zeros(capacity))
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Resident scheduler for periodic agent work.
+
+Keeps one process (and one initialized agent) alive and fires jobs on
+fixed cadences. Fire times are anchored to the schedule's start, so a
+slow run or late wakeup never pushes later runs back, and jitter applies
+to each fire without accumulating. A fire that arrives while the
+previous run is still going is skipped or coalesced into one follow-up
+run. ``stop()`` (wired to SIGTERM/SIGINT) stops new fires and drains the
+runs in flight.
+"""
+import asyncio
+import logging
+import random
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERLAP_POLICIES = ('skip', 'coalesce')
+
+
+class PeriodicJob:
+    """A coroutine function fired every ``interval`` seconds."""
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        jitter: float = 0.0,
+        overlap: str = 'skip',
+        run_immediately: bool = True
+    ):
+        if interval <= 0:
+            raise ValueError(f"Job {name} needs a positive interval")
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.overlap = overlap
+        self.run_immediately = run_immediately
+        self.task: Optional[asyncio.Task] = None
+        self.pending = False
+
+        self.runs = 0
+        self.errors = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.missed = 0
+        self.last_duration = 0.0
+        self.max_lateness = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'errors': self.errors,
+            'skipped': self.skipped,
+            'coalesced': self.coalesced,
+            'missed': self.missed,
+            'running': self.running,
+            'last_duration': self.last_duration,
+            'max_lateness': self.max_lateness
+        }
+
+
+class Scheduler:
+    """
+    Drift-corrected periodic scheduler on the running event loop.
+
+    Args:
+        drain_timeout: Seconds ``run`` waits for in-flight runs after a
+            stop before cancelling them (None waits indefinitely)
+        seed: Seed for the jitter RNG
+    """
+    def __init__(self, drain_timeout: Optional[float] = 300.0, seed: Optional[int] = None):
+        self.drain_timeout = drain_timeout
+        self.jobs: Dict[str, PeriodicJob] = {}
+        self._rng = random.Random(seed)
+        self._stopping: Optional[asyncio.Event] = None
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval: float,
+        jitter: float = 0.0,
+        overlap: str = 'skip',
+        run_immediately: bool = True
+    ) -> PeriodicJob:
+        """
+        Register a job.
+
+        Args:
+            name: Job name for logs and stats
+            func: Coroutine function to run
+            interval: Seconds between fires
+            jitter: Each fire is delayed by up to this many seconds
+            overlap: 'skip' drops a fire while the job is running;
+                'coalesce' runs once more as soon as it finishes
+            run_immediately: Fire at start instead of after one interval
+        """
+        job = PeriodicJob(name, func, interval, jitter, overlap, run_immediately)
+        self.jobs[name] = job
+        return job
+
+    def stop(self):
+        """Stop firing jobs; ``run`` returns once in-flight runs drain."""
+        if self._stopping is not None and not self._stopping.is_set():
+            logger.info("🛑 Scheduler stopping, draining in-flight work")
+            self._stopping.set()
+
+    def install_signal_handlers(self, signals=(signal.SIGTERM, signal.SIGINT)):
+        """Call ``stop`` on the given signals (main thread, Unix only)."""
+        loop = asyncio.get_running_loop()
+        for sig in signals:
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(self.stop))
+
+    async def run(self):
+        """Fire jobs until ``stop()``, then drain them."""
+        self._stopping = asyncio.Event()
+        start = time.monotonic()
+        timers = [asyncio.create_task(self._timer(job, start)) for job in self.jobs.values()]
+        logger.info(
+            "⏱️ Scheduler running: " + ', '.join(
+                f"{job.name} every {job.interval:g}s" for job in self.jobs.values()
+            )
+        )
+        try:
+            await self._stopping.wait()
+        finally:
+            for timer in timers:
+                timer.cancel()
+            await asyncio.gather(*timers, return_exceptions=True)
+            await self._drain()
+        logger.info(f"Scheduler stopped: {self.stats()}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: job.stats() for name, job in self.jobs.items()}
+
+    async def _timer(self, job: PeriodicJob, start: float):
+        fire = 0 if job.run_immediately else 1
+        while True:
+            deadline = start + fire * job.interval
+            if job.jitter > 0:
+                deadline += self._rng.uniform(0.0, job.jitter)
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            job.max_lateness = max(job.max_lateness, time.monotonic() - deadline)
+            self._fire(job)
+
+            # Anchor to the schedule; fires missed entirely (e.g. the
+            # process was suspended) are counted, not replayed
+            fire += 1
+            behind = int((time.monotonic() - (start + fire * job.interval)) // job.interval)
+            if behind > 0:
+                job.missed += behind
+                fire += behind
+
+    def _fire(self, job: PeriodicJob):
+        if job.running:
+            if job.overlap == 'coalesce':
+                job.coalesced += 1
+                job.pending = True
+            else:
+                job.skipped += 1
+                logger.info(f"Skipping {job.name}: previous run still in progress")
+            return
+        job.task = asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: PeriodicJob):
+        while True:
+            job.pending = False
+            started = time.monotonic()
+            try:
+                await job.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.errors += 1
+                logger.error(f"Scheduled job {job.name} failed: {e}")
+            finally:
+                job.runs += 1
+                job.last_duration = time.monotonic() - started
+            if not job.pending or self._stopping.is_set():
+                return
+
+    async def _drain(self):
+        running: List[asyncio.Task] = [job.task for job in self.jobs.values() if job.running]
+        if not running:
+            return
+        done, pending = await asyncio.wait(running, timeout=self.drain_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} jobs still running after drain timeout")
+            await asyncio.gather(*pending, return_exceptions=True)
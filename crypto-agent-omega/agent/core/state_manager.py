@@ -2,38 +2,223 @@
 """
 State manager for saving/loading agent state.
 """
+import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional
+import os
+import pickle
+import struct
+import tempfile
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
+FORMATS = ('json', 'pickle', 'msgpack')
+_LENGTH = struct.Struct('>I')
+
+
+def _infer_format(filepath: str) -> str:
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext in ('.pkl', '.pickle'):
+        return 'pickle'
+    if ext in ('.msgpack', '.mpk'):
+        return 'msgpack'
+    return 'json'
+
+
 class StateManager:
     """
     Handles persistence of the agent's state.
+
+    The state lives in a snapshot file plus an append-only delta log
+    (``<filepath>.log``). Each save appends only the top-level keys that
+    changed or were removed, and every ``compact_every`` saves the
+    snapshot is rewritten and the log truncated. Snapshots are written
+    atomically (temp file, fsync, rename) and all file I/O runs in a
+    worker thread so the event loop never blocks on disk.
+
+    Formats: 'json' (default for ``.json``), 'pickle' (protocol 5) and
+    'msgpack' (requires the msgpack package); inferred from the extension
+    when not given.
     """
-    def __init__(self, filepath: str = 'state.json'):
+    def __init__(
+        self,
+        filepath: str = 'state.json',
+        format: Optional[str] = None,
+        compact_every: int = 100
+    ):
         self.filepath = filepath
+        self.log_path = f"{filepath}.log"
+        self.format = format or _infer_format(filepath)
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown state format: {self.format}")
+        if self.format == 'msgpack' and msgpack is None:
+            raise RuntimeError("msgpack is required for the msgpack state format")
+        self.compact_every = max(1, compact_every)
+
+        self._state: Optional[Dict[str, Any]] = None
+        self._deltas_since_snapshot = 0
+        self._lock = asyncio.Lock()
 
     async def save_state(self, state: Dict[str, Any]):
-        """Save agent state to a file."""
+        """Save agent state, appending only what changed since the last save."""
         try:
-            with open(self.filepath, 'w') as f:
-                json.dump(state, f, indent=4)
-            logger.info(f"Saved state to {self.filepath}")
+            async with self._lock:
+                await asyncio.to_thread(self._save_sync, dict(state))
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
 
     async def load_state(self) -> Optional[Dict[str, Any]]:
-        """Load agent state from a file."""
+        """Load agent state from the snapshot and replay the delta log."""
         try:
-            with open(self.filepath, 'r') as f:
-                state = json.load(f)
-                logger.info(f"Loaded state from {self.filepath}")
-                return state
-        except FileNotFoundError:
-            logger.warning("State file not found. Starting fresh.")
-            return None
+            async with self._lock:
+                state = await asyncio.to_thread(self._load_sync)
         except Exception as e:
             logger.error(f"Failed to load state: {e}")
             return None
+        if state is None:
+            logger.warning("State file not found. Starting fresh.")
+            return None
+        logger.info(f"Loaded state from {self.filepath}")
+        return dict(state)
+
+    # Serialization
+
+    def _dumps(self, obj: Any) -> bytes:
+        if self.format == 'pickle':
+            return pickle.dumps(obj, protocol=5)
+        if self.format == 'msgpack':
+            return msgpack.packb(obj, default=str, use_bin_type=True)
+        return json.dumps(obj, default=str, separators=(',', ':')).encode('utf-8')
+
+    def _loads(self, data: bytes) -> Any:
+        if self.format == 'pickle':
+            return pickle.loads(data)
+        if self.format == 'msgpack':
+            return msgpack.unpackb(data, raw=False)
+        return json.loads(data.decode('utf-8'))
+
+    # Sync I/O, run in a worker thread
+
+    def _save_sync(self, state: Dict[str, Any]):
+        if self._state is None:
+            self._state = self._load_sync() or {}
+            if not os.path.exists(self.filepath):
+                self._write_snapshot(state)
+                return
+
+        changed = {k: v for k, v in state.items() if k not in self._state or self._state[k] != v}
+        removed = [k for k in self._state if k not in state]
+        if not changed and not removed:
+            return
+
+        if self._deltas_since_snapshot + 1 >= self.compact_every:
+            self._write_snapshot(state)
+            return
+
+        self._append_delta({'set': changed, 'unset': removed})
+        self._state = state
+        self._deltas_since_snapshot += 1
+        logger.info(f"Saved state delta ({len(changed)} set, {len(removed)} unset) to {self.log_path}")
+
+    def _write_snapshot(self, state: Dict[str, Any]):
+        """Atomically replace the snapshot, then truncate the delta log."""
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.state-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._dumps(state))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        _fsync_directory(directory)
+
+        # Replaying stale deltas over the new snapshot is harmless, so a
+        # crash between the rename and the truncate loses nothing
+        if os.path.exists(self.log_path):
+            os.truncate(self.log_path, 0)
+
+        self._state = state
+        self._deltas_since_snapshot = 0
+        logger.info(f"Saved state snapshot to {self.filepath}")
+
+    def _append_delta(self, delta: Dict[str, Any]):
+        payload = self._dumps(delta)
+        if self.format == 'json':
+            record = payload + b'\n'
+        else:
+            record = _LENGTH.pack(len(payload)) + payload
+        with open(self.log_path, 'ab') as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load_sync(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.filepath):
+            self._state = None
+            return None
+
+        with open(self.filepath, 'rb') as f:
+            state = self._loads(f.read())
+
+        deltas, good_offset, torn = self._read_deltas()
+        for delta in deltas:
+            state.update(delta.get('set', {}))
+            for key in delta.get('unset', []):
+                state.pop(key, None)
+        if torn:
+            logger.warning(f"Discarding torn record at end of {self.log_path}")
+            os.truncate(self.log_path, good_offset)
+
+        self._state = state
+        self._deltas_since_snapshot = len(deltas)
+        return state
+
+    def _read_deltas(self) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """Read complete delta records; returns (deltas, end offset, torn)."""
+        if not os.path.exists(self.log_path):
+            return [], 0, False
+        with open(self.log_path, 'rb') as f:
+            data = f.read()
+
+        deltas = []
+        offset = 0
+        while offset < len(data):
+            try:
+                if self.format == 'json':
+                    end = data.index(b'\n', offset)
+                    deltas.append(self._loads(data[offset:end]))
+                    offset = end + 1
+                else:
+                    (length,) = _LENGTH.unpack_from(data, offset)
+                    start = offset + _LENGTH.size
+                    if start + length > len(data):
+                        raise ValueError("truncated record")
+                    deltas.append(self._loads(data[start:start + length]))
+                    offset = start + length
+            except Exception:
+                return deltas, offset, True
+        return deltas, offset, False
+
+
+def _fsync_directory(directory: str):
+    """Persist a rename by syncing its directory (no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -2,29 +2,251 @@
 """
 Database client for PostgreSQL.
 """
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, Any, Awaitable, Callable, List, Optional, Tuple
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Bounded queue that batches writes off the trading path.
+
+    Records are tagged with a kind ('execution', 'belief', ...) and handed
+    to the matching writer in batches once ``batch_size`` records are
+    queued or ``flush_interval`` seconds have passed. ``put`` blocks while
+    the queue is full, so a stalled database slows producers down instead
+    of growing memory without bound.
+
+    Records whose write fails are kept and retried ahead of the queue on
+    every later flush, up to ``max_size`` of them; beyond that the oldest
+    are dropped. Records still failing when ``stop`` makes its last
+    attempt are dropped and counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        writers: Dict[str, Callable[[List[Any]], Awaitable[None]]],
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0
+    ):
+        self.writers = writers
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._retry: List[Tuple[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.retried = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flush task."""
+        if not self.running:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and flush everything still queued."""
+        if self._task is not None:
+            # Let an in-progress flush finish rather than cancelling it
+            # between dequeue and write
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._retry:
+            logger.error(f"Dropping {len(self._retry)} records that could not be written")
+            self.dropped += len(self._retry)
+            self._retry = []
+
+    async def put(self, kind: str, record: Any):
+        """Queue a record, waiting for room if the buffer is full."""
+        await self._queue.put((kind, record))
+        self.enqueued += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Write out everything currently queued."""
+        async with self._lock:
+            retry, self._retry = self._retry, []
+            for i in range(0, len(retry), self.batch_size):
+                await self._write(retry[i:i + self.batch_size])
+            while not self._queue.empty():
+                batch: List[Tuple[str, Any]] = []
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    self._queue.task_done()
+                await self._write(batch)
+
+    async def _write(self, batch: List[Tuple[str, Any]]):
+        """Group a batch by kind and hand each group to its writer."""
+        grouped: Dict[str, List[Any]] = {}
+        for kind, record in batch:
+            grouped.setdefault(kind, []).append(record)
+
+        start = time.perf_counter()
+        for kind, records in grouped.items():
+            try:
+                await self.writers[kind](records)
+                self.flushed += len(records)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(records)} {kind} records, will retry: {e}")
+                self.retried += len(records)
+                self._retry.extend((kind, record) for record in records)
+
+        overflow = len(self._retry) - self.max_size
+        if overflow > 0:
+            logger.error(f"Retry backlog full, dropping {overflow} oldest records")
+            del self._retry[:overflow]
+            self.dropped += overflow
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self.total_flush_ms += elapsed_ms
+
+    async def _run(self):
+        """Flush on size (via wakeup) or time thresholds."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and flush latency counters."""
+        return {
+            'queue_depth': self._queue.qsize(),
+            'enqueued': self.enqueued,
+            'flushed': self.flushed,
+            'dropped': self.dropped,
+            'retried': self.retried,
+            'retry_backlog': len(self._retry),
+            'flushes': self.flushes,
+            'last_flush_ms': self.last_flush_ms,
+            'max_flush_ms': self.max_flush_ms,
+            'avg_flush_ms': self.total_flush_ms / self.flushes if self.flushes else 0.0
+        }
+
 
 class DatabaseClient:
+    def __init__(
+        self,
+        write_behind: bool = True,
+        buffer_size: int = 10000,
+        flush_batch_size: int = 500,
+        flush_interval: float = 1.0
+    ):
+        """
+        Args:
+            write_behind: Queue execution logs and belief updates and write
+                them in batches instead of inline
+            buffer_size: Maximum queued records before writers block
+            flush_batch_size: Records per multi-row write
+            flush_interval: Maximum seconds a record waits before flushing
+        """
+        self.write_behind = write_behind
+        self.buffer_size = buffer_size
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self.buffer: Optional[WriteBehindBuffer] = None
+
     async def connect(self):
         # Placeholder
         print("Connecting to database...")
+        self._start_buffer()
+
+    def _start_buffer(self):
+        """Start the write-behind buffer if enabled."""
+        if self.write_behind:
+            self.buffer = WriteBehindBuffer(
+                writers={
+                    'execution': self._insert_executions,
+                    'belief': self._update_belief_scores
+                },
+                max_size=self.buffer_size,
+                batch_size=self.flush_batch_size,
+                flush_interval=self.flush_interval
+            )
+            self.buffer.start()
 
     async def disconnect(self):
+        if self.buffer is not None:
+            await self.buffer.stop()
         # Placeholder
         print("Disconnecting from database...")
 
+    async def health_check(self) -> Dict[str, Any]:
+        # Placeholder
+        return {'ok': True}
+
+    async def flush(self):
+        """Write out any buffered records immediately."""
+        if self.buffer is not None:
+            await self.buffer.flush()
+
     async def get_strategy_params(self, strategy_name):
         # Placeholder
         return {}
 
     async def log_execution(self, strategy_name, result):
-        # Placeholder
-        pass
+        record = (strategy_name, result)
+        if self.buffer is not None and self.buffer.running:
+            await self.buffer.put('execution', record)
+        else:
+            await self._insert_executions([record])
 
     async def get_belief_score(self, strategy_name):
         # Placeholder
         return 0.7
 
     async def update_belief_score(self, strategy_name, score):
+        record = (strategy_name, score)
+        if self.buffer is not None and self.buffer.running:
+            await self.buffer.put('belief', record)
+        else:
+            await self._update_belief_scores([record])
+
+    async def _insert_executions(self, records: List[Tuple[str, Dict]]):
+        """Write execution records with a single multi-row INSERT."""
+        # Placeholder
+        pass
+
+    async def _update_belief_scores(self, records: List[Tuple[str, float]]):
+        """Apply belief updates; the last score queued per strategy wins."""
         # Placeholder
         pass
 
@@ -32,6 +254,11 @@ class DatabaseClient:
         # Placeholder
         return []
 
+    async def get_portfolio_value(self) -> Optional[float]:
+        """Current portfolio equity, or None when no valuation source exists."""
+        # Placeholder
+        return None
+
     async def save_strategy_params(self, strategy_name, params):
         # Placeholder
         pass
@@ -39,3 +266,252 @@ class DatabaseClient:
     async def is_strategy_enabled(self, strategy_name):
         # Placeholder
         return True
+
+    async def get_strategy_snapshot(self, strategy_names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch enablement, belief score and parameters for many strategies.
+
+        Replaces one round trip per strategy and attribute with a single
+        ``SELECT name, enabled, belief_score, parameters FROM strategies
+        WHERE name = ANY($1)``. Every requested name gets an entry; names
+        missing from the table fall back to the same defaults as the
+        single-strategy getters.
+
+        Returns:
+            Mapping of strategy name to
+            ``{'enabled': bool, 'belief_score': float, 'parameters': dict}``
+        """
+        # Placeholder
+        return {
+            name: {
+                'enabled': await self.is_strategy_enabled(name),
+                'belief_score': await self.get_belief_score(name),
+                'parameters': await self.get_strategy_params(name)
+            }
+            for name in strategy_names
+        }
+
+
+class PostgresDatabaseClient(DatabaseClient):
+    """
+    asyncpg-backed DatabaseClient.
+
+    Uses a connection pool sized by ``min_size``/``max_size``. Every new
+    connection registers a JSONB codec and prepares the hot queries up
+    front, so belief lookups, execution logging and parameter loads run
+    as cached prepared statements from the first cycle on.
+    """
+
+    # Matches the strategies.belief_score default (migration 008) and the
+    # placeholder client, and clears StrategyExecutor.min_confidence so new
+    # strategies execute until belief rewrite has scored them
+    DEFAULT_BELIEF_SCORE = 0.7
+
+    # Hot queries, prepared on every pooled connection
+    SQL_STRATEGY_PARAMS = "SELECT parameters FROM strategies WHERE name = $1"
+    SQL_BELIEF_SCORE = "SELECT belief_score FROM strategies WHERE name = $1"
+    SQL_STRATEGY_ENABLED = "SELECT enabled FROM strategies WHERE name = $1"
+    SQL_STRATEGY_SNAPSHOT = (
+        "SELECT name, enabled, belief_score, parameters "
+        "FROM strategies WHERE name = ANY($1::text[])"
+    )
+    SQL_ENSURE_STRATEGIES = (
+        "INSERT INTO strategies (name) "
+        "SELECT DISTINCT unnest($1::text[]) "
+        "ON CONFLICT (name) DO NOTHING"
+    )
+    SQL_INSERT_EXECUTIONS = (
+        "INSERT INTO executions (strategy_id, success, profit_loss, result) "
+        "SELECT s.id, r.success, r.profit_loss, r.result "
+        "FROM unnest($1::text[], $2::boolean[], $3::numeric[], $4::jsonb[]) "
+        "AS r(name, success, profit_loss, result) "
+        "JOIN strategies s ON s.name = r.name"
+    )
+    SQL_UPSERT_BELIEF_SCORES = (
+        "INSERT INTO strategies (name, belief_score) "
+        "SELECT * FROM unnest($1::text[], $2::double precision[]) "
+        "ON CONFLICT (name) DO UPDATE SET belief_score = EXCLUDED.belief_score"
+    )
+    SQL_UPSERT_PARAMS = (
+        "INSERT INTO strategies (name, parameters) VALUES ($1, $2) "
+        "ON CONFLICT (name) DO UPDATE SET parameters = EXCLUDED.parameters"
+    )
+    SQL_RECENT_PERFORMANCE = (
+        "SELECT s.name AS strategy, e.timestamp, e.success, e.profit_loss, e.result "
+        "FROM executions e JOIN strategies s ON s.id = e.strategy_id "
+        "WHERE e.timestamp > NOW() - make_interval(days => $1) "
+        "ORDER BY e.timestamp"
+    )
+
+    PREPARED_QUERIES = (
+        SQL_STRATEGY_PARAMS,
+        SQL_BELIEF_SCORE,
+        SQL_STRATEGY_ENABLED,
+        SQL_STRATEGY_SNAPSHOT,
+        SQL_ENSURE_STRATEGIES,
+        SQL_INSERT_EXECUTIONS,
+        SQL_UPSERT_BELIEF_SCORES,
+    )
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        min_size: int = 2,
+        max_size: int = 10,
+        command_timeout: float = 10.0,
+        statement_cache_size: int = 100,
+        max_inactive_connection_lifetime: float = 300.0,
+        **buffer_options
+    ):
+        """
+        Args:
+            dsn: PostgreSQL connection string (defaults to DATABASE_URL)
+            min_size: Connections opened eagerly when the pool starts
+            max_size: Upper bound on pooled connections
+            command_timeout: Default per-query timeout in seconds
+            statement_cache_size: Prepared statements cached per connection
+            max_inactive_connection_lifetime: Seconds before idle
+                connections are closed and replaced
+            **buffer_options: Write-behind settings for DatabaseClient
+        """
+        super().__init__(**buffer_options)
+        self.dsn = dsn or os.getenv('DATABASE_URL')
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self.statement_cache_size = statement_cache_size
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime
+        self.pool = None
+
+    async def connect(self):
+        if asyncpg is None:
+            raise RuntimeError("asyncpg is required for PostgresDatabaseClient")
+        if not self.dsn:
+            raise RuntimeError("DATABASE_URL is not set")
+
+        self.pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            command_timeout=self.command_timeout,
+            statement_cache_size=self.statement_cache_size,
+            max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+            init=self._init_connection
+        )
+        logger.info(
+            f"Connected to PostgreSQL (pool {self.min_size}-{self.max_size})"
+        )
+        self._start_buffer()
+
+    async def disconnect(self):
+        if self.buffer is not None:
+            await self.buffer.stop()
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        logger.info("Disconnected from PostgreSQL")
+
+    async def _init_connection(self, conn):
+        """Register codecs and warm the statement cache for a new connection."""
+        await conn.set_type_codec(
+            'jsonb',
+            encoder=lambda value: json.dumps(value, default=str),
+            decoder=json.loads,
+            schema='pg_catalog'
+        )
+        for query in self.PREPARED_QUERIES:
+            await conn.prepare(query)
+
+    async def health_check(self, timeout: float = 2.0) -> Dict[str, Any]:
+        """Round-trip a trivial query and report pool occupancy."""
+        if self.pool is None:
+            return {'ok': False, 'error': 'not connected'}
+        start = time.perf_counter()
+        try:
+            async with self.pool.acquire(timeout=timeout) as conn:
+                await conn.fetchval("SELECT 1", timeout=timeout)
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+        return {
+            'ok': True,
+            'latency_ms': (time.perf_counter() - start) * 1000,
+            'pool_size': self.pool.get_size(),
+            'pool_idle': self.pool.get_idle_size()
+        }
+
+    async def get_strategy_params(self, strategy_name):
+        params = await self.pool.fetchval(self.SQL_STRATEGY_PARAMS, strategy_name)
+        return params or {}
+
+    async def get_belief_score(self, strategy_name):
+        score = await self.pool.fetchval(self.SQL_BELIEF_SCORE, strategy_name)
+        return score if score is not None else self.DEFAULT_BELIEF_SCORE
+
+    async def is_strategy_enabled(self, strategy_name):
+        enabled = await self.pool.fetchval(self.SQL_STRATEGY_ENABLED, strategy_name)
+        return enabled if enabled is not None else True
+
+    async def get_strategy_snapshot(self, strategy_names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        names = list(strategy_names)
+        rows = await self.pool.fetch(self.SQL_STRATEGY_SNAPSHOT, names)
+        found = {row['name']: row for row in rows}
+
+        snapshot = {}
+        for name in names:
+            row = found.get(name)
+            if row is None:
+                snapshot[name] = {
+                    'enabled': True,
+                    'belief_score': self.DEFAULT_BELIEF_SCORE,
+                    'parameters': {}
+                }
+                continue
+            snapshot[name] = {
+                'enabled': row['enabled'] if row['enabled'] is not None else True,
+                'belief_score': (
+                    row['belief_score'] if row['belief_score'] is not None
+                    else self.DEFAULT_BELIEF_SCORE
+                ),
+                'parameters': row['parameters'] or {}
+            }
+        return snapshot
+
+    async def _insert_executions(self, records: List[Tuple[str, Dict]]):
+        names = [name for name, _ in records]
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(self.SQL_ENSURE_STRATEGIES, names)
+                await conn.execute(
+                    self.SQL_INSERT_EXECUTIONS,
+                    names,
+                    [bool(result.get('success', False)) for _, result in records],
+                    [result.get('profit_loss', 0) for _, result in records],
+                    [result for _, result in records]
+                )
+
+    async def _update_belief_scores(self, records: List[Tuple[str, float]]):
+        latest = dict(records)
+        await self.pool.execute(
+            self.SQL_UPSERT_BELIEF_SCORES,
+            list(latest.keys()),
+            [float(score) for score in latest.values()]
+        )
+
+    async def get_recent_performance(self, days):
+        rows = await self.pool.fetch(self.SQL_RECENT_PERFORMANCE, days)
+        return [dict(row) for row in rows]
+
+    async def save_strategy_params(self, strategy_name, params):
+        await self.pool.execute(self.SQL_UPSERT_PARAMS, strategy_name, params)
+
+
+def create_database_client(**options) -> DatabaseClient:
+    """
+    Build the Postgres client when DATABASE_URL and asyncpg are available,
+    otherwise fall back to the offline placeholder client.
+    """
+    if asyncpg is not None and (options.get('dsn') or os.getenv('DATABASE_URL')):
+        return PostgresDatabaseClient(**options)
+    logger.warning("DATABASE_URL or asyncpg missing, using offline database client")
+    options.pop('dsn', None)
+    return DatabaseClient(**options)
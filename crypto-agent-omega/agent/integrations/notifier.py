@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Background notification dispatcher for Telegram.
+
+``notify`` only appends to an in-memory buffer and returns, so trading
+paths never wait on the network. A background task sends the buffers
+through one pooled aiohttp session: messages for a chat that arrive
+within ``digest_window`` of each other are merged into one digest, sends
+are paced by per-chat and global token buckets (Telegram allows about
+one message per second per chat and 30 per second overall), and failed
+sends are retried with exponential backoff, honouring 429 retry_after.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# Telegram rejects messages longer than this
+MAX_MESSAGE_LENGTH = 4096
+DIGEST_SEPARATOR = '\n\n'
+
+
+class NotificationError(Exception):
+    """A send that should not be retried (bad token, unknown chat, ...)."""
+
+
+class RetryAfter(Exception):
+    """The API asked us to wait ``delay`` seconds before retrying."""
+    def __init__(self, delay: float):
+        super().__init__(f"retry after {delay}s")
+        self.delay = delay
+
+
+class TokenBucket:
+    """Allows ``rate`` events per second with bursts up to ``capacity``."""
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class _ChatBuffer:
+    def __init__(self):
+        self.messages: Deque[str] = deque()
+        self.first_at = 0.0
+        self.urgent = False
+        self.sending = False
+
+
+class NotificationDispatcher:
+    """
+    Queue-backed, rate-limited, batching Telegram sender.
+
+    Args:
+        bot_token: Bot token (default: TELEGRAM_BOT_TOKEN); without one
+            messages are printed as they arrive instead of sent
+        chat_id: Default chat (default: TELEGRAM_CHAT_ID)
+        digest_window: Seconds to wait for more messages before sending
+        chat_rate: Messages per second per chat
+        chat_burst: Messages a chat may send back to back
+        global_rate: Messages per second across all chats
+        max_pending: Buffered messages per chat before the oldest drop
+        max_retries: Attempts after the first before a digest is dropped
+        backoff: Base delay in seconds for exponential backoff
+        transport: ``async (chat_id, text)`` replacing the HTTP send
+    """
+    def __init__(
+        self,
+        bot_token: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        digest_window: float = 2.0,
+        chat_rate: float = 1.0,
+        chat_burst: float = 3.0,
+        global_rate: float = 30.0,
+        max_pending: int = 500,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        transport: Optional[Callable[[str, str], Awaitable[Any]]] = None
+    ):
+        self.bot_token = bot_token or os.getenv('TELEGRAM_BOT_TOKEN')
+        self.chat_id = chat_id or os.getenv('TELEGRAM_CHAT_ID')
+        self.digest_window = digest_window
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.backoff = backoff
+        if transport is not None:
+            self.transport = transport
+        elif self.bot_token and aiohttp is not None:
+            self.transport = self._send_http
+        else:
+            self.transport = None
+
+        self._buffers: Dict[str, _ChatBuffer] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._senders: set = set()
+        self._session = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        # Set while nothing is buffered or being sent
+        self._idle: Optional[asyncio.Event] = None
+        self._closing = False
+
+        self.queued = 0
+        self.sent = 0
+        self.digests = 0
+        self.dropped = 0
+        self.retries = 0
+        self.failed = 0
+
+    def notify(self, text: str, chat_id: Optional[str] = None, urgent: bool = False):
+        """
+        Buffer a message for background delivery; never blocks.
+
+        Args:
+            text: Message text
+            chat_id: Target chat (default: the dispatcher's chat)
+            urgent: Send without waiting for the digest window
+        """
+        if self.transport is None:
+            print(f"TELEGRAM {'ALERT' if urgent else 'NOTIFICATION'}: {text}")
+            self.queued += 1
+            self.sent += 1
+            return
+        chat = str(chat_id or self.chat_id)
+        buffer = self._buffers.get(chat)
+        if buffer is None:
+            buffer = self._buffers[chat] = _ChatBuffer()
+        if not buffer.messages:
+            buffer.first_at = time.monotonic()
+        buffer.messages.append(text)
+        buffer.urgent = buffer.urgent or urgent
+        self.queued += 1
+        if len(buffer.messages) > self.max_pending:
+            buffer.messages.popleft()
+            self.dropped += 1
+        self._ensure_worker()
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def flush(self, timeout: Optional[float] = None):
+        """Send everything buffered now, ignoring the digest window."""
+        if self._worker is None:
+            return
+        for buffer in self._buffers.values():
+            if buffer.messages:
+                buffer.urgent = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Notification flush timed out")
+
+    async def close(self, timeout: Optional[float] = 10.0):
+        """Flush, then stop the worker and close the HTTP session."""
+        await self.flush(timeout)
+        self._closing = True
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, *self._senders, return_exceptions=True)
+            self._worker = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        pending = sum(len(b.messages) for b in self._buffers.values())
+        if pending:
+            logger.warning(f"Dropping {pending} undelivered notifications on close")
+            self.dropped += pending
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': self.queued,
+            'sent': self.sent,
+            'digests': self.digests,
+            'dropped': self.dropped,
+            'retries': self.retries,
+            'failed': self.failed,
+            'pending': sum(len(b.messages) for b in self._buffers.values())
+        }
+
+    # Worker
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._idle = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            wait = None
+            for chat, buffer in self._buffers.items():
+                if not buffer.messages or buffer.sending:
+                    continue
+                bucket = self._bucket(chat)
+                ready = buffer.first_at + (0.0 if buffer.urgent else self.digest_window)
+                delay = max(ready - now, bucket.delay(now), self.global_bucket.delay(now))
+                if delay > 0:
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+                bucket.consume(now)
+                self.global_bucket.consume(now)
+                self._start_send(chat, buffer)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def _bucket(self, chat: str) -> TokenBucket:
+        bucket = self._buckets.get(chat)
+        if bucket is None:
+            bucket = self._buckets[chat] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _start_send(self, chat: str, buffer: _ChatBuffer):
+        text, merged = self._take_digest(buffer)
+        buffer.sending = True
+        task = asyncio.create_task(self._deliver(chat, text, merged, buffer))
+        self._senders.add(task)
+        task.add_done_callback(self._sent)
+
+    def _sent(self, task: asyncio.Task):
+        self._senders.discard(task)
+        if not self._senders and not any(b.messages for b in self._buffers.values()):
+            self._idle.set()
+
+    def _take_digest(self, buffer: _ChatBuffer):
+        """Pop as many buffered messages as fit in one Telegram message."""
+        parts: List[str] = []
+        length = 0
+        while buffer.messages:
+            message = buffer.messages[0]
+            extra = len(message) + (len(DIGEST_SEPARATOR) if parts else 0)
+            if parts and length + extra > MAX_MESSAGE_LENGTH:
+                break
+            parts.append(buffer.messages.popleft()[:MAX_MESSAGE_LENGTH])
+            length += extra
+        if buffer.messages:
+            # The rest goes out as the next digest, paced by the bucket
+            buffer.first_at = time.monotonic() - self.digest_window
+        else:
+            buffer.urgent = False
+        return DIGEST_SEPARATOR.join(parts), len(parts)
+
+    async def _deliver(self, chat: str, text: str, merged: int, buffer: _ChatBuffer):
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    await self.transport(chat, text)
+                    self.sent += merged
+                    self.digests += 1
+                    return
+                except NotificationError as e:
+                    logger.error(f"Telegram rejected notification for {chat}: {e}")
+                    break
+                except RetryAfter as e:
+                    delay = e.delay
+                except Exception as e:
+                    delay = self.backoff * 2 ** attempt * (0.5 + random.random() / 2)
+                    logger.warning(f"Telegram send failed ({e}), retrying in {delay:.1f}s")
+                if attempt == self.max_retries or self._closing:
+                    break
+                self.retries += 1
+                await asyncio.sleep(delay)
+            self.failed += merged
+        finally:
+            buffer.sending = False
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    # Transports
+
+    async def _send_http(self, chat: str, text: str):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        async with self._session.post(url, json={'chat_id': chat, 'text': text}) as response:
+            if response.status == 200:
+                return
+            try:
+                body = await response.json(content_type=None)
+            except ValueError:
+                body = {}
+            if response.status == 429:
+                raise RetryAfter(float(body.get('parameters', {}).get('retry_after', 1)))
+            if response.status >= 500:
+                raise RuntimeError(f"HTTP {response.status}")
+            raise NotificationError(f"HTTP {response.status}: {body.get('description', '')}")
+
+
+_default: Optional[NotificationDispatcher] = None
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """Process-wide dispatcher configured from the environment."""
+    global _default
+    if _default is None:
+        _default = NotificationDispatcher()
+    return _default
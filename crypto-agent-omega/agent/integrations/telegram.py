@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """
 Telegram client for notifications and control.
+
+Messages go through a NotificationDispatcher: sending only enqueues, and
+delivery (batching, rate limiting, retries) happens in the background.
 """
+from typing import Optional
+
+from .notifier import NotificationDispatcher
+
 
 class TelegramClient:
+    def __init__(self, dispatcher: Optional[NotificationDispatcher] = None):
+        self.dispatcher = dispatcher or NotificationDispatcher()
+
     async def send_notification(self, message):
-        # Placeholder
-        print(f"TELEGRAM NOTIFICATION: {message}")
+        self.dispatcher.notify(message)
 
     async def send_alert(self, message):
-        # Placeholder
-        print(f"TELEGRAM ALERT: {message}")
+        self.dispatcher.notify(message, urgent=True)
+
+    async def close(self, timeout: Optional[float] = 10.0):
+        """Deliver what is still queued and close the HTTP session."""
+        await self.dispatcher.close(timeout)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Memoized fitness scores for the genetic algorithm.
+
+Survivors and unmutated crossover children recur across generations, so
+scores are cached under a fingerprint of the data window they were scored
+against followed by the genome's exact parameter values.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FitnessCache:
+    """
+    LRU cache of fitness scores, optionally persisted across runs.
+
+    Keys are a 16-byte BLAKE2b data fingerprint plus the genome's raw
+    float64 bytes, so they are stable between processes and runs (unlike
+    ``hash()``) and cost only a slice per row to build.
+    """
+    def __init__(self, max_entries: int = 200000, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Entries kept before least recently used are evicted
+            path: Pickle file to load on start and write on ``save()``
+        """
+        self.max_entries = max(1, max_entries)
+        self.path = path
+        self._entries: 'OrderedDict[bytes, float]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def fingerprint(*parts) -> bytes:
+        """Digest of the data window: arrays by content, anything else by repr."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                digest.update(np.ascontiguousarray(part).tobytes())
+            else:
+                digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.digest()
+
+    def evaluate(
+        self,
+        fingerprint: bytes,
+        values: np.ndarray,
+        score: Callable[[np.ndarray], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Fitness for every row of ``values``, scoring only uncached rows.
+
+        Args:
+            fingerprint: Data window fingerprint from ``fingerprint()``
+            values: (population, n_genes) parameter array
+            score: Vectorized fitness function for the rows that miss
+
+        Returns:
+            (population,) array of fitness scores
+        """
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        raw = values.tobytes()
+        width = values.shape[1] * values.itemsize
+        keys = [fingerprint + raw[i:i + width] for i in range(0, len(raw), width)]
+
+        entries = self._entries
+        cached = [entries.get(key) for key in keys]
+        scores = np.array([np.nan if c is None else c for c in cached])
+
+        # Duplicates within this population share one slot and are scored once
+        slots: Dict[bytes, int] = {}
+        first_rows, miss_rows, miss_slots = [], [], []
+        for i, (key, value) in enumerate(zip(keys, cached)):
+            if value is not None:
+                entries.move_to_end(key)
+                continue
+            slot = slots.setdefault(key, len(slots))
+            if slot == len(first_rows):
+                first_rows.append(i)
+            miss_rows.append(i)
+            miss_slots.append(slot)
+        self.misses += len(slots)
+        self.hits += len(keys) - len(slots)
+
+        if slots:
+            fresh = np.asarray(score(values[first_rows]), dtype=np.float64)
+            scores[miss_rows] = fresh[miss_slots]
+            entries.update(zip(slots, fresh.tolist()))
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+        return scores
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'entries': len(self._entries)
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                entries = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable fitness cache {self.path}: {e}")
+            return
+        self._entries = OrderedDict(entries)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.info(f"Loaded {len(self._entries)} cached fitness scores from {self.path}")
+
+    def save(self):
+        """Atomically write the entries to ``path`` (no-op without one)."""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.fitness-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(list(self._entries.items()), f, protocol=5)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
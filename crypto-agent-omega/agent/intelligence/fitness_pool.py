@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Process-pool fitness evaluation for the genetic algorithm.
+
+Performance series are copied once into a shared memory block that every
+worker maps as NumPy views, so tasks only carry the population chunk to
+score. Chunks are scored independently and reassembled in order, and all
+randomness stays in the parent, so results are identical to in-process
+evaluation for the same seed.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .genetic_algorithm import SERIES_COLUMNS, evaluate_population
+
+logger = logging.getLogger(__name__)
+
+# Worker-side state set by _attach: the shared block and per-strategy views
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+_worker_series: Dict[str, np.ndarray] = {}
+
+
+def _attach(name: str, layout: Dict[str, Tuple[int, int]]):
+    """Pool initializer: map the shared performance block."""
+    global _worker_memory, _worker_series
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    buffer = np.ndarray((_worker_memory.size // 8,), dtype=np.float64, buffer=_worker_memory.buf)
+    _worker_series = {
+        strategy: buffer[offset:offset + length].reshape(-1, SERIES_COLUMNS)
+        for strategy, (offset, length) in layout.items()
+    }
+
+
+def _evaluate_chunk(strategy: str, values: np.ndarray, gene_names: List[str]) -> np.ndarray:
+    return evaluate_population(values, gene_names, _worker_series[strategy])
+
+
+class ParallelFitnessEvaluator:
+    """
+    Scores populations across worker processes.
+
+    Use ``share(returns)`` around an evolution run; inside it,
+    ``evaluate`` splits each population into one chunk per worker.
+    Populations smaller than ``min_chunk`` per worker are scored
+    in-process, where IPC would cost more than it saves.
+    """
+    def __init__(self, workers: Optional[int] = None, min_chunk: int = 256):
+        """
+        Args:
+            workers: Worker processes (default: CPU count)
+            min_chunk: Smallest population slice worth sending to a worker
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.min_chunk = max(1, min_chunk)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._series: Dict[str, np.ndarray] = {}
+
+    @contextmanager
+    def share(self, returns: Dict[str, np.ndarray]):
+        """Copy ``returns`` into shared memory and start the pool for the block."""
+        layout = {}
+        offset = 0
+        for strategy, series in returns.items():
+            layout[strategy] = (offset, series.size)
+            offset += series.size
+
+        memory = shared_memory.SharedMemory(create=True, size=max(offset, 1) * 8)
+        buffer = None
+        try:
+            buffer = np.ndarray((max(offset, 1),), dtype=np.float64, buffer=memory.buf)
+            for strategy, (start, length) in layout.items():
+                buffer[start:start + length] = returns[strategy].ravel()
+            self._series = {
+                strategy: buffer[start:start + length].reshape(-1, SERIES_COLUMNS)
+                for strategy, (start, length) in layout.items()
+            }
+            # spawn: workers must not inherit the event loop, open sockets
+            # or locks held by other threads of the agent
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_attach,
+                initargs=(memory.name, layout)
+            )
+            logger.info(f"Fitness pool: {self.workers} workers, {offset // SERIES_COLUMNS} shared rows")
+            yield self
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            self._series = {}
+            buffer = None
+            memory.close()
+            memory.unlink()
+
+    def evaluate(self, strategy: str, values: np.ndarray, gene_names: List[str]) -> np.ndarray:
+        """Fitness for every row of ``values`` against ``strategy``'s series."""
+        chunks = min(self.workers, len(values) // self.min_chunk)
+        if self._pool is None or chunks <= 1:
+            return evaluate_population(values, gene_names, self._series[strategy])
+
+        parts = np.array_split(values, chunks)
+        scores = self._pool.map(
+            _evaluate_chunk,
+            [strategy] * chunks,
+            parts,
+            [gene_names] * chunks
+        )
+        return np.concatenate(list(scores))
@@ -1,9 +1,269 @@
 #!/usr/bin/env python3
 """
 Genetic algorithm for strategy evolution.
+
+Populations are NumPy arrays of shape (population_size, n_genes) holding
+genes normalized to [0, 1]; selection, crossover and mutation operate on
+the whole array at once, and fitness is scored by replaying each
+strategy's recent executions for every individual in one vectorized pass.
 """
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columns of a performance series: realized P&L and the return the signal
+# expected (+inf when it did not say, so no threshold filters it out)
+SERIES_COLUMNS = 2
+
+
+def performance_returns(performance_data: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Group performance rows into per-strategy execution series in time order.
+
+    Returns:
+        Mapping of strategy name to a (executions, SERIES_COLUMNS) float64
+        array of profit_loss and the result's expected_return.
+    """
+    series: Dict[str, List[Tuple[Any, float, float]]] = {}
+    for row in performance_data:
+        pnl = row.get('profit_loss')
+        if pnl is None:
+            continue
+        result = row.get('result')
+        expected = result.get('expected_return') if isinstance(result, dict) else None
+        series.setdefault(row['strategy'], []).append((
+            row.get('timestamp') or '',
+            float(pnl),
+            float(expected) if expected is not None else np.inf
+        ))
+
+    returns = {}
+    for name, rows in series.items():
+        rows.sort(key=lambda r: r[0])
+        returns[name] = np.array([r[1:] for r in rows], dtype=np.float64).reshape(-1, SERIES_COLUMNS)
+    return returns
+
+
+def evaluate_population(
+    values: np.ndarray,
+    gene_names: List[str],
+    returns: np.ndarray
+) -> np.ndarray:
+    """
+    Score every individual against one strategy's execution series.
+
+    An individual with a ``min_profit`` gene replays only the executions
+    whose signal expected at least that return; the others count as flat.
+    Fitness is the Sharpe ratio of the replayed per-execution P&L (0 when
+    it has no variance), so it rewards consistency rather than size.
+
+    Args:
+        values: (population, n_genes) array of parameter values
+        gene_names: Column names of ``values``
+        returns: Execution series from ``performance_returns``
+
+    Returns:
+        (population,) array of fitness scores
+    """
+    count = len(values)
+    pnl, expected = returns[:, 0], returns[:, 1]
+    executions = len(pnl)
+    if executions == 0:
+        return np.zeros(count)
+
+    # Executions sorted by expected return, best first: a threshold keeps a
+    # prefix, so its P&L sums are prefix sums and the whole population is
+    # scored with one searchsorted instead of a (population, T) matrix
+    order = np.argsort(-expected, kind='stable')
+    total = np.concatenate(([0.0], np.cumsum(pnl[order])))
+    squares = np.concatenate(([0.0], np.cumsum(pnl[order] ** 2)))
+    genes = dict(zip(gene_names, values.T))
+    if 'min_profit' in genes:
+        taken = np.searchsorted(-expected[order], -genes['min_profit'], side='right')
+    else:
+        taken = np.full(count, executions)
+
+    mean = total[taken] / executions
+    variance = np.maximum(squares[taken] / executions - mean * mean, 0.0)
+    std = np.sqrt(variance)
+    return np.divide(mean, std, out=np.zeros(count), where=std > 1e-12)
+
 
 class GeneticAlgorithm:
+    """
+    Vectorized GA over strategy parameters.
+
+    A strategy's genes are the parameters in its ``parameter_space``
+    attribute. Strategies without one, or without performance data, are
+    left out of the result.
+
+    Fitness is scored in-process unless an ``evaluator`` (such as
+    ParallelFitnessEvaluator) is given to spread it across processes. A
+    ``cache`` (FitnessCache) skips rescoring genomes already seen on the
+    same data; its hit rate for the last run is in ``last_cache_stats``.
+    """
+    def __init__(
+        self,
+        tournament_size: int = 3,
+        crossover_rate: float = 0.9,
+        mutation_rate: float = 0.2,
+        mutation_scale: float = 0.1,
+        elite_fraction: float = 0.05,
+        seed: Optional[int] = None,
+        evaluator=None,
+        cache=None
+    ):
+        self.tournament_size = tournament_size
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.mutation_scale = mutation_scale
+        self.elite_fraction = elite_fraction
+        self.seed = seed
+        self.evaluator = evaluator
+        self.cache = cache
+        self.last_cache_stats: Optional[Dict[str, float]] = None
+
     async def evolve(self, current_strategies, performance_data, generations, population_size):
-        # Placeholder for GA logic
-        return {}
+        """
+        Evolve parameters for every strategy with recent performance data.
+
+        The search runs in a worker thread so the event loop stays free.
+
+        Returns:
+            ``{strategy_name: {'fitness_improvement': float, 'parameters': dict}}``
+            where fitness_improvement is the best fitness found relative to
+            the strategy's current parameters.
+        """
+        return await asyncio.to_thread(
+            self._evolve_sync, current_strategies, performance_data, generations, population_size
+        )
+
+    def _evolve_sync(self, current_strategies, performance_data, generations, population_size):
+        rng = np.random.default_rng(self.seed)
+        returns = performance_returns(performance_data)
+        returns = {
+            name: series for name, series in returns.items()
+            if name in current_strategies and len(series)
+        }
+        if self.cache is not None:
+            self.cache.reset_stats()
+
+        if self.evaluator is None or not returns:
+            results = self._evolve_strategies(current_strategies, returns, generations, population_size, rng)
+        else:
+            with self.evaluator.share(returns):
+                results = self._evolve_strategies(current_strategies, returns, generations, population_size, rng)
+
+        if self.cache is not None:
+            self.last_cache_stats = self.cache.stats()
+            self.cache.save()
+            logger.info(f"GA fitness cache hit rate: {self.last_cache_stats['hit_rate']:.1%}")
+        return results
+
+    def _evolve_strategies(self, current_strategies, returns, generations, population_size, rng):
+        results = {}
+        for name, strategy in current_strategies.items():
+            series = returns.get(name)
+            space = getattr(strategy, 'parameter_space', None)
+            if series is None or not space:
+                continue
+            results[name] = self.evolve_strategy(
+                space, strategy.parameters, series, generations, population_size, rng, name
+            )
+            logger.info(
+                f"GA {name}: fitness {results[name]['baseline_fitness']:.4f} -> "
+                f"{results[name]['fitness']:.4f}"
+            )
+        return results
+
+    def evolve_strategy(
+        self,
+        space: Dict[str, Tuple[float, float, float]],
+        current_params: Dict[str, Any],
+        returns: np.ndarray,
+        generations: int,
+        population_size: int,
+        rng: np.random.Generator,
+        strategy_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run the GA for one strategy's parameter space."""
+        names = list(space)
+        low = np.array([space[n][0] for n in names])
+        span = np.array([space[n][1] for n in names]) - low
+        current = np.array([
+            float(current_params.get(n, space[n][2])) for n in names
+        ])
+        current_unit = np.clip((current - low) / span, 0.0, 1.0)
+
+        def score(values):
+            if self.evaluator is not None and strategy_name is not None:
+                return self.evaluator.evaluate(strategy_name, values, names)
+            return evaluate_population(values, names, returns)
+
+        if self.cache is not None:
+            window = self.cache.fingerprint(returns, names)
+
+        def fitness(unit):
+            values = low + unit * span
+            if self.cache is not None:
+                return self.cache.evaluate(window, values, score)
+            return score(values)
+
+        baseline = float(fitness(current_unit[None, :])[0])
+
+        # Half the population around the current parameters, half uniform
+        population_size = max(population_size, 2)
+        population = rng.random((population_size, len(names)))
+        local = population_size // 2
+        population[:local] = np.clip(
+            current_unit + rng.normal(0.0, self.mutation_scale, (local, len(names))), 0.0, 1.0
+        )
+        population[0] = current_unit
+        scores = fitness(population)
+
+        n_elite = max(1, int(population_size * self.elite_fraction))
+        for _ in range(generations):
+            elite = np.argpartition(scores, -n_elite)[-n_elite:]
+            parents = self._select(scores, population_size, rng)
+            children = self._crossover(population[parents], rng)
+            children = self._mutate(children, rng)
+            children[:n_elite] = population[elite]
+            population = children
+            scores = fitness(population)
+
+        best = int(np.argmax(scores))
+        best_fitness = float(scores[best])
+        best_values = low + population[best] * span
+        return {
+            'fitness_improvement': (best_fitness - baseline) / max(abs(baseline), 1e-9),
+            'fitness': best_fitness,
+            'baseline_fitness': baseline,
+            'parameters': {n: float(v) for n, v in zip(names, best_values)},
+        }
+
+    def _select(self, scores: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+        """Tournament selection; returns indices of ``count`` parents."""
+        entrants = rng.integers(0, len(scores), (count, self.tournament_size))
+        winners = np.argmax(scores[entrants], axis=1)
+        return entrants[np.arange(count), winners]
+
+    def _crossover(self, parents: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Uniform crossover between consecutive parent pairs."""
+        children = parents.copy()
+        pairs = len(parents) // 2
+        a, b = parents[0:2 * pairs:2], parents[1:2 * pairs:2]
+        swap = rng.random(a.shape) < 0.5
+        swap &= (rng.random(pairs) < self.crossover_rate)[:, None]
+        children[0:2 * pairs:2] = np.where(swap, b, a)
+        children[1:2 * pairs:2] = np.where(swap, a, b)
+        return children
+
+    def _mutate(self, population: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Gaussian mutation of a random subset of genes, kept in [0, 1]."""
+        mask = rng.random(population.shape) < self.mutation_rate
+        noise = rng.normal(0.0, self.mutation_scale, population.shape)
+        return np.clip(population + mask * noise, 0.0, 1.0)
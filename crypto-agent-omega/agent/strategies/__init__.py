@@ -4,7 +4,8 @@ Strategies for the CryptoGene-Omega agent.
 """
 
 from .base_strategy import BaseStrategy
-from typing import Dict, Any
+from .arbitrage_graph import ArbitrageGraph, ArbitrageCycle
+from typing import Dict, Any, FrozenSet, Hashable, Optional, Set
 
 class YieldHarvester(BaseStrategy):
     def __init__(self):
@@ -28,11 +29,61 @@ class LiquiditySniffer(BaseStrategy):
         return {'type': 'hold'}
 
 class ArbitrageHunter(BaseStrategy):
+    """
+    Trades negative cycles in the pool quote graph.
+
+    Parameters: ``min_profit`` (fractional return after fees required to
+    trade, default 0.001) and ``size`` (fraction of the portfolio to
+    route through a cycle, default 0.05).
+
+    Each open cycle is signalled once; it is signalled again only after
+    it closes and reopens.
+
+    Evolution tunes ``min_profit`` against the expected return logged with
+    each execution. ``size`` is left to the risk limits: the Sharpe
+    fitness does not depend on it.
+    """
+    parameter_space = {'min_profit': (0.0, 0.02, 0.001)}
     def __init__(self):
         super().__init__('arbitrage_hunter', {})
+        self.graph = ArbitrageGraph()
+        # Edge sets of open cycles already signalled
+        self._signalled: Set[FrozenSet[int]] = set()
+    def on_quote(
+        self,
+        pool: Hashable,
+        token_a: str,
+        token_b: str,
+        price: float,
+        fee: float = 0.0
+    ) -> Optional[ArbitrageCycle]:
+        """Apply a pool quote to the graph; returns a cycle it opened."""
+        return self.graph.update_pool(pool, token_a, token_b, price, fee)
+    async def on_event(self, event) -> Dict[str, Any]:
+        if event.type == 'POOL_QUOTE':
+            quote = event.payload
+            self.on_quote(
+                quote['pool'], quote['token_a'], quote['token_b'],
+                quote['price'], quote.get('fee', 0.0)
+            )
+        return await self.generate_signal()
     async def generate_signal(self) -> Dict[str, Any]:
-        # Placeholder
-        return {'type': 'hold'}
+        opportunities = self.graph.opportunities(self.parameters.get('min_profit', 0.001))
+        # Forget closed cycles so they are signalled again if they reopen
+        self._signalled &= {frozenset(cycle.edges) for cycle in self.graph.open_cycles.values()}
+        fresh = [cycle for cycle in opportunities if frozenset(cycle.edges) not in self._signalled]
+        if not fresh:
+            return {'type': 'hold'}
+        best = fresh[0]
+        self._signalled.add(frozenset(best.edges))
+        return {
+            'type': 'arbitrage',
+            'asset': best.tokens[0],
+            'size': self.parameters.get('size', 0.05),
+            'route': best.tokens,
+            'pools': best.pools,
+            'expected_return': best.profit
+        }
 
 class ZKFarmer(BaseStrategy):
     def __init__(self):
@@ -42,6 +93,7 @@ class ZKFarmer(BaseStrategy):
         return {'type': 'hold'}
 
 class BeliefRewrite(BaseStrategy):
+    event_types = ()
     def __init__(self):
         super().__init__('belief_rewrite', {})
     async def generate_signal(self) -> Dict[str, Any]:
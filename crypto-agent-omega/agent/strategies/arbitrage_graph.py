@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Token/pool graph with negative-cycle search for ArbitrageHunter.
+
+Every directed pool quote is an edge weighted ``-log(rate * (1 - fee))``,
+so a cycle of trades returning more than it started with is a cycle of
+negative total weight.
+
+The graph keeps feasible potentials ``p`` (``p[v] <= p[u] + w`` on every
+edge, i.e. shortest distances from a virtual source), which Bellman-Ford
+computes from scratch. A quote that worsens never creates a negative
+cycle and leaves ``p`` feasible. A quote that improves can only create
+cycles through its own edge, so the update searches outward from that
+edge over non-negative reduced costs ``w + p[u] - p[v]``, visiting only
+the nodes whose distance it shortens, and either repairs ``p`` or
+returns the cycle.
+"""
+import heapq
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Reduced costs this close to zero are rounding noise, not arbitrage
+EPSILON = 1e-12
+
+
+@dataclass
+class ArbitrageCycle:
+    """A closed sequence of trades."""
+    tokens: List[str]
+    pools: List[Hashable]
+    edges: List[int]
+    rate: float
+
+    @property
+    def profit(self) -> float:
+        """Fractional return of one trip around the cycle after fees."""
+        return self.rate - 1.0
+
+
+class ArbitrageGraph:
+    """
+    Directed quote graph in compact arrays.
+
+    Edges live in parallel typed arrays (``src``, ``dst``, ``weight``)
+    that updates index directly and Bellman-Ford views as NumPy arrays
+    without copying; ``edge_ids`` maps (pool, src, dst) to an index.
+    Edges are never deleted, only disabled with infinite weight, so ids
+    stay stable.
+
+    An improving quote whose cycle is found stays "open" (its edge is
+    excluded from the potentials) until a later update closes it.
+    Cycles passing through two open edges are reported once one closes.
+    """
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.token_ids: Dict[str, int] = {}
+        self.edge_ids: Dict[Tuple[Hashable, int, int], int] = {}
+        self.pools: List[Hashable] = []
+        self.src = array('q')
+        self.dst = array('q')
+        self.weight = array('d')
+        self.potential = array('d')
+        self._out: List[List[int]] = []
+        # Edges with negative reduced cost: edge -> cycle last found through it
+        self.open_cycles: Dict[int, ArbitrageCycle] = {}
+        # Edge -> open edges whose cycle uses it
+        self._cycle_members: Dict[int, Set[int]] = {}
+        # Open edges whose cycle got worse, re-checked by opportunities()
+        self._dirty: Set[int] = set()
+
+    def __len__(self):
+        return len(self.weight)
+
+    def token_id(self, token: str) -> int:
+        """Node of ``token``, registering it if new."""
+        node = self.token_ids.get(token)
+        if node is None:
+            node = self.token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+            self._out.append([])
+            self.potential.append(0.0)
+        return node
+
+    # Updates
+
+    def update_pool(
+        self,
+        pool: Hashable,
+        token_a: str,
+        token_b: str,
+        price: float,
+        fee: float = 0.0
+    ) -> Optional[ArbitrageCycle]:
+        """
+        Set both directions of a constant-price pool quote.
+
+        Args:
+            pool: Pool identifier
+            token_a: Base token
+            token_b: Quote token
+            price: Units of ``token_b`` per ``token_a``
+            fee: Fee fraction charged on each swap
+
+        Returns:
+            A newly found arbitrage cycle, if either direction opened one
+        """
+        forward = self.update_edge(pool, token_a, token_b, price, fee)
+        backward = self.update_edge(pool, token_b, token_a, 1.0 / price if price > 0 else 0.0, fee)
+        return forward or backward
+
+    def update_edge(
+        self,
+        pool: Hashable,
+        source: str,
+        target: str,
+        rate: float,
+        fee: float = 0.0
+    ) -> Optional[ArbitrageCycle]:
+        """
+        Set the rate of swapping ``source`` for ``target`` through ``pool``.
+
+        A rate of 0 disables the edge.
+
+        Returns:
+            A newly found arbitrage cycle through this edge, if any
+        """
+        u, v = self.token_id(source), self.token_id(target)
+        effective = rate * (1.0 - fee)
+        new = -math.log(effective) if effective > 0 else math.inf
+
+        key = (pool, u, v)
+        edge = self.edge_ids.get(key)
+        if edge is None:
+            edge = self._add_edge(key, pool, u, v)
+        old = self.weight[edge]
+        self.weight[edge] = new
+
+        if new > old:
+            # A worse quote keeps the potentials feasible and cannot open a
+            # cycle, but may close the open cycles it is part of
+            self._dirty.update(self._cycle_members.get(edge, ()))
+            return None
+        return self._relax(edge)
+
+    def opportunities(self, min_profit: float = 0.0) -> List[ArbitrageCycle]:
+        """Open cycles at current quotes, most profitable first."""
+        # Re-search for cycles whose quotes worsened below break-even;
+        # deferred to here so one quote touching many cycles stays cheap
+        for edge in list(self._dirty):
+            cycle = self.open_cycles.get(edge)
+            if cycle is not None and self._rate(cycle.edges) > 1.0:
+                self._dirty.discard(edge)
+            else:
+                self._relax(edge)
+        found = []
+        for cycle in self.open_cycles.values():
+            cycle.rate = self._rate(cycle.edges)
+            if cycle.profit > min_profit:
+                found.append(cycle)
+        return sorted(found, key=lambda c: c.profit, reverse=True)
+
+    # Full search
+
+    def find_cycle(self) -> Optional[ArbitrageCycle]:
+        """
+        Vectorized Bellman-Ford over every edge from a virtual source.
+
+        Returns any negative cycle, or None (in which case the potentials
+        are replaced by the exact shortest distances and no cycle is open).
+        """
+        n, m = len(self.tokens), len(self.weight)
+        if n == 0 or m == 0:
+            return None
+        src = np.frombuffer(self.src, dtype=np.int64)
+        dst = np.frombuffer(self.dst, dtype=np.int64)
+        weight = np.frombuffer(self.weight, dtype=np.float64)
+        dist = np.zeros(n)
+        pred = np.full(n, -1, dtype=np.int64)
+        edges = np.arange(m)
+
+        check = 1
+        for iteration in range(1, n + 1):
+            candidate = dist[src] + weight
+            best = dist.copy()
+            np.minimum.at(best, dst, candidate)
+            improved = best < dist - EPSILON
+            if not improved.any():
+                self.potential = array('d', dist.tolist())
+                self.open_cycles.clear()
+                self._cycle_members.clear()
+                self._dirty.clear()
+                return None
+            winners = improved[dst] & (candidate <= best[dst])
+            pred[dst[winners]] = edges[winners]
+            dist = best
+            # A cycle in the predecessor graph is a negative cycle; look
+            # for one at exponentially spaced rounds to keep checks cheap
+            if iteration == check or iteration == n:
+                check *= 2
+                cycle = self._predecessor_cycle(pred, src)
+                if cycle is not None:
+                    return cycle
+        return None
+
+    # Internals
+
+    def _add_edge(self, key, pool: Hashable, u: int, v: int) -> int:
+        edge = len(self.weight)
+        self.src.append(u)
+        self.dst.append(v)
+        self.weight.append(math.inf)
+        self.edge_ids[key] = edge
+        self.pools.append(pool)
+        self._out[u].append(edge)
+        return edge
+
+    def _relax(self, edge: int) -> Optional[ArbitrageCycle]:
+        """
+        Restore feasible potentials after ``edge`` got cheaper.
+
+        Dijkstra from the edge's head over reduced costs, bounded by how
+        far the edge undercuts the potentials. Reaching the edge's tail
+        within that bound closes a negative cycle.
+        """
+        potential, weight, src, dst = self.potential, self.weight, self.src, self.dst
+        u, v = src[edge], dst[edge]
+        slack = -(weight[edge] + potential[u] - potential[v])
+        self._dirty.discard(edge)
+        if slack <= EPSILON:
+            self._close(edge)
+            return None
+        if u == v:
+            return self._open(edge, [edge])
+
+        # dist: reduced distance from v; only nodes with dist < slack move
+        dist = {v: 0.0}
+        parent = {v: edge}
+        done = set()
+        heap = [(0.0, v)]
+        open_edges = self.open_cycles
+        while heap:
+            d, x = heapq.heappop(heap)
+            if x in done:
+                continue
+            if x == u:
+                path = [edge]
+                node = u
+                while node != v:
+                    path.append(parent[node])
+                    node = src[parent[node]]
+                return self._open(edge, path[:1] + path[:0:-1])
+            done.add(x)
+            px = potential[x]
+            for e in self._out[x]:
+                if e in open_edges or e == edge:
+                    continue
+                y = dst[e]
+                reduced = weight[e] + px - potential[y]
+                nd = d + (reduced if reduced > 0 else 0.0)
+                if nd < slack - EPSILON and nd < dist.get(y, math.inf):
+                    dist[y] = nd
+                    parent[y] = e
+                    heapq.heappush(heap, (nd, y))
+
+        # No cycle: pull every reached node down to its new distance
+        for x, d in dist.items():
+            potential[x] -= slack - d
+        self._close(edge)
+        return None
+
+    def _open(self, edge: int, path: List[int]) -> ArbitrageCycle:
+        self._close(edge)
+        cycle = self.open_cycles[edge] = self._cycle(path)
+        for e in path:
+            self._cycle_members.setdefault(e, set()).add(edge)
+        return cycle
+
+    def _close(self, edge: int):
+        cycle = self.open_cycles.pop(edge, None)
+        if cycle is None:
+            return
+        for e in cycle.edges:
+            members = self._cycle_members.get(e)
+            if members is not None:
+                members.discard(edge)
+                if not members:
+                    del self._cycle_members[e]
+
+    def _predecessor_cycle(self, pred: np.ndarray, src: np.ndarray) -> Optional[ArbitrageCycle]:
+        """Find a cycle in the predecessor forest by pointer jumping."""
+        n = len(pred)
+        has_pred = pred >= 0
+        if not has_pred.any():
+            return None
+        # parent[x] is x's predecessor node (x itself at a root)
+        nodes = np.arange(n)
+        parent = np.where(has_pred, src[np.maximum(pred, 0)], nodes)
+        jump = parent.copy()
+        for _ in range(max(1, int(n).bit_length())):
+            jump = jump[jump]
+        # After >= n steps every walk has reached a root or a cycle
+        on_cycle = has_pred[jump]
+        if not on_cycle.any():
+            return None
+        start = int(jump[np.flatnonzero(on_cycle)[0]])
+        path = []
+        node = start
+        while True:
+            e = int(pred[node])
+            path.append(e)
+            node = self.src[e]
+            if node == start:
+                break
+        path.reverse()
+        cycle = self._cycle(path)
+        return cycle if cycle.rate > 1.0 else None
+
+    def _cycle(self, edges: List[int]) -> ArbitrageCycle:
+        tokens = [self.tokens[self.src[e]] for e in edges]
+        tokens.append(tokens[0])
+        return ArbitrageCycle(
+            tokens=tokens,
+            pools=[self.pools[e] for e in edges],
+            edges=edges,
+            rate=self._rate(edges)
+        )
+
+    def _rate(self, edges: List[int]) -> float:
+        return math.exp(-math.fsum(self.weight[e] for e in edges))
@@ -3,15 +3,25 @@
 Base class for all trading strategies.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Awaitable, Callable, Hashable, Optional, Tuple
 
 class BaseStrategy(ABC):
     """
     Abstract base class for trading strategies.
     """
+    # Event types handled in event-driven mode; None subscribes to all
+    event_types: Optional[Tuple[str, ...]] = None
+    # Parameter name -> (low, high, default) searched by the genetic
+    # algorithm; None leaves the strategy's parameters alone
+    parameter_space: Optional[Dict[str, Tuple[float, float, float]]] = None
+
     def __init__(self, name: str, params: Dict):
         self.name = name
         self.parameters = params
+        # Set to a MarketView while a backtest replays this strategy
+        self.market = None
+        # Shared MarketDataCache, injected by the agent
+        self.market_data = None
 
     @abstractmethod
     async def generate_signal(self) -> Dict[str, Any]:
@@ -24,6 +34,59 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def generate_signals(self, market) -> Optional[Dict[str, Any]]:
+        """
+        Generate signals for every bar of a backtest at once.
+
+        Optional fast path for the backtester; return None to be replayed
+        bar by bar through generate_signal instead.
+
+        Args:
+            market: MarketData being replayed
+
+        Returns:
+            Arrays over bars: 'side' (+1 buy, -1 sell, 0 hold), 'asset'
+            (column index) and 'amount' or 'size', optionally 'slippage'.
+            Each bar's signal must only depend on data up to that bar.
+        """
+        return None
+
+    async def on_event(self, event) -> Optional[Dict[str, Any]]:
+        """
+        Generate a signal in response to a market or on-chain event.
+
+        Called by the event bus for each event in ``event_types``. The
+        default ignores the event's contents and calls generate_signal.
+
+        Args:
+            event: The Event being dispatched
+
+        Returns:
+            A signal dictionary, as for generate_signal.
+        """
+        return await self.generate_signal()
+
+    async def fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Fetch market data through the shared cache.
+
+        Strategies asking for the same key in a cycle share one upstream
+        call. Without an injected cache ``fetch()`` is called directly.
+
+        Args:
+            key: Hashable request identity, e.g. ('price', 'SOL')
+            fetch: Zero-argument coroutine function doing the upstream call
+            ttl: Keep the value for this many seconds instead of one cycle
+        """
+        if self.market_data is None:
+            return await fetch()
+        return await self.market_data.get(key, fetch, ttl=ttl)
+
     def update_parameters(self, new_params: Dict):
         """Update strategy parameters."""
         self.parameters.update(new_params)
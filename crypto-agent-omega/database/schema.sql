@@ -4,7 +4,7 @@ CREATE TABLE strategies (
     id SERIAL PRIMARY KEY,
     name VARCHAR(255) UNIQUE NOT NULL,
     parameters JSONB,
-    belief_score DOUBLE PRECISION DEFAULT 0.5,
+    belief_score DOUBLE PRECISION DEFAULT 0.7,
     enabled BOOLEAN DEFAULT TRUE
 );
 
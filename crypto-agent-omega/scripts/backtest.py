@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Backtest the agent's strategies on recorded or synthetic market snapshots.
+
+Usage:
+    python scripts/backtest.py data/minute_bars.npz
+    python scripts/backtest.py --synthetic-years 2
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from agent.core.backtest import MarketData
+from agent.core.executor import StrategyExecutor
+from agent.strategies import (
+    YieldHarvester,
+    SignalSeeker,
+    LiquiditySniffer,
+    ArbitrageHunter,
+    ZKFarmer,
+    BeliefRewrite
+)
+
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+
+def synthetic_market(years: float, assets: int, seed: int = 0) -> MarketData:
+    """Geometric random-walk minute bars."""
+    rng = np.random.default_rng(seed)
+    bars = int(years * MINUTES_PER_YEAR)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, (bars, assets)), axis=0))
+    return MarketData(
+        timestamps=np.arange(bars, dtype=np.int64) * 60,
+        assets=[f'ASSET{i}' for i in range(assets)],
+        fields={'close': close}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest strategies on market snapshots')
+    parser.add_argument('snapshot', nargs='?', help='.npz or .parquet market snapshot')
+    parser.add_argument('--synthetic-years', type=float, default=1.0,
+                        help='Years of synthetic minute bars when no snapshot is given')
+    parser.add_argument('--assets', type=int, default=4, help='Synthetic asset count')
+    parser.add_argument('--capital', type=float, default=10000.0, help='Starting capital per strategy')
+    parser.add_argument('--fee-rate', type=float, default=0.001, help='Fee per unit of notional')
+    args = parser.parse_args()
+
+    if args.snapshot:
+        data = MarketData.load(args.snapshot)
+    else:
+        data = synthetic_market(args.synthetic_years, args.assets)
+
+    strategies = {
+        'yield': YieldHarvester(),
+        'signal': SignalSeeker(),
+        'liquidity': LiquiditySniffer(),
+        'arbitrage': ArbitrageHunter(),
+        'zk': ZKFarmer(),
+        'belief': BeliefRewrite()
+    }
+    report = StrategyExecutor().backtest(
+        strategies, data, initial_capital=args.capital, fee_rate=args.fee_rate
+    )
+
+    print(f"\n📈 {report['bars']} bars x {len(strategies)} strategies in "
+          f"{report['elapsed_seconds']:.2f}s ({report['bars_per_second']:,.0f} bars/s)")
+    for name, stats in report['strategies'].items():
+        print(
+            f"  {name:<10} pnl {stats['pnl']:>12.2f}  dd {stats['max_drawdown']:6.1%}  "
+            f"fills {stats['fills']}/{stats['signals']}  rejected {stats['rejected']}"
+        )
+    portfolio = report['portfolio']
+    print(f"  {'portfolio':<10} pnl {portfolio['pnl']:>12.2f}  dd {portfolio['max_drawdown']:6.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+if __package__:
+    from .connection import db
+else:
+    from connection import db
+
+GENESIS_CHAIN_HASH = '0' * 64
+CHAIN_MODULUS = 2 ** 256
+HASH_FORMAT = re.compile(r'^[a-f0-9]{64}$')
+
+# CAST(data AS TEXT) is the same text verify_audit_entry() hashes
+FETCH_BATCH = """
+SELECT id, CAST(data AS TEXT), data_hash, config_hash
+FROM immutable_audit_log
+WHERE id > %s
+ORDER BY id
+LIMIT %s
+"""
+
+FETCH_RANGE = """
+SELECT id, CAST(data AS TEXT), data_hash, config_hash
+FROM immutable_audit_log
+WHERE id >= %s AND id <= %s
+ORDER BY id
+"""
+
+LOAD_CHECKPOINT = """
+SELECT last_id, rows_verified, mismatches, chain_hash, gap_ids
+FROM audit_verification_checkpoint
+WHERE verifier = %s
+"""
+
+SAVE_CHECKPOINT = """
+INSERT INTO audit_verification_checkpoint (verifier, last_id, rows_verified, mismatches, chain_hash, gap_ids, updated_at)
+VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+ON CONFLICT (verifier) DO UPDATE SET
+    last_id = EXCLUDED.last_id,
+    rows_verified = EXCLUDED.rows_verified,
+    mismatches = EXCLUDED.mismatches,
+    chain_hash = EXCLUDED.chain_hash,
+    gap_ids = EXCLUDED.gap_ids,
+    updated_at = EXCLUDED.updated_at
+"""
+
+RECORD_FAILURE = """
+INSERT INTO audit_verification_failures (audit_id, reason, stored_hash, computed_hash)
+VALUES (%s, %s, %s, %s)
+ON CONFLICT (audit_id) DO NOTHING
+"""
+
+
+def hash_texts(texts):
+    """SHA256 hex digests of a chunk of row texts; runs in worker processes."""
+    return [hashlib.sha256(text.encode('utf-8')).hexdigest() for text in texts]
+
+
+def chain_step(chain_hash, audit_id, data_hash):
+    """
+    Fold one row into the chain hash.
+
+    The chain hash is the sum of SHA256(id:data_hash) over verified rows
+    modulo 2**256, so it does not depend on the order rows were verified
+    in: a row that committed late and was checked after higher ids gives
+    the same hash as a full run in id order.
+    """
+    digest = int(hashlib.sha256(f'{audit_id}:{data_hash}'.encode('utf-8')).hexdigest(), 16)
+    return format((int(chain_hash, 16) + digest) % CHAIN_MODULUS, '064x')
+
+
+class AuditVerifier:
+    """
+    Incremental verifier for immutable_audit_log.
+
+    Streams the table in id order with keyset pagination, so memory stays
+    bounded by ``batch_size``. Data hashes are recomputed in a process
+    pool while the next batch is fetched. After each batch the checkpoint
+    (last id, counters, a chain hash over every verified
+    ``(id, data_hash)`` and the gap ids below) is saved, so later runs
+    only read new rows.
+
+    SERIAL ids are handed out at insert time, so a row can commit after
+    a higher id was already verified. Ids missing below the checkpoint,
+    up to ``gap_window`` ids back, are remembered as gaps and checked on
+    every later run; gaps further back are treated as rolled back.
+
+    A ``full`` run starts again from the first row and checks that the
+    chain hash over rows up to the checkpoint's last id (excluding
+    still-open gaps) matches the checkpoint. A mismatch means verified
+    rows were changed or deleted.
+    """
+
+    def __init__(self, database=db, batch_size=10000, workers=None, config_hash=None, verifier='default', gap_window=10000):
+        self.database = database
+        self.batch_size = batch_size
+        self.workers = workers or os.cpu_count() or 1
+        self.config_hash = config_hash
+        self.verifier = verifier
+        self.gap_window = gap_window
+
+    @staticmethod
+    def empty_checkpoint():
+        return {'last_id': 0, 'rows_verified': 0, 'mismatches': 0, 'chain_hash': GENESIS_CHAIN_HASH, 'gaps': []}
+
+    def load_checkpoint(self):
+        rows = self.database.query(LOAD_CHECKPOINT, (self.verifier,))
+        if not rows:
+            return self.empty_checkpoint()
+        last_id, rows_verified, mismatches, chain_hash, gap_ids = rows[0]
+        return {
+            'last_id': last_id,
+            'rows_verified': rows_verified,
+            'mismatches': mismatches,
+            'chain_hash': chain_hash,
+            'gaps': json.loads(gap_ids or '[]')
+        }
+
+    def save_checkpoint(self, checkpoint, failures):
+        with self.database.transaction() as cursor:
+            if failures:
+                cursor.executemany(self.database.adapt_sql(RECORD_FAILURE), failures)
+            cursor.execute(self.database.adapt_sql(SAVE_CHECKPOINT), (
+                self.verifier,
+                checkpoint['last_id'],
+                checkpoint['rows_verified'],
+                checkpoint['mismatches'],
+                checkpoint['chain_hash'],
+                json.dumps(checkpoint['gaps'])
+            ))
+
+    def _fetch(self, after_id):
+        return self.database.query(FETCH_BATCH, (after_id, self.batch_size)) or []
+
+    def _fetch_gaps(self, gaps):
+        """Rows that have since appeared in remembered gaps."""
+        wanted = set(gaps)
+        rows = self.database.query(FETCH_RANGE, (min(gaps), max(gaps))) or []
+        return [row for row in rows if row[0] in wanted]
+
+    def _submit(self, executor, rows):
+        texts = [row[1] for row in rows]
+        chunk = max(1, -(-len(texts) // self.workers))
+        return [executor.submit(hash_texts, texts[i:i + chunk]) for i in range(0, len(texts), chunk)]
+
+    def _check_row(self, audit_id, stored_hash, config_hash, computed_hash):
+        if not HASH_FORMAT.match(stored_hash or ''):
+            return (audit_id, 'bad_hash_format', stored_hash, computed_hash)
+        if computed_hash != stored_hash:
+            return (audit_id, 'data_tampered', stored_hash, computed_hash)
+        if self.config_hash is not None and config_hash != self.config_hash:
+            return (audit_id, 'config_mismatch', config_hash, self.config_hash)
+        return None
+
+    def _fold(self, checkpoint, rows, computed, last_id, gaps):
+        """Check rows, fold them into the checkpoint and return the failures."""
+        failures = []
+        chain_hash = checkpoint['chain_hash']
+        for (audit_id, _, stored_hash, config_hash), computed_hash in zip(rows, computed):
+            failure = self._check_row(audit_id, stored_hash, config_hash, computed_hash)
+            if failure:
+                failures.append(failure)
+            chain_hash = chain_step(chain_hash, audit_id, stored_hash)
+        oldest = last_id - self.gap_window
+        checkpoint.update(
+            last_id=last_id,
+            rows_verified=checkpoint['rows_verified'] + len(rows),
+            mismatches=checkpoint['mismatches'] + len(failures),
+            chain_hash=chain_hash,
+            gaps=sorted(gap for gap in gaps if gap > oldest)
+        )
+        return failures
+
+    def verify(self, full=False):
+        """
+        Verify late rows in remembered gaps and rows past the checkpoint
+        (or every row when ``full``).
+
+        Returns a summary with row and mismatch counts for this run, the
+        new checkpoint and, for full runs, whether the chain still matched.
+        """
+        start = time.perf_counter()
+        stored = self.load_checkpoint()
+        checkpoint = self.empty_checkpoint() if full else dict(stored)
+        anchor_id = stored['last_id'] if full and stored['last_id'] else None
+        open_gaps = set(stored['gaps'])
+        anchor_hash = GENESIS_CHAIN_HASH
+
+        rows_checked = 0
+        mismatches = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            if not full and checkpoint['gaps']:
+                rows = self._fetch_gaps(checkpoint['gaps'])
+                if rows:
+                    computed = [digest for future in self._submit(executor, rows) for digest in future.result()]
+                    found = {row[0] for row in rows}
+                    gaps = [gap for gap in checkpoint['gaps'] if gap not in found]
+                    failures = self._fold(checkpoint, rows, computed, checkpoint['last_id'], gaps)
+                    self.save_checkpoint(checkpoint, failures)
+                    rows_checked += len(rows)
+                    mismatches += len(failures)
+
+            rows = self._fetch(checkpoint['last_id'])
+            while rows:
+                futures = self._submit(executor, rows)
+                # Fetch the next batch while workers hash this one
+                next_rows = self._fetch(rows[-1][0]) if len(rows) == self.batch_size else []
+                computed = [digest for future in futures for digest in future.result()]
+
+                gaps = list(checkpoint['gaps'])
+                previous = checkpoint['last_id']
+                for audit_id, _, stored_hash, _ in rows:
+                    if audit_id > previous + 1:
+                        gaps.extend(range(max(previous + 1, audit_id - self.gap_window), audit_id))
+                    previous = audit_id
+                    if anchor_id is not None and audit_id <= anchor_id and audit_id not in open_gaps:
+                        anchor_hash = chain_step(anchor_hash, audit_id, stored_hash)
+
+                failures = self._fold(checkpoint, rows, computed, rows[-1][0], gaps)
+                self.save_checkpoint(checkpoint, failures)
+                rows_checked += len(rows)
+                mismatches += len(failures)
+                rows = next_rows
+
+        chain_intact = anchor_hash == stored['chain_hash'] if anchor_id is not None else None
+
+        elapsed = time.perf_counter() - start
+        return {
+            'rows_checked': rows_checked,
+            'mismatches': mismatches,
+            'checkpoint': checkpoint,
+            'chain_intact': chain_intact,
+            'elapsed_seconds': elapsed,
+            'rows_per_second': rows_checked / elapsed if elapsed > 0 else 0.0
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify immutable_audit_log hashes incrementally')
+    parser.add_argument('--full', action='store_true', help='Re-verify every row and check the hash chain')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Rows fetched per keyset page')
+    parser.add_argument('--workers', type=int, help='Hashing processes (default: CPU count)')
+    parser.add_argument('--config-hash', help='Expected config_hash for every row')
+    args = parser.parse_args()
+
+    verifier = AuditVerifier(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        config_hash=args.config_hash
+    )
+    summary = verifier.verify(full=args.full)
+
+    print(f"Verified {summary['rows_checked']} rows in {summary['elapsed_seconds']:.2f}s "
+          f"({summary['rows_per_second']:.0f} rows/s)")
+    print(f"Mismatches: {summary['mismatches']}")
+    print(f"Checkpoint: id {summary['checkpoint']['last_id']}, chain {summary['checkpoint']['chain_hash'][:16]}...")
+    if summary['chain_intact'] is not None:
+        print(f"Chain intact: {summary['chain_intact']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,36 +1,274 @@
+import io
 import os
-import psycopg2
-from psycopg2 import pool
+import csv
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+SWEEP_COLUMNS = (
+    'transaction_hash', 'chain', 'token_address', 'token_symbol', 'amount',
+    'usd_value', 'from_address', 'to_address', 'block_number', 'status', 'gas_fee'
+)
+
+ALLOCATION_COLUMNS = (
+    'sweep_id', 'allocation_type', 'percentage', 'amount', 'usd_value',
+    'target_strategy', 'executed', 'execution_tx_hash'
+)
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no connection frees up within the checkout timeout."""
+
+
+class SQLitePool:
+    """
+    Minimal getconn/putconn pool over sqlite3.
+
+    Lets the database layer run without a PostgreSQL server, e.g. for
+    tests and tooling. ``:memory:`` databases use a named shared-cache
+    URI so every pooled connection sees the same data.
+    """
+
+    def __init__(self, minconn, maxconn, path=':memory:'):
+        self.maxconn = maxconn
+        self._idle = []
+        self._lock = threading.Lock()
+        if path == ':memory:':
+            self.uri = f'file:database-{id(self)}?mode=memory&cache=shared'
+        else:
+            self.uri = f'file:{path}'
+        # Holding one connection open keeps a shared in-memory database alive
+        self._keeper = self._connect()
+        for _ in range(minconn):
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+
+    def getconn(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def putconn(self, conn):
+        with self._lock:
+            self._idle.append(conn)
+
+    def closeall(self):
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle = []
+            self._keeper.close()
+
 
 class Database:
-    def __init__(self):
-        self.pool = psycopg2.pool.SimpleConnectionPool(
-            1,
-            20,
+    """
+    Thread-safe PostgreSQL connection pool.
+
+    The pool is created on first use rather than at import time. Callers
+    that find every connection checked out wait (up to ``checkout_timeout``
+    seconds) for one to be released instead of failing immediately; each
+    such wait is counted as an exhaustion event in ``pool_metrics()``.
+
+    ``backend`` selects 'postgres' (the default, via psycopg2) or 'sqlite'
+    for serverless use; it defaults to the DATABASE_BACKEND environment
+    variable. Queries use psycopg2's ``%s`` placeholders on both backends.
+    """
+
+    def __init__(self, minconn=1, maxconn=20, checkout_timeout=30.0, threaded=True, backend=None, **connect_kwargs):
+        self.backend = backend or os.environ.get('DATABASE_BACKEND', 'postgres')
+        if self.backend not in ('postgres', 'sqlite'):
+            raise ValueError(f'Unknown database backend: {self.backend}')
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.checkout_timeout = checkout_timeout
+        self.threaded = threaded
+        self.connect_kwargs = connect_kwargs
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'checkouts': 0,
+            'in_use': 0,
+            'wait_time_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'exhaustion_events': 0,
+        }
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return self._pool
+
+    def _create_pool(self):
+        if self.backend == 'sqlite':
+            return SQLitePool(
+                self.minconn,
+                self.maxconn,
+                self.connect_kwargs.get('path', os.environ.get('SQLITE_PATH', ':memory:'))
+            )
+
+        from psycopg2 import pool
+        pool_class = pool.ThreadedConnectionPool if self.threaded else pool.SimpleConnectionPool
+        connect_kwargs = self.connect_kwargs or dict(
             user=os.environ.get('POSTGRES_USER'),
             password=os.environ.get('POSTGRES_PASSWORD'),
             host=os.environ.get('POSTGRES_HOST'),
             port=os.environ.get('POSTGRES_PORT'),
             database=os.environ.get('POSTGRES_DB')
         )
+        return pool_class(self.minconn, self.maxconn, **connect_kwargs)
 
     def get_connection(self):
-        return self.pool.getconn()
+        start = time.perf_counter()
+        if not self._slots.acquire(blocking=False):
+            with self._metrics_lock:
+                self._metrics['exhaustion_events'] += 1
+            if not self._slots.acquire(timeout=self.checkout_timeout):
+                raise PoolExhaustedError(
+                    f'No connection available after {self.checkout_timeout}s'
+                )
+        try:
+            conn = self.pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        with self._metrics_lock:
+            self._metrics['checkouts'] += 1
+            self._metrics['in_use'] += 1
+            self._metrics['wait_time_ms'] += wait_ms
+            self._metrics['max_wait_ms'] = max(self._metrics['max_wait_ms'], wait_ms)
+        return conn
 
     def release_connection(self, conn):
-        self.pool.putconn(conn)
+        try:
+            self.pool.putconn(conn)
+        finally:
+            with self._metrics_lock:
+                self._metrics['in_use'] -= 1
+            self._slots.release()
 
-    def query(self, text, params=None):
+    @contextmanager
+    def connection(self):
+        """Check out a connection; any uncommitted work is rolled back on release."""
         conn = self.get_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute(text, params)
-                if cursor.description:
-                    return cursor.fetchall()
+            yield conn
         finally:
+            if not getattr(conn, 'closed', False):
+                conn.rollback()
             self.release_connection(conn)
 
+    @contextmanager
+    def transaction(self):
+        """Yield a cursor inside a transaction that commits on success."""
+        with self.connection() as conn:
+            try:
+                with closing(conn.cursor()) as cursor:
+                    yield cursor
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def adapt_sql(self, text):
+        """Translate psycopg2 placeholders for the active backend."""
+        if self.backend == 'sqlite':
+            return text.replace('%s', '?')
+        return text
+
+    def query(self, text, params=None):
+        with self.transaction() as cursor:
+            cursor.execute(self.adapt_sql(text), params or ())
+            if cursor.description:
+                return cursor.fetchall()
+
+    def executemany(self, text, params_seq, page_size=500):
+        """Run one statement for many parameter sets in batched round trips."""
+        with self.transaction() as cursor:
+            if self.backend == 'sqlite':
+                cursor.executemany(self.adapt_sql(text), params_seq)
+            else:
+                from psycopg2 import extras
+                extras.execute_batch(cursor, text, params_seq, page_size=page_size)
+
+    def insert_rows(self, table, columns, rows, page_size=500):
+        """Insert rows with multi-row VALUES lists."""
+        values = [_row_values(columns, row) for row in rows]
+        with self.transaction() as cursor:
+            if self.backend == 'sqlite':
+                placeholders = ', '.join('?' for _ in columns)
+                cursor.executemany(f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({placeholders})', values)
+            else:
+                from psycopg2 import extras
+                sql = f'INSERT INTO {table} ({", ".join(columns)}) VALUES %s'
+                extras.execute_values(cursor, sql, values, page_size=page_size)
+            return len(rows)
+
+    def copy_from(self, table, columns, rows):
+        """Stream rows into a table with COPY ... FROM STDIN."""
+        if self.backend == 'sqlite':
+            # SQLite has no COPY; a single executemany is its bulk path
+            return self.insert_rows(table, columns, rows)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(['\\N' if value is None else value for value in _row_values(columns, row)])
+        buffer.seek(0)
+
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        with self.transaction() as cursor:
+            cursor.copy_expert(sql, buffer)
+            return cursor.rowcount
+
+    def bulk_insert_sweeps(self, rows, use_copy=False):
+        columns = _present_columns(SWEEP_COLUMNS, rows)
+        if use_copy:
+            return self.copy_from('sweeps', columns, rows)
+        return self.insert_rows('sweeps', columns, rows)
+
+    def bulk_insert_allocations(self, rows, use_copy=False):
+        columns = _present_columns(ALLOCATION_COLUMNS, rows)
+        if use_copy:
+            return self.copy_from('allocations', columns, rows)
+        return self.insert_rows('allocations', columns, rows)
+
+    def pool_metrics(self):
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics['avg_wait_ms'] = metrics['wait_time_ms'] / metrics['checkouts'] if metrics['checkouts'] else 0.0
+        metrics['max_connections'] = self.maxconn
+        return metrics
+
     def close_all_connections(self):
-        self.pool.closeall()
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+
+def _present_columns(columns, rows):
+    """Columns set in at least one dict row, so the rest keep their defaults."""
+    if rows and all(isinstance(row, dict) for row in rows):
+        return tuple(column for column in columns if any(column in row for row in rows))
+    return columns
+
+
+def _row_values(columns, row):
+    """Order a dict row by ``columns``; tuples pass through unchanged."""
+    if isinstance(row, dict):
+        return tuple(row.get(column) for column in columns)
+    return tuple(row)
+
 
 db = Database()
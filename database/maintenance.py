@@ -0,0 +1,70 @@
+import argparse
+import time
+
+if __package__:
+    from .connection import db
+else:
+    from connection import db
+
+# Tables range-partitioned by month on created_at (see migration 005)
+PARTITIONED_TABLES = ('audit_log', 'immutable_audit_log')
+
+
+def ensure_partitions(months_ahead=3, database=db):
+    """Create monthly partitions from this month through ``months_ahead``."""
+    created = 0
+    for table in PARTITIONED_TABLES:
+        res = database.query(
+            "SELECT ensure_monthly_partitions(%s, CURRENT_DATE, (CURRENT_DATE + make_interval(months => %s))::DATE)",
+            (table, months_ahead)
+        )
+        created += res[0][0]
+    return created
+
+
+def rollup(days=2, database=db):
+    """Refresh daily rollups for the last ``days`` days, including today."""
+    database.query(
+        "SELECT rollup_daily((CURRENT_DATE - %s)::DATE, (CURRENT_DATE + 1)::DATE)",
+        (days - 1,)
+    )
+
+
+def apply_retention(retention_days, drop=False, database=db):
+    """Detach (or drop) audit partitions older than the retention window."""
+    return database.query(
+        "SELECT partition_name, action FROM apply_audit_retention(make_interval(days => %s), %s)",
+        (retention_days, drop)
+    ) or []
+
+
+def run_maintenance(months_ahead=3, rollup_days=2, retention_days=None, drop=False, database=db):
+    """Run every maintenance step, printing per-step timing."""
+    start = time.perf_counter()
+    created = ensure_partitions(months_ahead, database)
+    print(f'Created {created} partitions in {(time.perf_counter() - start) * 1000:.1f} ms')
+
+    start = time.perf_counter()
+    rollup(rollup_days, database)
+    print(f'Refreshed {rollup_days} days of rollups in {(time.perf_counter() - start) * 1000:.1f} ms')
+
+    if retention_days is not None:
+        start = time.perf_counter()
+        for partition_name, action in apply_retention(retention_days, drop, database):
+            print(f'Retention: {action} {partition_name}')
+        print(f'Applied {retention_days}-day retention in {(time.perf_counter() - start) * 1000:.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Partition, rollup and retention maintenance')
+    parser.add_argument('--months-ahead', type=int, default=3, help='Future monthly partitions to keep ready')
+    parser.add_argument('--rollup-days', type=int, default=2, help='Days of daily rollups to refresh')
+    parser.add_argument('--retention-days', type=int, help='Detach audit partitions older than this')
+    parser.add_argument('--drop', action='store_true', help='Drop partitions instead of only detaching them')
+    args = parser.parse_args()
+
+    run_maintenance(args.months_ahead, args.rollup_days, args.retention_days, args.drop)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,9 @@
 -- Description: Add immutable audit table for tamper-proof earnings tracking
 -- Date: 2025-09-21
 
+-- digest() used by verify_audit_entry
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
 -- Create immutable audit log table
 CREATE TABLE IF NOT EXISTS immutable_audit_log (
     id SERIAL PRIMARY KEY,
@@ -15,12 +18,6 @@ CREATE TABLE IF NOT EXISTS immutable_audit_log (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     verified_at TIMESTAMP WITH TIME ZONE,
 
-    -- Indexes for performance
-    INDEX idx_immutable_audit_operation (operation),
-    INDEX idx_immutable_audit_entity (entity_type, entity_id),
-    INDEX idx_immutable_audit_created_at (created_at),
-    INDEX idx_immutable_audit_data_hash (data_hash),
-
     -- Constraints
     CONSTRAINT chk_operation_not_empty CHECK (length(operation) > 0),
     CONSTRAINT chk_entity_type_not_empty CHECK (length(entity_type) > 0),
@@ -29,6 +26,12 @@ CREATE TABLE IF NOT EXISTS immutable_audit_log (
     CONSTRAINT chk_config_hash_format CHECK (config_hash ~ '^[a-f0-9]{64}$') -- SHA256 format
 );
 
+-- Indexes for performance
+CREATE INDEX IF NOT EXISTS idx_immutable_audit_operation ON immutable_audit_log(operation);
+CREATE INDEX IF NOT EXISTS idx_immutable_audit_entity ON immutable_audit_log(entity_type, entity_id);
+CREATE INDEX IF NOT EXISTS idx_immutable_audit_created_at ON immutable_audit_log(created_at);
+CREATE INDEX IF NOT EXISTS idx_immutable_audit_data_hash ON immutable_audit_log(data_hash);
+
 -- Add immutable_hash column to allocations table if it doesn't exist
 DO $$
 BEGIN
@@ -75,7 +78,7 @@ SELECT
 FROM immutable_audit_log ial;
 
 -- Create function to verify audit entry integrity
-CREATE OR REPLACE FUNCTION verify_audit_entry(audit_id INTEGER)
+CREATE OR REPLACE FUNCTION verify_audit_entry(entry_id INTEGER)
 RETURNS TABLE (
     is_valid BOOLEAN,
     audit_id INTEGER,
@@ -91,10 +94,10 @@ BEGIN
     -- Get audit record
     SELECT * INTO audit_record
     FROM immutable_audit_log
-    WHERE id = audit_id;
+    WHERE id = entry_id;
 
     IF NOT FOUND THEN
-        RETURN QUERY SELECT false, audit_id, NULL::VARCHAR(100), 'not_found'::VARCHAR(20), 'Audit entry not found'::TEXT;
+        RETURN QUERY SELECT false, entry_id, NULL::VARCHAR(100), 'not_found'::VARCHAR(20), 'Audit entry not found'::TEXT;
         RETURN;
     END IF;
 
@@ -103,14 +106,14 @@ BEGIN
 
     -- Check data integrity
     IF calculated_hash != audit_record.data_hash THEN
-        RETURN QUERY SELECT false, audit_id, audit_record.operation, 'data_tampered'::VARCHAR(20),
+        RETURN QUERY SELECT false, entry_id, audit_record.operation, 'data_tampered'::VARCHAR(20),
             'Data hash mismatch - possible tampering'::TEXT;
         RETURN;
     END IF;
 
     -- Check config hash (placeholder - should be updated with actual immutable config hash)
     IF audit_record.config_hash != current_config_hash AND current_config_hash != 'PLACEHOLDER_CONFIG_HASH' THEN
-        RETURN QUERY SELECT false, audit_id, audit_record.operation, 'config_mismatch'::VARCHAR(20),
+        RETURN QUERY SELECT false, entry_id, audit_record.operation, 'config_mismatch'::VARCHAR(20),
             'Configuration hash mismatch'::TEXT;
         RETURN;
     END IF;
@@ -118,9 +121,9 @@ BEGIN
     -- Update verification timestamp
     UPDATE immutable_audit_log
     SET verified_at = CURRENT_TIMESTAMP
-    WHERE id = audit_id;
+    WHERE id = entry_id;
 
-    RETURN QUERY SELECT true, audit_id, audit_record.operation, 'verified'::VARCHAR(20), NULL::TEXT;
+    RETURN QUERY SELECT true, entry_id, audit_record.operation, 'verified'::VARCHAR(20), NULL::TEXT;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -0,0 +1,37 @@
+-- Migration 004: CryptoGene-Omega agent tables
+-- Mirrors crypto-agent-omega/database/schema.sql so the async agent client
+-- can run against the migrated Empire Engine database.
+
+-- Strategies table: Parameters, belief score and enablement per strategy
+CREATE TABLE IF NOT EXISTS strategies (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) UNIQUE NOT NULL,
+    parameters JSONB,
+    belief_score DOUBLE PRECISION DEFAULT 0.5,
+    enabled BOOLEAN DEFAULT TRUE
+);
+
+-- Executions table: One row per strategy execution
+CREATE TABLE IF NOT EXISTS executions (
+    id SERIAL PRIMARY KEY,
+    strategy_id INTEGER REFERENCES strategies(id),
+    timestamp TIMESTAMPTZ DEFAULT NOW(),
+    success BOOLEAN,
+    profit_loss DECIMAL(20, 10),
+    result JSONB
+);
+
+-- Mutations table: Parameter changes applied by evolution
+CREATE TABLE IF NOT EXISTS mutations (
+    id SERIAL PRIMARY KEY,
+    strategy_id INTEGER REFERENCES strategies(id),
+    timestamp TIMESTAMPTZ DEFAULT NOW(),
+    old_parameters JSONB,
+    new_parameters JSONB,
+    fitness_improvement DOUBLE PRECISION
+);
+
+-- Create indexes for recent performance lookups
+CREATE INDEX IF NOT EXISTS idx_executions_timestamp ON executions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_executions_strategy_timestamp ON executions(strategy_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_mutations_strategy ON mutations(strategy_id, timestamp);
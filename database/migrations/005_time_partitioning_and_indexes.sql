@@ -0,0 +1,228 @@
+-- Migration 005: Time-based partitioning, BRIN indexes and rollups
+-- Converts the append-only audit tables to monthly range partitions on
+-- created_at, adds BRIN indexes for time-range scans on the append-heavy
+-- tables, and adds daily rollup tables plus retention helpers used by
+-- database/maintenance.py.
+
+-- Create monthly partitions of a table partitioned on created_at
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+    parent_table TEXT,
+    from_date DATE,
+    until_date DATE
+) RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_date)::DATE;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= until_date LOOP
+        partition_name := parent_table || '_p' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                parent_table,
+                month_start,
+                (month_start + INTERVAL '1 month')::DATE
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ---------------------------------------------------------------------
+-- immutable_audit_log -> partitioned by created_at
+-- ---------------------------------------------------------------------
+ALTER TABLE immutable_audit_log RENAME TO immutable_audit_log_legacy;
+ALTER SEQUENCE immutable_audit_log_id_seq OWNED BY NONE;
+
+CREATE TABLE immutable_audit_log (
+    LIKE immutable_audit_log_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE (created_at);
+
+ALTER TABLE immutable_audit_log ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE immutable_audit_log ADD PRIMARY KEY (id, created_at);
+ALTER SEQUENCE immutable_audit_log_id_seq OWNED BY immutable_audit_log.id;
+
+CREATE TABLE immutable_audit_log_default PARTITION OF immutable_audit_log DEFAULT;
+SELECT ensure_monthly_partitions(
+    'immutable_audit_log',
+    COALESCE((SELECT MIN(created_at) FROM immutable_audit_log_legacy), NOW())::DATE,
+    (NOW() + INTERVAL '3 months')::DATE
+);
+
+INSERT INTO immutable_audit_log (
+    id, operation, entity_type, entity_id, data, user_id,
+    data_hash, config_hash, created_at, verified_at
+)
+SELECT
+    id, operation, entity_type, entity_id, data, user_id,
+    data_hash, config_hash, COALESCE(created_at, NOW()), verified_at
+FROM immutable_audit_log_legacy;
+
+DROP TABLE immutable_audit_log_legacy CASCADE;
+
+CREATE INDEX idx_immutable_audit_operation ON immutable_audit_log(operation, created_at);
+CREATE INDEX idx_immutable_audit_entity ON immutable_audit_log(entity_type, entity_id);
+CREATE INDEX idx_immutable_audit_data_hash ON immutable_audit_log(data_hash);
+CREATE INDEX idx_immutable_audit_created_at_brin ON immutable_audit_log USING BRIN (created_at);
+
+-- Recreate the view dropped along with the legacy table
+CREATE OR REPLACE VIEW audit_verification_view AS
+SELECT
+    ial.id,
+    ial.operation,
+    ial.entity_type,
+    ial.entity_id,
+    ial.data,
+    ial.user_id,
+    ial.data_hash,
+    ial.config_hash,
+    ial.created_at,
+    CASE
+        WHEN ial.data_hash IS NOT NULL AND ial.config_hash IS NOT NULL THEN true
+        ELSE false
+    END as is_immutable,
+    CASE
+        WHEN ial.verified_at IS NOT NULL THEN 'verified'
+        WHEN ial.data_hash IS NOT NULL THEN 'pending_verification'
+        ELSE 'legacy'
+    END as verification_status
+FROM immutable_audit_log ial;
+
+-- ---------------------------------------------------------------------
+-- audit_log -> partitioned by created_at
+-- ---------------------------------------------------------------------
+ALTER TABLE audit_log RENAME TO audit_log_legacy;
+
+CREATE TABLE audit_log (
+    LIKE audit_log_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE (created_at);
+
+ALTER TABLE audit_log ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE audit_log ADD PRIMARY KEY (id, created_at);
+
+CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT;
+SELECT ensure_monthly_partitions(
+    'audit_log',
+    COALESCE((SELECT MIN(created_at) FROM audit_log_legacy), NOW())::DATE,
+    (NOW() + INTERVAL '3 months')::DATE
+);
+
+INSERT INTO audit_log (
+    id, operation, entity_type, entity_id, old_values, new_values,
+    user_id, ip_address, user_agent, mutation_logic_id, created_at
+)
+SELECT
+    id, operation, entity_type, entity_id, old_values, new_values,
+    user_id, ip_address, user_agent, mutation_logic_id, COALESCE(created_at, NOW())
+FROM audit_log_legacy;
+
+DROP TABLE audit_log_legacy;
+
+CREATE INDEX idx_audit_operation_timestamp ON audit_log(operation, created_at);
+CREATE INDEX idx_audit_entity ON audit_log(entity_type, entity_id);
+CREATE INDEX idx_audit_created_at_brin ON audit_log USING BRIN (created_at);
+
+-- ---------------------------------------------------------------------
+-- BRIN indexes for time-range scans on the other append-heavy tables
+-- ---------------------------------------------------------------------
+CREATE INDEX IF NOT EXISTS idx_sweeps_created_at_brin ON sweeps USING BRIN (created_at);
+CREATE INDEX IF NOT EXISTS idx_sweeps_timestamp_brin ON sweeps USING BRIN (timestamp);
+CREATE INDEX IF NOT EXISTS idx_mutation_logs_created_at_brin ON mutation_logs USING BRIN (created_at);
+
+-- ---------------------------------------------------------------------
+-- Daily rollups for dashboards and for data past the retention window
+-- ---------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS audit_daily_rollup (
+    day DATE NOT NULL,
+    source VARCHAR(30) NOT NULL, -- 'audit_log' | 'immutable_audit_log'
+    operation VARCHAR(100) NOT NULL,
+    entity_type VARCHAR(50) NOT NULL DEFAULT '',
+    entry_count BIGINT NOT NULL,
+    PRIMARY KEY (day, source, operation, entity_type)
+);
+
+CREATE TABLE IF NOT EXISTS sweeps_daily_rollup (
+    day DATE NOT NULL,
+    chain VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT '',
+    sweep_count BIGINT NOT NULL,
+    total_amount DECIMAL(38, 18),
+    total_usd_value DECIMAL(24, 8),
+    total_gas_fee DECIMAL(24, 8),
+    PRIMARY KEY (day, chain, status)
+);
+
+-- Recompute rollups for days in [from_day, to_day); safe to re-run
+CREATE OR REPLACE FUNCTION rollup_daily(from_day DATE, to_day DATE)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO audit_daily_rollup (day, source, operation, entity_type, entry_count)
+    SELECT created_at::DATE, 'audit_log', operation, COALESCE(entity_type, ''), COUNT(*)
+    FROM audit_log
+    WHERE created_at >= from_day AND created_at < to_day
+    GROUP BY 1, 2, 3, 4
+    UNION ALL
+    SELECT created_at::DATE, 'immutable_audit_log', operation, entity_type, COUNT(*)
+    FROM immutable_audit_log
+    WHERE created_at >= from_day AND created_at < to_day
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (day, source, operation, entity_type)
+    DO UPDATE SET entry_count = EXCLUDED.entry_count;
+
+    INSERT INTO sweeps_daily_rollup (day, chain, status, sweep_count, total_amount, total_usd_value, total_gas_fee)
+    SELECT created_at::DATE, chain, COALESCE(status, ''), COUNT(*), SUM(amount), SUM(usd_value), SUM(gas_fee)
+    FROM sweeps
+    WHERE created_at >= from_day AND created_at < to_day
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, chain, status)
+    DO UPDATE SET
+        sweep_count = EXCLUDED.sweep_count,
+        total_amount = EXCLUDED.total_amount,
+        total_usd_value = EXCLUDED.total_usd_value,
+        total_gas_fee = EXCLUDED.total_gas_fee;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach (and optionally drop) monthly audit partitions older than the
+-- retention window. Each partition is rolled up before it is detached,
+-- and detached immutable partitions stay available for archiving.
+CREATE OR REPLACE FUNCTION apply_audit_retention(
+    retention INTERVAL,
+    drop_partitions BOOLEAN DEFAULT FALSE
+) RETURNS TABLE (partition_name TEXT, action TEXT) AS $$
+DECLARE
+    part RECORD;
+    month_start DATE;
+BEGIN
+    FOR part IN
+        SELECT parent.relname AS parent_name, child.relname AS child_name
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        WHERE parent.relname IN ('audit_log', 'immutable_audit_log')
+          AND child.relname ~ '_p[0-9]{6}$'
+        ORDER BY child.relname
+    LOOP
+        month_start := to_date(right(part.child_name, 6), 'YYYYMM');
+        IF month_start + INTERVAL '1 month' > NOW() - retention THEN
+            CONTINUE;
+        END IF;
+
+        PERFORM rollup_daily(month_start, (month_start + INTERVAL '1 month')::DATE);
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', part.parent_name, part.child_name);
+        partition_name := part.child_name;
+        action := 'detached';
+
+        IF drop_partitions THEN
+            EXECUTE format('DROP TABLE %I', part.child_name);
+            action := 'dropped';
+        END IF;
+        RETURN NEXT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,24 @@
+-- Migration 006: Checkpoints for incremental audit verification
+-- Used by database/audit_verifier.py to resume from the last verified row.
+
+-- Verification checkpoint: One row per verifier, advanced after each batch
+CREATE TABLE IF NOT EXISTS audit_verification_checkpoint (
+    verifier VARCHAR(50) PRIMARY KEY,
+    last_id BIGINT NOT NULL DEFAULT 0,
+    rows_verified BIGINT NOT NULL DEFAULT 0,
+    mismatches BIGINT NOT NULL DEFAULT 0,
+    chain_hash VARCHAR(64) NOT NULL, -- Rolling SHA256 over (id, data_hash) in id order
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Verification failures: Rows whose stored hashes did not check out
+CREATE TABLE IF NOT EXISTS audit_verification_failures (
+    id SERIAL PRIMARY KEY,
+    audit_id BIGINT NOT NULL,
+    reason VARCHAR(30) NOT NULL, -- 'data_tampered' | 'config_mismatch' | 'bad_hash_format'
+    stored_hash VARCHAR(128),
+    computed_hash VARCHAR(128),
+    detected_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_verification_failures_audit_id ON audit_verification_failures(audit_id);
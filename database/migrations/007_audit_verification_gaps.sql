@@ -0,0 +1,14 @@
+-- Migration 007: Late-commit gaps and idempotent failure rows for audit verification
+-- SERIAL ids are assigned at insert, not commit, so audit_verifier.py
+-- remembers ids missing below its checkpoint and re-checks them later.
+
+-- Ids below last_id that were not visible when verified (JSON array)
+ALTER TABLE audit_verification_checkpoint ADD COLUMN IF NOT EXISTS gap_ids TEXT NOT NULL DEFAULT '[]';
+
+-- One failure row per audit entry, so re-runs do not duplicate them
+DELETE FROM audit_verification_failures a
+USING audit_verification_failures b
+WHERE a.audit_id = b.audit_id AND a.id > b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_audit_verification_failures_audit_id
+    ON audit_verification_failures(audit_id);
@@ -0,0 +1,8 @@
+-- Migration 008: Executable default belief score for agent strategies
+-- StrategyExecutor skips strategies below min_confidence (0.6), so rows the
+-- agent creates for new strategies must start above it. Matches
+-- PostgresDatabaseClient.DEFAULT_BELIEF_SCORE.
+
+ALTER TABLE strategies ALTER COLUMN belief_score SET DEFAULT 0.7;
+
+UPDATE strategies SET belief_score = 0.7 WHERE belief_score IS NULL;
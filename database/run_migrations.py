@@ -1,15 +1,178 @@
+import argparse
+import hashlib
 import os
-from connection import db
+import time
+from dataclasses import dataclass
 
-def run_migrations():
-    migrations_dir = os.path.join(os.path.dirname(__file__), 'migrations')
-    migration_files = sorted([f for f in os.listdir(migrations_dir) if f.endswith('.sql')])
+if __package__:
+    from .connection import db
+else:
+    from connection import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+LEDGER_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(64) PRIMARY KEY,
+    description TEXT,
+    filename VARCHAR(255),
+    checksum VARCHAR(64),
+    execution_ms DOUBLE PRECISION,
+    applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Migration files may insert their own ledger row (see 003), so upsert
+RECORD_MIGRATION = """
+INSERT INTO schema_migrations (version, description, filename, checksum, execution_ms)
+VALUES (%s, %s, %s, %s, %s)
+ON CONFLICT (version) DO UPDATE SET
+    filename = EXCLUDED.filename,
+    checksum = EXCLUDED.checksum,
+    execution_ms = EXCLUDED.execution_ms
+"""
+
+
+class MigrationChecksumError(RuntimeError):
+    """Raised when an applied migration file was edited afterwards."""
+
+
+@dataclass
+class Migration:
+    version: str
+    filename: str
+    path: str
+    checksum: str
+
+    @property
+    def description(self):
+        name = os.path.splitext(self.filename)[0]
+        return name.partition('_')[2].replace('_', ' ')
+
+    def read(self):
+        with open(self.path, 'r') as f:
+            return f.read()
+
+
+def execute_script(database, cursor, sql):
+    """
+    Run a migration file's statements on ``cursor``.
+
+    psycopg2 accepts a multi-statement string in one ``execute``; sqlite3
+    only takes scripts through ``executescript``, which commits first and
+    then runs in autocommit, so the script opens its own transaction to
+    keep the migration and its ledger row atomic.
+    """
+    if database.backend == 'sqlite':
+        cursor.executescript(f'BEGIN;\n{sql}\n;')
+    else:
+        cursor.execute(sql)
+
+
+def discover_migrations(migrations_dir=MIGRATIONS_DIR):
+    """List .sql files in version order with their SHA256 checksums."""
+    migrations = []
+    for filename in sorted(f for f in os.listdir(migrations_dir) if f.endswith('.sql')):
+        path = os.path.join(migrations_dir, filename)
+        with open(path, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        migrations.append(Migration(
+            version=filename.partition('_')[0],
+            filename=filename,
+            path=path,
+            checksum=checksum
+        ))
+    return migrations
+
+
+def applied_migrations(database=db):
+    """Map of version -> recorded checksum from the ledger."""
+    rows = database.query('SELECT version, checksum FROM schema_migrations')
+    return {version: checksum for version, checksum in rows or []}
+
+
+def plan_migrations(migrations_dir=MIGRATIONS_DIR, database=db):
+    """
+    Compare migration files against the ledger.
+
+    Returns (migration, status) pairs where status is 'applied', 'pending'
+    or 'changed' (applied, but the file's checksum no longer matches).
+    Rows written by a migration itself without a checksum count as applied.
+    """
+    database.query(LEDGER_DDL)
+    applied = applied_migrations(database)
+
+    plan = []
+    for migration in discover_migrations(migrations_dir):
+        if migration.version not in applied:
+            status = 'pending'
+        elif applied[migration.version] in (None, migration.checksum):
+            status = 'applied'
+        else:
+            status = 'changed'
+        plan.append((migration, status))
+    return plan
+
+
+def run_migrations(dry_run=False, migrations_dir=MIGRATIONS_DIR, database=db):
+    """
+    Apply pending migrations, each inside its own transaction.
+
+    Returns a list of dicts with the filename, status and, for migrations
+    applied in this run, execution time in milliseconds.
+    """
+    plan = plan_migrations(migrations_dir, database)
+
+    changed = [m.filename for m, status in plan if status == 'changed']
+    if changed:
+        raise MigrationChecksumError(
+            f'Applied migrations were modified: {", ".join(changed)}'
+        )
+
+    results = []
+    for migration, status in plan:
+        if status == 'applied':
+            results.append({'filename': migration.filename, 'status': 'applied'})
+            continue
+
+        if dry_run:
+            print(f'Pending migration: {migration.filename}')
+            results.append({'filename': migration.filename, 'status': 'pending'})
+            continue
+
+        print(f'Running migration: {migration.filename}')
+        start = time.perf_counter()
+        with database.transaction() as cursor:
+            execute_script(database, cursor, migration.read())
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            cursor.execute(database.adapt_sql(RECORD_MIGRATION), (
+                migration.version,
+                migration.description,
+                migration.filename,
+                migration.checksum,
+                elapsed_ms
+            ))
+        print(f'Applied {migration.filename} in {elapsed_ms:.1f} ms')
+        results.append({
+            'filename': migration.filename,
+            'status': 'migrated',
+            'execution_ms': elapsed_ms
+        })
+
+    if not any(r['status'] in ('pending', 'migrated') for r in results):
+        print('Schema is up to date')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply pending database migrations')
+    parser.add_argument('--dry-run', '--plan', action='store_true', dest='dry_run',
+                        help='Show pending migrations without applying them')
+    parser.add_argument('--dir', default=MIGRATIONS_DIR, help='Migrations directory')
+    args = parser.parse_args()
+
+    run_migrations(dry_run=args.dry_run, migrations_dir=args.dir)
 
-    for migration_file in migration_files:
-        print(f'Running migration: {migration_file}')
-        with open(os.path.join(migrations_dir, migration_file), 'r') as f:
-            sql = f.read()
-            db.query(sql)
 
 if __name__ == '__main__':
-    run_migrations()
+    main()
@@ -15,7 +15,7 @@ def main():
         asyncio.run(hunter.run_daemon())
     elif args.scan_only:
         print("Running a single scan...")
-        asyncio.run(hunter.scan())
+        asyncio.run(hunter.run_once())
     else:
         parser.print_help()
 
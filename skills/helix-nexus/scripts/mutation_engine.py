@@ -3,9 +3,12 @@
 Genetic Algorithm Mutation Engine - Evolves skills and strategies.
 Implements pygad-style mutations for continuous improvement.
 """
+import hashlib
 import json
+import os
 import random
-from typing import List, Dict, Any, Callable
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -52,6 +55,59 @@ class FitnessFunction:
         fitness = sum(metrics.get(k, 0.5) * w for k, w in weights.items())
         return fitness
 
+class FitnessCache:
+    """
+    LRU cache of fitness scores, optionally persisted as JSON.
+
+    Keyed by a SHA256 of the gene's type and content plus a fingerprint of
+    the target metrics, so survivors are not re-scored every generation.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[Path] = None):
+        self.max_entries = max(1, max_entries)
+        self.path = Path(path) if path else None
+        self.entries: 'OrderedDict[str, float]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if self.path and self.path.exists():
+            with open(self.path) as f:
+                self.entries.update(json.load(f))
+
+    @staticmethod
+    def key(gene: Gene, metrics: Dict[str, float]) -> str:
+        genome = hashlib.sha256(f"{gene.type}\0{gene.content}".encode('utf-8')).hexdigest()
+        window = hashlib.sha256(json.dumps(metrics, sort_keys=True).encode('utf-8')).hexdigest()
+        return f"{genome}:{window[:16]}"
+
+    def get_or_evaluate(self, gene: Gene, metrics: Dict[str, float],
+                        evaluate: Callable[[Gene, Dict[str, float]], float]) -> float:
+        key = self.key(gene, metrics)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        self.misses += 1
+        fitness = evaluate(gene, metrics)
+        self.entries[key] = fitness
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return fitness
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def save(self):
+        """Write entries to ``path`` atomically (no-op without one)."""
+        if not self.path:
+            return
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
 class MutationOperators:
     """Genetic algorithm mutation operators."""
     
@@ -122,10 +178,12 @@ class MutationOperators:
 class GeneticMutator:
     """Main genetic algorithm engine for skill evolution."""
     
-    def __init__(self, population_size: int = 10, generations: int = 5):
+    def __init__(self, population_size: int = 10, generations: int = 5,
+                 cache_size: int = 10000, cache_path: Optional[Path] = None):
         self.population_size = population_size
         self.generations = generations
         self.fitness_fn = FitnessFunction()
+        self.fitness_cache = FitnessCache(cache_size, cache_path)
         self.operators = MutationOperators()
         self.mutation_history = []
         
@@ -141,6 +199,8 @@ class GeneticMutator:
     
     def evolve_gene(self, gene: Gene, target_metrics: Dict[str, float]) -> Gene:
         """Evolve a single gene through multiple generations."""
+        cache = self.fitness_cache
+        hits, misses = cache.hits, cache.misses
         population = [gene]
         
         # Create initial population with mutations
@@ -156,9 +216,9 @@ class GeneticMutator:
         
         # Evolve for N generations
         for gen in range(self.generations):
-            # Evaluate fitness
+            # Evaluate fitness (survivors come from the cache)
             for g in population:
-                g.fitness = self.fitness_fn.evaluate(g, target_metrics)
+                g.fitness = cache.get_or_evaluate(g, target_metrics, self.fitness_fn.evaluate)
             
             # Selection: keep top 50%
             population.sort(key=lambda g: g.fitness, reverse=True)
@@ -192,18 +252,21 @@ class GeneticMutator:
         
         # Return fittest individual
         for g in population:
-            g.fitness = self.fitness_fn.evaluate(g, target_metrics)
+            g.fitness = cache.get_or_evaluate(g, target_metrics, self.fitness_fn.evaluate)
         
         population.sort(key=lambda g: g.fitness, reverse=True)
         best = population[0]
         
         # Log mutation
+        lookups = (cache.hits - hits) + (cache.misses - misses)
         self.mutation_history.append({
             'original_id': gene.id,
             'best_id': best.id,
             'fitness_improvement': best.fitness - gene.fitness,
-            'generation': best.generation
+            'generation': best.generation,
+            'cache_hit_rate': (cache.hits - hits) / lookups if lookups else 0.0
         })
+        cache.save()
         
         return best
     
@@ -332,6 +395,7 @@ def main():
         print(f"\n✓ Evolution complete!")
         print(f"  Generations: {evolved.generation}")
         print(f"  Fitness: {evolved.fitness:.3f}")
+        print(f"  Fitness cache hit rate: {mutator.fitness_cache.hit_rate:.1%}")
         print(f"\nMutation history:")
         for record in mutator.mutation_history:
             print(f"  {record}")
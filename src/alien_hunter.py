@@ -4,29 +4,133 @@ from dotenv import load_dotenv
 from src.cosmic_intel import CosmicIntel
 from src.ancient_engine import AncientEngine
 from src.wallet_invader import WalletInvader
-from src.utils import send_reown_notification, send_telegram_notification
+from src.security_void import SecurityVoid
+from src.pipeline import Pipeline, Stage
+from src.utils import flush_notifications, send_reown_notification, send_telegram_notification
 
 load_dotenv()
 
 class AlienHunter:
-    def __init__(self):
+    def __init__(self, threshold=0.85, fetch_concurrency=16, qualify_concurrency=4, act_concurrency=2, queue_size=100, qualify_batch_size=64):
         self.cosmic_intel = CosmicIntel()
         self.ancient_engine = AncientEngine()
         self.wallet_invader = WalletInvader()
+        self.security_void = SecurityVoid()
+        self.threshold = threshold
+        self.fetch_concurrency = fetch_concurrency
+        self.qualify_concurrency = qualify_concurrency
+        self.act_concurrency = act_concurrency
+        self.qualify_batch_size = qualify_batch_size
+        self.queue_size = queue_size
+        self.notifications = []
+        self.last_stats = {}
+        # Entries between dedup and a final outcome in the current scan
+        self.in_flight = set()
+
+    def build_pipeline(self):
+        """fetch -> parse -> dedup -> qualify -> security scan -> act/notify."""
+        size = self.queue_size
+        return Pipeline([
+            Stage("fetch", self._fetch, self.fetch_concurrency, size),
+            Stage("parse", self._parse, self.cosmic_intel.parse_workers, size, fan_out=True),
+            Stage("dedup", self._dedup, 1, size),
+            # Scores whatever has queued up in one sparse pass
+            Stage("qualify", self._qualify, self.qualify_concurrency, size, batch_size=self.qualify_batch_size),
+            Stage("security", self._security_scan, self.qualify_concurrency, size),
+            Stage("act", self._act, self.act_concurrency, size),
+        ])
 
     async def scan(self):
         print("Scanning for opportunities...")
-        opportunities = await self.cosmic_intel.gather_intel()
-        for opp in opportunities:
+        pipeline = self.build_pipeline()
+        self.in_flight = set()
+        try:
+            acted = await pipeline.run(self.cosmic_intel.sources)
+        finally:
+            # Entries that never reached an outcome must be re-read next scan
+            self.cosmic_intel.state.invalidate(self.in_flight)
+            self.cosmic_intel.save_state()
+            self.last_stats = pipeline.stats()
+        print(f"Scan complete: acted on {len(acted)} opportunities {self.last_stats}")
+        return acted
+
+    async def _fetch(self, source):
+        fetched = await self.cosmic_intel.fetch(source)
+        return None if fetched is None else (source, fetched)
+
+    async def _parse(self, fetched):
+        return await self.cosmic_intel.parse(*fetched)
+
+    async def _dedup(self, opp):
+        """Passes entries not seen in earlier scans or already in this one."""
+        state = self.cosmic_intel.state
+        if opp["id"] in state.seen:
+            # Still listed by its feed: keep it from expiring
+            state.mark_seen([opp])
+            return None
+        if opp["id"] in self.in_flight:
+            return None
+        self.in_flight.add(opp["id"])
+        return opp
+
+    def _settle(self, opp):
+        """Marks an entry seen once rejected or acted on; entries whose stage failed are retried next scan."""
+        self.cosmic_intel.state.mark_seen([opp])
+        self.in_flight.discard(opp["id"])
+
+    async def _qualify(self, opps):
+        for opp in opps:
             print(f"Analyzing opportunity: {opp['title']}")
-            score = self.ancient_engine.qualify(opp)
-            if score > 0.85:
-                print(f"High-value opportunity found: {opp['title']}. Taking action...")
-                await self.wallet_invader.execute_wormhole_bridge(opp)
-                await send_reown_notification(f"High-value opportunity found: {opp['title']}")
-                await send_telegram_notification(f"High-value opportunity found: {opp['title']}")
+        scores, similarities = self.ancient_engine.score_many(opps)
+        qualified = []
+        for opp, score, similarity in zip(opps, scores.tolist(), similarities.tolist()):
+            if score > self.threshold:
+                qualified.append({**opp, "score": score, "similarity": similarity})
+            else:
+                self._settle(opp)
+        return qualified
 
-    async def run_daemon(self):
-        while True:
+    async def _security_scan(self, opp):
+        if not self.security_void.scan_opportunity(opp):
+            print(f"Security scan rejected: {opp['title']}")
+            self._settle(opp)
+            return None
+        return opp
+
+    async def _act(self, opp):
+        print(f"High-value opportunity found: {opp['title']}. Taking action...")
+        await self.wallet_invader.execute_wormhole_bridge(opp)
+        # Settled before anything else can fail or be cancelled, so a
+        # bridged entry is never bridged again
+        self._settle(opp)
+        # Notifications run in the background so the scan never waits on them
+        self.notifications.append(asyncio.create_task(
+            send_reown_notification(f"High-value opportunity found: {opp['title']}")
+        ))
+        try:
+            await send_telegram_notification(f"High-value opportunity found: {opp['title']}")
+        except Exception as e:
+            print(f"Telegram notification failed for {opp['title']}: {e}")
+        return opp
+
+    async def close(self):
+        """Waits for background notifications and releases network resources."""
+        await asyncio.gather(*self.notifications, return_exceptions=True)
+        self.notifications.clear()
+        await flush_notifications()
+        await self.cosmic_intel.close()
+
+    async def run_once(self):
+        try:
             await self.scan()
-            await asyncio.sleep(3600)  # Run every hour
+        finally:
+            await self.close()
+
+    async def run_daemon(self):
+        try:
+            while True:
+                await self.scan()
+                self.notifications = [t for t in self.notifications if not t.done()]
+                await asyncio.sleep(3600)  # Run every hour
+        finally:
+            await self.close()
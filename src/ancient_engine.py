@@ -1,32 +1,183 @@
+import re
+
 import dateparser
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+# Score added when the keyword appears anywhere in the title or summary
+KEYWORD_WEIGHTS = {
+    "airdrop": 0.3,
+    "testnet": 0.2,
+    "grant": 0.2,
+    "solana": 0.1,
+    "unichain": 0.1,
+    "evm": 0.1,
+}
+
+# Known-good opportunities the similarity score is measured against
+REFERENCE_OPPORTUNITIES = [
+    "Solana airdrop for early testnet users: claim tokens after bridging",
+    "Retroactive airdrop announced for protocol users and liquidity providers",
+    "Incentivized testnet is live: run a node and complete quests for rewards",
+    "Ecosystem grant program opens applications for builders on Solana",
+    "Unichain testnet launch with developer grants and points for early activity",
+    "EVM-compatible chain announces token airdrop snapshot for bridgers",
+    "Points campaign: bridge assets and provide liquidity to qualify for the airdrop",
+    "Foundation grants fund open-source tooling, wallets and infrastructure",
+    "Claim window open for airdropped governance tokens to eligible wallets",
+    "Developer grants and hackathon prizes for EVM and Solana builders",
+]
+
+TOKEN_PATTERN = r"\w\w+"
+# Separates documents when a whole batch is tokenized in one pass
+_DOC_END = "\x00"
+_END_ID = -2
+_MISS_ID = -1
+
+
 class AncientEngine:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer()
+    def __init__(self, reference_corpus=None, keyword_weights=None, token_cache_size=200000):
+        """
+        Scores opportunities by keyword weights, with TF-IDF similarity to
+        known-good opportunities as a separate ranking signal.
+
+        Args:
+            reference_corpus: Texts of known-good opportunities (default:
+                REFERENCE_OPPORTUNITIES); the TF-IDF model is fitted on them
+            keyword_weights: Keyword -> score (default: KEYWORD_WEIGHTS)
+            token_cache_size: Out-of-vocabulary tokens remembered before they
+                are all forgotten; bounds the token index and the keyword
+                columns between batches
+        """
+        self.keyword_weights = dict(keyword_weights or KEYWORD_WEIGHTS)
+        self.token_cache_size = token_cache_size
+        self.vectorizer = TfidfVectorizer(sublinear_tf=True, token_pattern=TOKEN_PATTERN, dtype=np.float32)
+        self.reference = self.vectorizer.fit_transform(list(reference_corpus or REFERENCE_OPPORTUNITIES))
+        self.idf = self.vectorizer.idf_.astype(np.float32)
+        self.centroid = self._unit(np.asarray(self.reference.mean(axis=0)).ravel())
+        self._keyword_values = np.fromiter(self.keyword_weights.values(), dtype=np.float64)
+        self._tokenizer = re.compile(f"{TOKEN_PATTERN}|{_DOC_END}")
+
+        # Token -> column. Columns below len(vocabulary_) are TF-IDF terms;
+        # columns above are unseen tokens that contain a keyword, which
+        # count towards keyword presence only
+        vocabulary = self.vectorizer.vocabulary_
+        self._keyword_rows, self._keyword_cols = [], []
+        for term, column in vocabulary.items():
+            self._mark_keywords(term, column)
+        self._vocabulary_keywords = len(self._keyword_rows)
+        self._vocabulary_index = dict(vocabulary)
+        self._vocabulary_index[_DOC_END] = _END_ID
+        self._reset_tokens()
+
+    @staticmethod
+    def _unit(vector):
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    @staticmethod
+    def _content(opportunity):
+        return f"{opportunity.get('title', '')} {opportunity.get('summary', '')}"
+
+    def _mark_keywords(self, token, column):
+        hits = [k for k, keyword in enumerate(self.keyword_weights) if keyword in token]
+        self._keyword_rows.extend([column] * len(hits))
+        self._keyword_cols.extend(hits)
+        return bool(hits)
+
+    def _reset_tokens(self):
+        """Forgets every out-of-vocabulary token and its keyword column."""
+        del self._keyword_rows[self._vocabulary_keywords:]
+        del self._keyword_cols[self._vocabulary_keywords:]
+        self._columns = len(self.idf)
+        self._index = dict(self._vocabulary_index)
+        self._keyword_matrix = None
+
+    def _lookup_new(self, token):
+        """Column for a token outside the index (called once per token)."""
+        if self._mark_keywords(token, self._columns):
+            column = self._columns
+            self._columns += 1
+            self._keyword_matrix = None
+        else:
+            column = _MISS_ID
+        self._index[token] = column
+        return column
+
+    def _keywords(self):
+        if self._keyword_matrix is None or self._keyword_matrix.shape[0] != self._columns:
+            self._keyword_matrix = sparse.csr_matrix(
+                (np.ones(len(self._keyword_rows), dtype=np.float32), (self._keyword_rows, self._keyword_cols)),
+                shape=(self._columns, len(self.keyword_weights))
+            )
+        return self._keyword_matrix
+
+    def count_matrix(self, opportunities):
+        """
+        Token counts for a batch as a sparse (opportunities x columns) matrix.
+
+        The batch is lowercased and tokenized as one string, and tokens are
+        mapped to columns through a dict, so the Python work is one lookup
+        per token. Columns past the vocabulary are only valid for this
+        batch's matrix: the token index may be reset before the next one.
+        """
+        # Reset between batches only, so column ids stay consistent within one
+        if len(self._index) > len(self._vocabulary_index) + self.token_cache_size:
+            self._reset_tokens()
+        # A NUL inside the content would read as a document boundary
+        text = _DOC_END.join(
+            self._content(opp).replace(_DOC_END, " ") for opp in opportunities
+        ).lower() + _DOC_END
+        index, lookup_new = self._index, self._lookup_new
+        ids = np.array([
+            column if (column := index.get(token)) is not None else lookup_new(token)
+            for token in self._tokenizer.findall(text)
+        ], dtype=np.int64)
+        ends = ids == _END_ID
+        rows = np.cumsum(ends) - ends
+        keep = ids >= 0
+        counts = sparse.csr_matrix(
+            (np.ones(int(keep.sum()), dtype=np.float32), (rows[keep], ids[keep])),
+            shape=(len(opportunities), self._columns)
+        )
+        counts.sum_duplicates()
+        return counts
+
+    def score_many(self, opportunities):
+        """
+        Scores a batch of opportunities in one sparse pass.
+
+        Returns:
+            (keyword_scores, similarities): float64 arrays, one entry per
+            opportunity. A keyword score is the sum of the weights of the
+            keywords found anywhere in the title or summary; a similarity
+            is the cosine similarity to the centroid of the reference
+            corpus, in [0, 1]
+        """
+        opportunities = list(opportunities)
+        if not opportunities:
+            return np.zeros(0), np.zeros(0)
+        counts = self.count_matrix(opportunities)
+        present = (counts @ self._keywords()).toarray() > 0
+        # Summed keyword by keyword, in the same order as the scalar sum,
+        # so scores sitting exactly on a threshold round the same way
+        keyword_scores = np.zeros(len(opportunities))
+        for column, weight in enumerate(self._keyword_values):
+            keyword_scores += np.where(present[:, column], weight, 0.0)
+
+        # Same weighting as TfidfVectorizer(sublinear_tf=True): (1 + ln tf) * idf
+        tfidf = counts[:, :len(self.idf)]
+        tfidf.data = (np.log(tfidf.data) + 1) * self.idf[tfidf.indices]
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        similarities = (tfidf @ self.centroid).astype(np.float64) / np.where(norms > 0, norms, 1.0)
+        return keyword_scores, similarities
+
+    def qualify_many(self, opportunities):
+        """Keyword scores for a batch of opportunities (see score_many)."""
+        return self.score_many(opportunities)[0]
 
     def qualify(self, opportunity):
         """Qualifies an opportunity based on its content."""
-        # Simple keyword-based scoring for now.
-        # A more advanced model would be trained on historical data.
-        title = opportunity.get('title', '')
-        summary = opportunity.get('summary', '')
-        content = f"{title} {summary}"
-
-        score = 0
-        if "airdrop" in content.lower():
-            score += 0.3
-        if "testnet" in content.lower():
-            score += 0.2
-        if "grant" in content.lower():
-            score += 0.2
-        if "solana" in content.lower():
-            score += 0.1
-        if "unichain" in content.lower():
-            score += 0.1
-        if "evm" in content.lower():
-            score += 0.1
-
-        return score
+        return float(self.qualify_many([opportunity])[0])
@@ -1,28 +1,263 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
 import aiohttp
 import feedparser
-import json
+
+
+def entry_key(entry):
+    """Short stable hash of an entry's id, falling back to its link or title."""
+    ident = entry.get("id") or entry.get("link") or entry.get("title", "")
+    return hashlib.blake2b(ident.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def parse_feed(feed_data):
+    """Parses a feed document into opportunity dicts (runs in a worker pool)."""
+    feed = feedparser.parse(feed_data)
+    return [
+        {
+            "id": entry_key(entry),
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", ""),
+            "link": entry.get("link", "")
+        }
+        for entry in feed.entries
+    ]
+
+
+class FeedState:
+    """
+    On-disk HTTP validators per source and a seen-set of entry hashes.
+
+    Stored as JSON: {"validators": {url: {"etag": ..., "last_modified": ...,
+    "entries": [entry_hash, ...]}}, "seen": {entry_hash: last_seen_ts}}.
+    An entry's timestamp is refreshed every time its feed is read, or
+    answers 304, so entries still listed in a feed never expire; hashes
+    not seen for ``seen_ttl`` seconds are pruned on save.
+    """
+    def __init__(self, path, seen_ttl=30 * 86400):
+        self.path = path
+        self.seen_ttl = seen_ttl
+        self.validators = {}
+        self.seen = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                self.validators = data.get("validators", {})
+                self.seen = data.get("seen", {})
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable feed state {path}: {e}")
+
+    def request_headers(self, source):
+        validators = self.validators.get(source, {})
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def update_validators(self, source, etag, last_modified, entries=()):
+        """Pins a source's validators and the entries its response listed."""
+        if etag or last_modified:
+            self.validators[source] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "entries": [entry["id"] for entry in entries]
+            }
+        else:
+            self.validators.pop(source, None)
+
+    def touch(self, source, now=None):
+        """Refreshes the entries of a source that answered 304 Not Modified."""
+        now = time.time() if now is None else now
+        for key in self.validators.get(source, {}).get("entries", ()):
+            if key in self.seen:
+                self.seen[key] = now
+
+    def invalidate(self, keys):
+        """Drops the validators of sources listing any of ``keys``, so they are read in full next time."""
+        keys = set(keys)
+        for source, validators in list(self.validators.items()):
+            if keys.intersection(validators.get("entries", ())):
+                del self.validators[source]
+
+    def mark_seen(self, entries, now=None):
+        """Marks entries seen at ``now``, refreshing those already seen."""
+        now = time.time() if now is None else now
+        for entry in entries:
+            self.seen[entry["id"]] = now
+
+    def filter_new(self, entries, now=None):
+        """Returns entries not seen before; marks all of them seen at ``now``."""
+        now = time.time() if now is None else now
+        fresh = []
+        for entry in entries:
+            if entry["id"] not in self.seen:
+                fresh.append(entry)
+            self.seen[entry["id"]] = now
+        return fresh
+
+    def save(self, now=None):
+        """Prunes expired hashes and atomically rewrites the state file."""
+        if not self.path:
+            return
+        cutoff = (time.time() if now is None else now) - self.seen_ttl
+        self.seen = {key: ts for key, ts in self.seen.items() if ts >= cutoff}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".feed-state-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"validators": self.validators, "seen": self.seen}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
 
 class CosmicIntel:
-    def __init__(self):
-        with open("configs/allowlists.json", "r") as f:
+    def __init__(
+        self,
+        config_path="configs/allowlists.json",
+        timeout=20.0,
+        connect_timeout=5.0,
+        limit=64,
+        limit_per_host=4,
+        parse_workers=4,
+        parse_in_processes=False,
+        state_path="data/cosmic_intel_state.json",
+        seen_ttl=30 * 86400
+    ):
+        """
+        Concurrent feed fetcher.
+
+        Args:
+            config_path: JSON file with a "sources" list of feed URLs
+            timeout: Total seconds allowed per feed request
+            connect_timeout: Seconds allowed to connect
+            limit: Open connections across all hosts
+            limit_per_host: Open connections per host
+            parse_workers: Size of the feedparser worker pool
+            parse_in_processes: Parse in a process pool instead of threads
+                (feedparser is pure Python, so threads share the GIL)
+            state_path: File persisting ETag/Last-Modified per source and
+                the seen-set of entry hashes (None keeps nothing on disk)
+            seen_ttl: Seconds an entry hash is remembered
+        """
+        with open(config_path, "r") as f:
             self.config = json.load(f)
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.parse_workers = parse_workers
+        self.parse_in_processes = parse_in_processes
+        self.state = FeedState(state_path, seen_ttl)
+        self._session = None
+        self._executor: Executor = None
+
+    @property
+    def sources(self):
+        return [self._normalize(source) for source in self.config["sources"]]
 
     async def gather_intel(self):
-        """Gathers intelligence from various sources."""
-        opportunities = []
-        for source in self.config["sources"]:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(source) as response:
-                        if response.status == 200:
-                            feed_data = await response.text()
-                            feed = feedparser.parse(feed_data)
-                            for entry in feed.entries:
-                                opportunities.append({
-                                    "title": entry.title,
-                                    "summary": entry.summary,
-                                    "link": entry.link
-                                })
-            except Exception as e:
-                print(f"Error fetching intel from {source}: {e}")
-        return opportunities
+        """
+        Gathers entries not seen in earlier scans from all sources.
+
+        Sources are requested conditionally, so unchanged feeds cost a 304
+        and no parsing.
+        """
+        results = await asyncio.gather(*(self._fetch_source(source) for source in self.sources))
+        entries = [opportunity for entries in results for opportunity in entries]
+        fresh = self.state.filter_new(entries)
+        self.save_state()
+        return fresh
+
+    async def fetch(self, source):
+        """Conditionally downloads one source; None if unchanged or failed."""
+        try:
+            return await self._fetch(source)
+        except Exception as e:
+            print(f"Error fetching intel from {source}: {e}")
+            return None
+
+    async def parse(self, source, fetched):
+        """Parses a fetched feed in the worker pool and records its validators."""
+        feed_data, etag, last_modified = fetched
+        loop = asyncio.get_running_loop()
+        try:
+            entries = await loop.run_in_executor(self._get_executor(), parse_feed, feed_data)
+        except Exception as e:
+            print(f"Error parsing intel from {source}: {e}")
+            return []
+        # Only pin validators for a response that parsed into entries: a
+        # garbage or truncated body would otherwise be answered 304 forever
+        if entries:
+            self.state.update_validators(source, etag, last_modified, entries)
+        else:
+            self.state.update_validators(source, None, None)
+        return entries
+
+    def save_state(self):
+        try:
+            self.state.save()
+        except OSError as e:
+            print(f"Could not save feed state to {self.state.path}: {e}")
+
+    async def close(self):
+        """Closes the shared HTTP session and the parser pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _fetch_source(self, source):
+        fetched = await self.fetch(source)
+        return [] if fetched is None else await self.parse(source, fetched)
+
+    async def _fetch(self, source):
+        headers = self.state.request_headers(source)
+        async with self._get_session().get(source, headers=headers) as response:
+            if response.status == 304:
+                self.state.touch(source)
+                return None
+            if response.status != 200:
+                print(f"Skipping {source}: HTTP {response.status}")
+                return None
+            # Raw bytes let feedparser honour the document's declared encoding
+            return (
+                await response.read(),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            )
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    def _get_executor(self):
+        if self._executor is None:
+            pool = ProcessPoolExecutor if self.parse_in_processes else ThreadPoolExecutor
+            self._executor = pool(max_workers=self.parse_workers)
+        return self._executor
+
+    @staticmethod
+    def _normalize(source):
+        # The allowlist stores bare host/path entries
+        return source if urlsplit(source).scheme else f"https://{source}"
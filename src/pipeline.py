@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+# Marks the end of a stage's input; each worker consumes exactly one
+_DONE = object()
+
+
+class Stage:
+    def __init__(self, name, func, concurrency=1, queue_size=100, fan_out=False, batch_size=1):
+        """
+        One step of a Pipeline.
+
+        Args:
+            name: Stage name for stats
+            func: Coroutine function taking one item. It returns the item
+                to pass on, or None to drop it
+            concurrency: Workers running func at once
+            queue_size: Capacity of the queue feeding this stage; a full
+                queue makes the previous stage wait
+            fan_out: func returns a list of items to pass on one by one
+            batch_size: Above 1, func takes a list of up to this many items
+                already queued (it never waits for more to arrive) and
+                returns a list of items to pass on
+        """
+        self.name = name
+        self.func = func
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.fan_out = fan_out or batch_size > 1
+        self.batch_size = batch_size
+        self.processed = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+    def stats(self):
+        return {
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3)
+        }
+
+
+class Pipeline:
+    """
+    Async stages connected by bounded queues.
+
+    Items flow to the next stage as soon as they are produced, so later
+    stages start before earlier ones finish, and the bounded queues keep
+    a slow stage from letting work pile up in memory behind it.
+    """
+    def __init__(self, stages):
+        self.stages = stages
+        self.results = []
+
+    async def run(self, items):
+        """Pushes items through every stage; returns the last stage's outputs."""
+        self.results = []
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        tasks = []
+        for index, stage in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            workers = [
+                asyncio.create_task(self._worker(stage, queues[index], outbox))
+                for _ in range(stage.concurrency)
+            ]
+            tasks.append(asyncio.create_task(self._close_after(workers, outbox, index)))
+        try:
+            for item in items:
+                await queues[0].put(item)
+            for _ in range(self.stages[0].concurrency):
+                await queues[0].put(_DONE)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return self.results
+
+    def stats(self):
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    async def _close_after(self, workers, outbox, index):
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            raise
+        if outbox is not None:
+            for _ in range(self.stages[index + 1].concurrency):
+                await outbox.put(_DONE)
+
+    async def _worker(self, stage, inbox, outbox):
+        done = False
+        while not done:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            count = 1
+            if stage.batch_size > 1:
+                item = [item]
+                while len(item) < stage.batch_size and not inbox.empty():
+                    queued = inbox.get_nowait()
+                    if queued is _DONE:
+                        done = True
+                        break
+                    item.append(queued)
+                count = len(item)
+            started = time.monotonic()
+            try:
+                result = await stage.func(item)
+            except Exception as e:
+                stage.errors += count
+                print(f"Pipeline stage {stage.name} failed: {e}")
+                continue
+            finally:
+                stage.processed += count
+                stage.busy_seconds += time.monotonic() - started
+            if result is None:
+                continue
+            for output in (result if stage.fan_out else (result,)):
+                stage.emitted += 1
+                if outbox is None:
+                    self.results.append(output)
+                else:
+                    await outbox.put(output)
@@ -1,14 +1,151 @@
+import asyncio
 import os
+import time
+from collections import deque
 import aiohttp
 
-async def send_telegram_notification(message):
-    """Sends a notification to Telegram."""
+# Telegram allows about one message per second per chat, with short bursts
+TELEGRAM_CHAT_RATE = 1.0
+TELEGRAM_CHAT_BURST = 3.0
+# Messages for a chat queued within this many seconds go out as one digest
+TELEGRAM_DIGEST_WINDOW = 2.0
+TELEGRAM_MAX_LENGTH = 4096
+TELEGRAM_MAX_RETRIES = 3
+
+# chat -> deque of (queued at, message); outlives the worker so nothing
+# queued is lost when it stops or its event loop goes away
+_telegram_pending = {}
+# chat -> [tokens, last refill]
+_telegram_buckets = {}
+_telegram_worker = None
+_telegram_wakeup = None
+_telegram_flushing = False
+_telegram_session = None
+
+async def _post_telegram(message, chat_id):
+    """Sends one message, retrying rate limits and server errors."""
+    global _telegram_session
     bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    if _telegram_session is None or _telegram_session.closed:
+        _telegram_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     payload = {"chat_id": chat_id, "text": message}
-    async with aiohttp.ClientSession() as session:
-        await session.post(url, json=payload)
+    for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+        try:
+            async with _telegram_session.post(url, json=payload) as response:
+                if response.status == 200:
+                    return
+                if response.status == 429:
+                    body = await response.json(content_type=None)
+                    delay = float(body.get("parameters", {}).get("retry_after", 1))
+                elif response.status >= 500:
+                    delay = 2 ** attempt
+                else:
+                    print(f"Telegram rejected notification: HTTP {response.status}")
+                    return
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            delay = 2 ** attempt
+            print(f"Telegram send failed ({e}), retrying in {delay}s")
+        if attempt < TELEGRAM_MAX_RETRIES:
+            await asyncio.sleep(delay)
+    print(f"Dropping Telegram notification after {TELEGRAM_MAX_RETRIES} retries")
+
+def _bucket_delay(chat, now):
+    """Seconds until the chat's token bucket allows another send."""
+    tokens, updated = _telegram_buckets.get(chat, (TELEGRAM_CHAT_BURST, now))
+    tokens = min(TELEGRAM_CHAT_BURST, tokens + (now - updated) * TELEGRAM_CHAT_RATE)
+    _telegram_buckets[chat] = [tokens, now]
+    return 0.0 if tokens >= 1 else (1 - tokens) / TELEGRAM_CHAT_RATE
+
+def _take_digest(messages):
+    """Pops as many queued messages as fit in one Telegram message."""
+    parts = []
+    length = 0
+    while messages:
+        text = messages[0][1][:TELEGRAM_MAX_LENGTH]
+        extra = len(text) + (2 if parts else 0)
+        if parts and length + extra > TELEGRAM_MAX_LENGTH:
+            break
+        messages.popleft()
+        parts.append(text)
+        length += extra
+    return "\n\n".join(parts)
+
+async def _run_telegram_worker():
+    """Sends digests until nothing is queued, pacing each chat by its bucket."""
+    while any(_telegram_pending.values()):
+        _telegram_wakeup.clear()
+        wait = None
+        sent = False
+        for chat in list(_telegram_pending):
+            messages = _telegram_pending[chat]
+            if not messages:
+                continue
+            now = time.monotonic()
+            window = 0.0 if _telegram_flushing else messages[0][0] + TELEGRAM_DIGEST_WINDOW - now
+            delay = max(window, _bucket_delay(chat, now))
+            if delay > 0:
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            _telegram_buckets[chat][0] -= 1
+            try:
+                await _post_telegram(_take_digest(messages), chat)
+            except Exception as e:
+                print(f"Telegram notification failed: {e}")
+            sent = True
+        if sent:
+            continue
+        try:
+            await asyncio.wait_for(_telegram_wakeup.wait(), wait)
+        except asyncio.TimeoutError:
+            pass
+
+def _ensure_telegram_worker():
+    global _telegram_worker, _telegram_wakeup, _telegram_session
+    loop = asyncio.get_running_loop()
+    if _telegram_worker is not None and not _telegram_worker.done() and _telegram_worker.get_loop() is loop:
+        _telegram_wakeup.set()
+        return
+    if _telegram_worker is not None and _telegram_worker.get_loop() is not loop:
+        # The session belongs to the previous event loop
+        _telegram_session = None
+    _telegram_wakeup = asyncio.Event()
+    _telegram_worker = loop.create_task(_run_telegram_worker())
+
+async def send_telegram_notification(message, chat_id=None):
+    """Queues a notification to Telegram; a background task delivers it in digests."""
+    if not os.getenv("TELEGRAM_BOT_TOKEN"):
+        print(f"TELEGRAM NOTIFICATION: {message}")
+        return
+    chat = str(chat_id or os.getenv("TELEGRAM_CHAT_ID"))
+    _telegram_pending.setdefault(chat, deque()).append((time.monotonic(), message))
+    _ensure_telegram_worker()
+
+async def flush_notifications(timeout=30.0):
+    """Delivers queued Telegram notifications now, then closes the sender's session."""
+    global _telegram_worker, _telegram_session, _telegram_flushing
+    sending = (
+        _telegram_worker is not None and not _telegram_worker.done()
+        and _telegram_worker.get_loop() is asyncio.get_running_loop()
+    )
+    if sending or any(_telegram_pending.values()):
+        _ensure_telegram_worker()
+        _telegram_flushing = True
+        _telegram_wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(_telegram_worker), timeout)
+        except asyncio.TimeoutError:
+            pending = sum(len(messages) for messages in _telegram_pending.values())
+            print(f"Dropping {pending} undelivered Telegram notifications")
+            _telegram_worker.cancel()
+            await asyncio.gather(_telegram_worker, return_exceptions=True)
+            _telegram_pending.clear()
+        finally:
+            _telegram_flushing = False
+    _telegram_worker = None
+    if _telegram_session is not None:
+        await _telegram_session.close()
+        _telegram_session = None
 
 async def send_reown_notification(message):
     """Sends a notification to the Reown AppKit."""
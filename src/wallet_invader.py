@@ -1,3 +1,4 @@
+import asyncio
 import os
 from solana.rpc.api import Client
 from solders.keypair import Keypair
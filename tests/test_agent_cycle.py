@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.agent import CryptoGeneOmega
+
+
+class SlowDatabase:
+    """In-memory stand-in for DatabaseClient with a fixed per-call delay."""
+
+    def __init__(self, delay=0.05, disabled=()):
+        self.delay = delay
+        self.disabled = set(disabled)
+        self.logged = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def _call(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+    async def is_strategy_enabled(self, strategy_name):
+        await self._call()
+        return strategy_name not in self.disabled
+
+    async def get_belief_score(self, strategy_name):
+        await self._call()
+        return 0.7
+
+    async def log_execution(self, strategy_name, result):
+        await self._call()
+        self.logged.append((strategy_name, result))
+
+    async def update_belief_score(self, strategy_name, score):
+        pass
+
+
+class TestConcurrentCycle(unittest.IsolatedAsyncioTestCase):
+
+    async def test_results_follow_registration_order(self):
+        agent = CryptoGeneOmega()
+        agent.database = SlowDatabase(disabled={'zk'})
+        results = await agent._run_strategies_concurrently()
+        expected = [name for name in agent.strategies if name != 'zk']
+        self.assertEqual([r['strategy'] for r in results], expected)
+
+    async def test_strategy_pipelines_overlap(self):
+        agent = CryptoGeneOmega()
+        agent.database = SlowDatabase(delay=0.01)
+        await agent._run_strategies_concurrently()
+        # Every pipeline's first lookup is in flight at the same time
+        self.assertEqual(agent.database.peak_in_flight, len(agent.strategies))
+
+    async def test_strategy_timeout(self):
+        agent = CryptoGeneOmega(strategy_timeout=0.01)
+        agent.database = SlowDatabase(delay=0)
+
+        async def slow_signal():
+            await asyncio.sleep(10)
+
+        for strategy in agent.strategies.values():
+            strategy.generate_signal = slow_signal
+        results = await agent._run_strategies_concurrently()
+        self.assertTrue(all(r['error'] == 'timeout' for r in results))
+        self.assertEqual(len(results), len(agent.strategies))
+        self.assertEqual(
+            [result for _, result in agent.database.logged],
+            [{'success': False, 'error': 'timeout'}] * len(agent.strategies)
+        )
+
+    async def test_started_trade_outlives_the_timeout(self):
+        agent = CryptoGeneOmega(strategy_timeout=0.01)
+        agent.database = SlowDatabase(delay=0)
+        strategy = agent.strategies['arbitrage']
+
+        async def buy():
+            return {'type': 'buy', 'asset': 'ETH', 'amount': 0.01, 'price': 100.0}
+
+        async def slow_trade(signal):
+            await asyncio.sleep(0.05)
+            return {'success': True, 'profit_loss': 1.0}
+
+        strategy.generate_signal = buy
+        agent.executor._execute_trade = slow_trade
+        result = await agent._run_strategy('arbitrage', strategy)
+        self.assertTrue(result['success'])
+        self.assertEqual(agent.database.logged, [('arbitrage', {'success': True, 'profit_loss': 1.0})])
+        self.assertEqual(agent.executor.portfolio_value, 10001.0)
+
+    async def test_slow_log_write_keeps_the_real_result(self):
+        agent = CryptoGeneOmega(strategy_timeout=0.01)
+        agent.database = SlowDatabase(delay=0)
+        logged = []
+
+        async def slow_log(strategy_name, result):
+            await asyncio.sleep(0.05)
+            logged.append(result)
+
+        agent.database.log_execution = slow_log
+        results = await agent._run_strategies_concurrently()
+        self.assertFalse(any(r.get('error') == 'timeout' for r in results))
+        self.assertEqual(len(logged), len(agent.strategies))
+        self.assertNotIn('timeout', [result.get('error') for result in logged])
+
+    async def test_cycle_refreshes_portfolio_value(self):
+        agent = CryptoGeneOmega()
+        agent.database = SlowDatabase(delay=0)
+
+        async def get_portfolio_value():
+            return 2500.0
+
+        agent.database.get_portfolio_value = get_portfolio_value
+        await agent._refresh_portfolio_value()
+        self.assertEqual(agent.executor.risk_engine.portfolio_value, 2500.0)
+
+        async def valuation_down():
+            raise ConnectionError('rpc unavailable')
+
+        agent.database.get_portfolio_value = valuation_down
+        await agent._refresh_portfolio_value()
+        self.assertEqual(agent.executor.portfolio_value, 2500.0)
+
+    async def test_snapshot_skips_per_strategy_lookups(self):
+        agent = CryptoGeneOmega()
+        agent.database = SlowDatabase(delay=10)
+        snapshot = {
+            name: {'enabled': name != 'zk', 'belief_score': 0.9, 'parameters': {}}
+            for name in agent.strategies
+        }
+        agent.database.log_execution = SlowDatabase(delay=0).log_execution
+        results = await agent._run_strategies_concurrently(snapshot)
+        self.assertEqual(len(results), len(agent.strategies) - 1)
+        self.assertTrue(all(r['success'] for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.alien_hunter import AlienHunter
+from test_cosmic_intel import CosmicIntelTestCase, rss
+
+
+class FlakyWallet:
+    """Fails to bridge opportunities whose title contains 'broken'."""
+
+    def __init__(self):
+        self.bridged = []
+
+    async def execute_wormhole_bridge(self, opportunity):
+        if 'broken' in opportunity['title']:
+            raise ConnectionError('rpc down')
+        self.bridged.append(opportunity['title'])
+
+
+@mock.patch('src.alien_hunter.send_reown_notification', mock.AsyncMock())
+@mock.patch('src.alien_hunter.send_telegram_notification', mock.AsyncMock())
+class TestAlienHunterScan(CosmicIntelTestCase):
+
+    async def hunter(self, feed):
+        server = await self.start({'feed': feed})
+        hunter = AlienHunter(threshold=0.5)
+        hunter.cosmic_intel = self.intel([server.url('feed')])
+        hunter.wallet_invader = FlakyWallet()
+        return server, hunter
+
+    async def test_entries_are_marked_seen_only_at_a_final_outcome(self):
+        server, hunter = await self.hunter(rss('airdrop-testnet-grant', 'weather', 'airdrop-testnet-grant-broken'))
+        acted = await hunter.scan()
+        self.assertEqual([opp['title'] for opp in acted], ['airdrop-testnet-grant'])
+        self.assertEqual(hunter.last_stats['act']['errors'], 1)
+        state = hunter.cosmic_intel.state
+        self.assertEqual(len(state.seen), 2)
+        # The failed entry's feed is read in full again instead of answering 304
+        self.assertNotIn(server.url('feed'), state.validators)
+
+        hunter.wallet_invader.execute_wormhole_bridge = mock.AsyncMock()
+        acted = await hunter.scan()
+        self.assertEqual([opp['title'] for opp in acted], ['airdrop-testnet-grant-broken'])
+        self.assertEqual(len(state.seen), 3)
+        self.assertIn(server.url('feed'), state.validators)
+
+    async def test_failed_notification_does_not_rebridge(self):
+        _, hunter = await self.hunter(rss('airdrop-testnet-grant'))
+        with mock.patch('src.alien_hunter.send_telegram_notification',
+                        mock.AsyncMock(side_effect=ConnectionError('telegram down'))):
+            self.assertEqual(len(await hunter.scan()), 1)
+        self.assertEqual(await hunter.scan(), [])
+        self.assertEqual(hunter.wallet_invader.bridged, ['airdrop-testnet-grant'])
+        self.assertEqual(hunter.in_flight, set())
+
+    async def test_duplicate_entries_are_handled_once(self):
+        _, hunter = await self.hunter(rss('airdrop-testnet-grant', 'airdrop-testnet-grant'))
+        self.assertEqual(len(await hunter.scan()), 1)
+        self.assertEqual(await hunter.scan(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ancient_engine import REFERENCE_OPPORTUNITIES, AncientEngine
+
+
+def substring_score(opportunity):
+    """The keyword scoring AncientEngine.qualify used before batching."""
+    content = f"{opportunity.get('title', '')} {opportunity.get('summary', '')}".lower()
+    score = 0
+    for keyword, weight in (("airdrop", 0.3), ("testnet", 0.2), ("grant", 0.2),
+                            ("solana", 0.1), ("unichain", 0.1), ("evm", 0.1)):
+        if keyword in content:
+            score += weight
+    return score
+
+
+def random_opportunities(count, seed=0):
+    rng = random.Random(seed)
+    words = ("Airdrop airdrops AIRDROPPED testnet Testnet-2 grants grantee solana SolanaPay "
+             "unichain evm EVM-compatible devnet bridge claim points quest wallet node token "
+             "liquidity hackathon retroactive snapshot the a of for and to on").split()
+    return [
+        {
+            "title": " ".join(rng.choice(words) for _ in range(rng.randint(0, 8))),
+            "summary": " ".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+        }
+        for _ in range(count)
+    ]
+
+
+class TestAncientEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = AncientEngine()
+        cls.opportunities = random_opportunities(500)
+
+    def test_keyword_scores_match_substring_scoring(self):
+        expected = [substring_score(opp) for opp in self.opportunities]
+        self.assertEqual(self.engine.qualify_many(self.opportunities).tolist(), expected)
+
+    def test_similarity_matches_vectorizer_and_cosine(self):
+        _, similarities = self.engine.score_many(self.opportunities)
+        texts = [f"{opp['title']} {opp['summary']}" for opp in self.opportunities]
+        centroid = np.asarray(self.engine.reference.mean(axis=0))
+        expected = cosine_similarity(self.engine.vectorizer.transform(texts), centroid).ravel()
+        np.testing.assert_allclose(similarities, expected, atol=1e-5)
+
+    def test_similarity_does_not_change_qualification(self):
+        opp = {"title": "airdrop testnet grant solana", "summary": REFERENCE_OPPORTUNITIES[0]}
+        self.assertEqual(self.engine.qualify(opp), 0.3 + 0.2 + 0.2 + 0.1)
+        self.assertLess(self.engine.qualify(opp), 0.85)
+
+    def test_single_and_batch_scores_agree(self):
+        batch = self.engine.qualify_many(self.opportunities[:20])
+        single = [self.engine.qualify(opp) for opp in self.opportunities[:20]]
+        self.assertEqual(batch.tolist(), single)
+        self.assertEqual(self.engine.qualify_many([]).shape, (0,))
+
+    def test_nul_characters_do_not_split_documents(self):
+        opportunities = [{"title": "airdrop\x00testnet", "summary": "\x00\x00grant"}, {"title": "evm"}]
+        self.assertEqual(self.engine.qualify_many(opportunities).tolist(), [0.3 + 0.2 + 0.2, 0.1])
+
+    def test_token_index_stays_bounded(self):
+        engine = AncientEngine(token_cache_size=100)
+        columns = len(engine.idf)
+        for batch in range(20):
+            opportunities = [
+                {"title": f"airdrop{batch}x{i} grant{batch}x{i}", "summary": f"noise{batch}x{i}"}
+                for i in range(50)
+            ]
+            self.assertEqual(engine.qualify_many(opportunities).tolist(), [0.5] * 50)
+            # At most one batch of new tokens beyond the cache size
+            self.assertLessEqual(len(engine._index), len(engine._vocabulary_index) + 100 + 150)
+            self.assertLessEqual(engine._columns - columns, 100 + 100)
+            self.assertEqual(len(engine._keyword_rows), engine._vocabulary_keywords + engine._columns - columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
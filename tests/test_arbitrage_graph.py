@@ -0,0 +1,109 @@
+import asyncio
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.strategies import ArbitrageHunter
+from agent.strategies.arbitrage_graph import ArbitrageGraph
+
+
+def has_negative_cycle(graph):
+    """Textbook Bellman-Ford from a virtual source."""
+    n = len(graph.tokens)
+    dist = [0.0] * n
+    edges = [(graph.src[e], graph.dst[e], graph.weight[e]) for e in range(len(graph))]
+    for _ in range(n):
+        changed = False
+        for u, v, w in edges:
+            if dist[u] + w < dist[v] - 1e-12:
+                dist[v] = dist[u] + w
+                changed = True
+        if not changed:
+            return False
+    return True
+
+
+class TestArbitrageGraph(unittest.TestCase):
+
+    def test_triangle(self):
+        graph = ArbitrageGraph()
+        self.assertIsNone(graph.update_pool('p1', 'SOL', 'USDC', 100.0, fee=0.001))
+        self.assertIsNone(graph.update_pool('p2', 'BONK', 'USDC', 0.00002, fee=0.001))
+        # SOL -> BONK at 5.2M per SOL beats the 5M implied by the other pools
+        cycle = graph.update_pool('p3', 'SOL', 'BONK', 5200000.0, fee=0.001)
+        self.assertIsNotNone(cycle)
+        self.assertEqual(set(cycle.pools), {'p1', 'p2', 'p3'})
+        self.assertEqual(cycle.tokens[0], cycle.tokens[-1])
+        self.assertAlmostEqual(cycle.rate, 1.04 * 0.999 ** 3)
+        self.assertEqual(set(graph.find_cycle().pools), {'p1', 'p2', 'p3'})
+
+        # Quote moves back into line: the opportunity closes
+        graph.update_pool('p3', 'SOL', 'BONK', 5000000.0, fee=0.001)
+        self.assertEqual(graph.opportunities(), [])
+        self.assertIsNone(graph.find_cycle())
+
+    def test_fees_can_remove_arbitrage(self):
+        graph = ArbitrageGraph()
+        graph.update_pool('a', 'X', 'Y', 1.0, fee=0.003)
+        self.assertIsNone(graph.update_pool('b', 'X', 'Y', 1.004, fee=0.003))
+        self.assertIsNotNone(graph.update_pool('c', 'X', 'Y', 1.01, fee=0.003))
+
+    def test_incremental_matches_full_search(self):
+        rng = random.Random(3)
+        graph = ArbitrageGraph()
+        tokens = [f"T{i}" for i in range(12)]
+        values = {t: math.exp(rng.gauss(0, 1)) for t in tokens}
+        pools = []
+        for i in range(40):
+            a, b = rng.sample(tokens, 2)
+            pools.append((i, a, b))
+            graph.update_pool(i, a, b, values[a] / values[b], fee=0.002)
+        self.assertIsNone(graph.find_cycle())
+
+        for step in range(600):
+            pool, a, b = rng.choice(pools)
+            graph.update_pool(pool, a, b, values[a] / values[b] * math.exp(rng.uniform(-0.0025, 0.0025)), fee=0.002)
+            graph.opportunities()
+            self.assertEqual(bool(graph.open_cycles), has_negative_cycle(graph), step)
+            for cycle in graph.open_cycles.values():
+                self.assertGreater(cycle.rate, 1.0)
+                # Consecutive edges chain tail to head and close the loop
+                for e, f in zip(cycle.edges, cycle.edges[1:] + cycle.edges[:1]):
+                    self.assertEqual(graph.dst[e], graph.src[f])
+
+
+class TestArbitrageHunter(unittest.TestCase):
+
+    def test_signal_routes_best_cycle(self):
+        hunter = ArbitrageHunter()
+        self.assertEqual(asyncio.run(hunter.generate_signal()), {'type': 'hold'})
+        hunter.on_quote('p1', 'SOL', 'USDC', 100.0)
+        hunter.on_quote('p2', 'SOL', 'USDC', 101.0)
+        signal = asyncio.run(hunter.generate_signal())
+        self.assertEqual(signal['type'], 'arbitrage')
+        self.assertEqual(set(signal['pools']), {'p1', 'p2'})
+        self.assertAlmostEqual(signal['expected_return'], 0.01)
+
+        hunter.parameters['min_profit'] = 0.02
+        self.assertEqual(asyncio.run(hunter.generate_signal()), {'type': 'hold'})
+
+    def test_open_cycle_is_signalled_once_until_it_closes(self):
+        hunter = ArbitrageHunter()
+        hunter.on_quote('p1', 'SOL', 'USDC', 100.0)
+        hunter.on_quote('p2', 'SOL', 'USDC', 101.0)
+        self.assertEqual(asyncio.run(hunter.generate_signal())['type'], 'arbitrage')
+        self.assertEqual(asyncio.run(hunter.generate_signal()), {'type': 'hold'})
+
+        hunter.on_quote('p2', 'SOL', 'USDC', 100.0, fee=0.001)
+        self.assertEqual(asyncio.run(hunter.generate_signal()), {'type': 'hold'})
+        self.assertEqual(hunter.graph.open_cycles, {})
+        hunter.on_quote('p2', 'SOL', 'USDC', 101.0)
+        self.assertEqual(asyncio.run(hunter.generate_signal())['type'], 'arbitrage')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import unittest
+from database.connection import Database
+from database.audit_verifier import AuditVerifier
+
+CONFIG_HASH = '0' * 64
+
+
+class TestAuditVerifier(unittest.TestCase):
+
+    def setUp(self):
+        self.db = Database(backend='sqlite')
+        self.db.query(
+            "CREATE TABLE immutable_audit_log (id INTEGER PRIMARY KEY, data TEXT, "
+            "data_hash TEXT, config_hash TEXT, verified_at TEXT)"
+        )
+        self.db.query(
+            "CREATE TABLE audit_verification_checkpoint (verifier TEXT PRIMARY KEY, last_id INTEGER, "
+            "rows_verified INTEGER, mismatches INTEGER, chain_hash TEXT, gap_ids TEXT, updated_at TEXT)"
+        )
+        self.db.query(
+            "CREATE TABLE audit_verification_failures (id INTEGER PRIMARY KEY, audit_id INTEGER UNIQUE, "
+            "reason TEXT, stored_hash TEXT, computed_hash TEXT)"
+        )
+        self.insert(1, 25)
+
+    def tearDown(self):
+        self.db.close_all_connections()
+
+    def insert(self, first, last, skip=()):
+        rows = []
+        for audit_id in range(first, last + 1):
+            if audit_id in skip:
+                continue
+            data = json.dumps({'amount': audit_id})
+            rows.append((audit_id, data, hashlib.sha256(data.encode()).hexdigest(), CONFIG_HASH))
+        self.db.executemany(
+            "INSERT INTO immutable_audit_log (id, data, data_hash, config_hash) VALUES (%s, %s, %s, %s)",
+            rows
+        )
+
+    def verifier(self):
+        return AuditVerifier(self.db, batch_size=10, workers=2, config_hash=CONFIG_HASH)
+
+    def test_reruns_only_verify_new_rows(self):
+        first = self.verifier().verify()
+        self.assertEqual(first['rows_checked'], 25)
+        self.assertEqual(first['mismatches'], 0)
+
+        self.insert(26, 30)
+        second = self.verifier().verify()
+        self.assertEqual(second['rows_checked'], 5)
+        self.assertEqual(second['checkpoint']['last_id'], 30)
+        self.assertEqual(second['checkpoint']['rows_verified'], 30)
+
+    def test_detects_tampered_data(self):
+        self.db.query("UPDATE immutable_audit_log SET data = %s WHERE id = 7", (json.dumps({'amount': 1e9}),))
+        summary = self.verifier().verify()
+        self.assertEqual(summary['mismatches'], 1)
+        self.assertEqual(
+            self.db.query("SELECT audit_id, reason FROM audit_verification_failures"),
+            [(7, 'data_tampered')]
+        )
+
+    def test_full_run_detects_rewritten_history(self):
+        self.verifier().verify()
+        self.assertTrue(self.verifier().verify(full=True)['chain_intact'])
+
+        self.db.query("DELETE FROM immutable_audit_log WHERE id = 3")
+        self.assertFalse(self.verifier().verify(full=True)['chain_intact'])
+
+    def test_late_committed_row_is_verified(self):
+        # Id 28 was assigned before 29 and 30 but commits after them
+        self.insert(26, 30, skip={28})
+        first = self.verifier().verify()
+        self.assertEqual(first['rows_checked'], 29)
+        self.assertEqual(first['checkpoint']['gaps'], [28])
+
+        self.db.query("UPDATE immutable_audit_log SET data = 'tampered' WHERE id = 27")
+        self.insert(28, 28)
+        second = self.verifier().verify()
+        self.assertEqual(second['rows_checked'], 1)
+        self.assertEqual(second['checkpoint']['gaps'], [])
+        self.assertEqual(second['checkpoint']['rows_verified'], 30)
+        self.assertEqual(self.verifier().verify()['rows_checked'], 0)
+
+        # The late row joins the chain as if it had been verified in order
+        self.db.query("UPDATE immutable_audit_log SET data = %s WHERE id = 27", (json.dumps({'amount': 27}),))
+        self.assertTrue(self.verifier().verify(full=True)['chain_intact'])
+
+    def test_gaps_expire_after_window(self):
+        self.insert(26, 40, skip={26})
+        verifier = AuditVerifier(self.db, batch_size=10, workers=2, config_hash=CONFIG_HASH, gap_window=5)
+        self.assertEqual(verifier.verify()['checkpoint']['gaps'], [])
+
+    def test_full_reruns_do_not_duplicate_failures(self):
+        self.db.query("UPDATE immutable_audit_log SET data = 'tampered' WHERE id = 7")
+        self.verifier().verify()
+        self.verifier().verify(full=True)
+        self.verifier().verify(full=True)
+        self.assertEqual(
+            self.db.query("SELECT audit_id, reason FROM audit_verification_failures"),
+            [(7, 'data_tampered')]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
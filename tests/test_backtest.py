@@ -0,0 +1,130 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.backtest import BacktestError, MarketData
+from agent.core.executor import StrategyExecutor
+from agent.strategies import YieldHarvester
+from agent.strategies.base_strategy import BaseStrategy
+
+
+class BuyThenSell(BaseStrategy):
+    """Buys 1 SOL on bar 1, sells it on bar 3, tries an oversized buy on bar 4."""
+
+    def __init__(self):
+        super().__init__('buy_then_sell', {})
+        self.seen = []
+
+    async def generate_signal(self):
+        self.seen.append(self.market.price('SOL'))
+        if self.market.index == 1:
+            return {'type': 'buy', 'asset': 'SOL', 'amount': 1.0, 'slippage': 0.0}
+        if self.market.index == 3:
+            return {'type': 'sell', 'asset': 'SOL', 'amount': 1.0, 'slippage': 0.0}
+        if self.market.index == 4:
+            return {'type': 'buy', 'asset': 'SOL', 'amount': 1.0, 'size': 0.5}
+        return {'type': 'hold'}
+
+
+class BatchBuyThenSell(BuyThenSell):
+
+    def generate_signals(self, market):
+        side = np.zeros(len(market), dtype=np.int8)
+        side[[1, 3, 4]] = [1, -1, 1]
+        return {
+            'side': side,
+            'asset': np.zeros(len(market), dtype=np.int64),
+            'amount': np.ones(len(market)),
+            'size': np.where(np.arange(len(market)) == 4, 0.5, 0.0),
+            'slippage': np.zeros(len(market))
+        }
+
+
+class AwaitsIO(BaseStrategy):
+
+    def __init__(self):
+        super().__init__('awaits_io', {})
+
+    async def generate_signal(self):
+        import asyncio
+        await asyncio.sleep(0)
+        return {'type': 'hold'}
+
+
+class CycleTrader(BaseStrategy):
+    """Routes 10% of the portfolio through a 1% SOL cycle on bar 2, and an oversized one on bar 3."""
+
+    def __init__(self):
+        super().__init__('cycle_trader', {})
+
+    async def generate_signal(self):
+        if self.market.index in (2, 3):
+            size = 0.1 if self.market.index == 2 else 0.5
+            return {'type': 'arbitrage', 'asset': 'SOL', 'size': size,
+                    'expected_return': 0.01, 'slippage': 0.0}
+        return {'type': 'hold'}
+
+
+def market():
+    close = np.array([[100.0, 10.0], [100.0, 10.0], [95.0, 11.0], [120.0, 12.0], [90.0, 9.0], [95.0, 9.5]])
+    return MarketData(np.arange(6) * 60, ['SOL', 'ETH'], {'close': close})
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = StrategyExecutor()
+
+    def test_replays_bars_and_reports_fills(self):
+        strategy = BuyThenSell()
+        report = self.executor.backtest({'bts': strategy}, market(), initial_capital=1000.0, fee_rate=0.0)
+        stats = report['strategies']['bts']
+
+        self.assertEqual(strategy.seen, [100.0, 100.0, 95.0, 120.0, 90.0, 95.0])
+        self.assertAlmostEqual(stats['pnl'], 20.0)
+        self.assertEqual(stats['fills'], 2)
+        self.assertEqual(stats['rejected'], {'max_position_size_exceeded': 1})
+        self.assertAlmostEqual(stats['turnover'], 220.0)
+        self.assertEqual(strategy.market, None)
+
+    def test_batch_signals_match_bar_replay(self):
+        replayed = self.executor.backtest({'s': BuyThenSell()}, market())
+        batched = self.executor.backtest({'s': BatchBuyThenSell()}, market())
+        self.assertEqual(replayed['strategies'], batched['strategies'])
+
+    def test_arbitrage_round_trips_fill_without_positions(self):
+        report = self.executor.backtest({'arb': CycleTrader()}, market(), initial_capital=1000.0, fee_rate=0.0)
+        stats = report['strategies']['arb']
+        self.assertEqual(stats['fills'], 1)
+        self.assertEqual(stats['rejected'], {'max_position_size_exceeded': 1})
+        # 1% on 100 routed, unaffected by SOL's later moves
+        self.assertAlmostEqual(stats['pnl'], 1.0)
+        self.assertAlmostEqual(stats['turnover'], 100.0)
+
+    def test_drawdown_and_hold_only_strategies(self):
+        report = self.executor.backtest({'yield': YieldHarvester(), 'bts': BuyThenSell()}, market(), fee_rate=0.0)
+        self.assertEqual(report['strategies']['yield']['pnl'], 0.0)
+        self.assertEqual(report['strategies']['yield']['max_drawdown'], 0.0)
+        self.assertAlmostEqual(report['strategies']['bts']['max_drawdown'], 0.0005)
+        self.assertAlmostEqual(report['portfolio']['pnl'], 20.0)
+
+    def test_loads_npz_snapshot(self):
+        data = market()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'bars.npz')
+            np.savez(path, timestamp=data.timestamps, assets=np.array(data.assets), close=data.close)
+            report = self.executor.backtest({'bts': BuyThenSell()}, path, fee_rate=0.0)
+        self.assertAlmostEqual(report['strategies']['bts']['pnl'], 20.0)
+
+    def test_rejects_strategies_that_await_io(self):
+        with self.assertRaises(BacktestError):
+            self.executor.backtest({'io': AwaitsIO()}, market())
+
+
+if __name__ == '__main__':
+    unittest.main()
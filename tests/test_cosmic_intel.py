@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cosmic_intel import CosmicIntel, FeedState
+
+
+def rss(*titles):
+    items = ''.join(
+        f'<item><title>{title}</title><link>https://example.com/{title}</link>'
+        f'<guid>{title}</guid><description>{title} summary</description></item>'
+        for title in titles
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'
+
+
+class FeedServer:
+    """Serves RSS feeds by path with ETags and records the request headers it saw."""
+
+    def __init__(self, feeds):
+        self.feeds = feeds
+        self.requests = []
+        app = web.Application()
+        app.router.add_get('/{name}', self.handle)
+        self.server = TestServer(app)
+
+    async def handle(self, request):
+        name = request.match_info['name']
+        self.requests.append((name, dict(request.headers)))
+        feed = self.feeds[name]
+        if isinstance(feed, int):
+            return web.Response(status=feed)
+        if isinstance(feed, float):
+            await asyncio.sleep(feed)
+            feed = rss(name)
+        etag = '"%s"' % hashlib.md5(feed.encode()).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304)
+        return web.Response(text=feed, content_type='application/rss+xml', headers={'ETag': etag})
+
+    def url(self, name):
+        return str(self.server.make_url(f'/{name}'))
+
+
+class CosmicIntelTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    async def start(self, feeds):
+        server = FeedServer(feeds)
+        await server.server.start_server()
+        self.addAsyncCleanup(server.server.close)
+        return server
+
+    def intel(self, sources, **options):
+        config_path = os.path.join(self.tmp.name, 'allowlists.json')
+        with open(config_path, 'w') as f:
+            json.dump({'sources': sources}, f)
+        options.setdefault('state_path', None)
+        intel = CosmicIntel(config_path, **options)
+        self.addAsyncCleanup(intel.close)
+        return intel
+
+
+class TestConcurrentFetch(CosmicIntelTestCase):
+
+    async def test_results_follow_allowlist_order(self):
+        # The first source answers last
+        server = await self.start({'slow': 0.1, 'fast': rss('f1', 'f2')})
+        intel = self.intel([server.url('slow'), server.url('fast')])
+        entries = await intel.gather_intel()
+        self.assertEqual([e['title'] for e in entries], ['slow', 'f1', 'f2'])
+
+    async def test_failing_sources_do_not_affect_others(self):
+        server = await self.start({'ok': rss('a'), 'down': 500, 'garbage': 'not a feed', 'hang': 5.0})
+        intel = self.intel(
+            [server.url('ok'), server.url('down'), 'http://127.0.0.1:1/refused',
+             server.url('hang'), server.url('garbage')],
+            timeout=0.2
+        )
+        entries = await intel.gather_intel()
+        self.assertEqual([e['title'] for e in entries], ['a'])
+
+    async def test_sources_are_fetched_concurrently(self):
+        server = await self.start({f'feed{i}': 0.2 for i in range(5)})
+        intel = self.intel([server.url(f'feed{i}') for i in range(5)], limit_per_host=5)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        entries = await intel.gather_intel()
+        self.assertEqual(len(entries), 5)
+        self.assertLess(loop.time() - started, 0.8)
+
+    def test_bare_allowlist_entries_get_https(self):
+        intel = self.intel(['example.com/feed', 'http://example.org/rss'])
+        self.assertEqual(intel.sources, ['https://example.com/feed', 'http://example.org/rss'])
+
+
+class TestConditionalFetch(CosmicIntelTestCase):
+
+    async def test_unchanged_feed_answers_304_and_yields_nothing(self):
+        server = await self.start({'feed': rss('a', 'b')})
+        state_path = os.path.join(self.tmp.name, 'state.json')
+        intel = self.intel([server.url('feed')], state_path=state_path)
+        self.assertEqual(len(await intel.gather_intel()), 2)
+
+        # A new process reads the validators back from disk
+        intel = self.intel([server.url('feed')], state_path=state_path)
+        self.assertEqual(await intel.gather_intel(), [])
+        headers = server.requests[-1][1]
+        self.assertEqual(headers['If-None-Match'], intel.state.validators[server.url('feed')]['etag'])
+
+        server.feeds['feed'] = rss('a', 'b', 'c')
+        self.assertEqual([e['title'] for e in await intel.gather_intel()], ['c'])
+
+    async def test_unparseable_response_does_not_pin_validators(self):
+        server = await self.start({'feed': 'truncated <rss'})
+        intel = self.intel([server.url('feed')])
+        self.assertEqual(await intel.gather_intel(), [])
+        self.assertNotIn(server.url('feed'), intel.state.validators)
+
+        await intel.gather_intel()
+        self.assertNotIn('If-None-Match', server.requests[-1][1])
+
+    async def test_304_refreshes_the_feed_entries(self):
+        server = await self.start({'feed': rss('a')})
+        intel = self.intel([server.url('feed')])
+        await intel.gather_intel()
+        key = next(iter(intel.state.seen))
+        intel.state.seen[key] = 0.0
+        self.assertEqual(await intel.gather_intel(), [])
+        self.assertGreater(intel.state.seen[key], 0.0)
+
+
+class TestFeedState(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'state', 'feeds.json')
+
+    def test_filter_new_marks_and_refreshes(self):
+        state = FeedState(self.path)
+        entries = [{'id': 'a'}, {'id': 'b'}, {'id': 'a'}]
+        self.assertEqual(state.filter_new(entries, now=1.0), [{'id': 'a'}, {'id': 'b'}])
+        self.assertEqual(state.filter_new([{'id': 'b'}, {'id': 'c'}], now=2.0), [{'id': 'c'}])
+        self.assertEqual(state.seen, {'a': 1.0, 'b': 2.0, 'c': 2.0})
+
+    def test_save_prunes_entries_not_seen_within_ttl(self):
+        state = FeedState(self.path, seen_ttl=10)
+        state.filter_new([{'id': 'old'}, {'id': 'kept'}], now=0.0)
+        state.filter_new([{'id': 'kept'}], now=5.0)
+        state.update_validators('https://x/feed', '"v1"', None, [{'id': 'kept'}])
+        state.save(now=12.0)
+
+        loaded = FeedState(self.path, seen_ttl=10)
+        self.assertEqual(loaded.seen, {'kept': 5.0})
+        self.assertEqual(loaded.request_headers('https://x/feed'), {'If-None-Match': '"v1"'})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ['feeds.json'])
+
+    def test_unreadable_state_starts_empty(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+        state = FeedState(self.path)
+        self.assertEqual((state.validators, state.seen), ({}, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
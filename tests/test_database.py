@@ -1,6 +1,13 @@
+import os
+import tempfile
+import threading
 import unittest
-from database.connection import db
+from database.connection import db, Database
 
+POSTGRES_CONFIGURED = db.backend == 'postgres' and bool(os.environ.get('POSTGRES_HOST'))
+
+
+@unittest.skipUnless(POSTGRES_CONFIGURED, 'PostgreSQL server not configured')
 class TestDatabase(unittest.TestCase):
 
     def test_connection(self):
@@ -30,5 +37,117 @@ class TestDatabase(unittest.TestCase):
         self.assertIn('mutation_logs', tables)
         self.assertIn('immutable_audit_log', tables)
 
+
+class TestSQLiteDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = Database(maxconn=2, checkout_timeout=1, backend='sqlite')
+        self.db.query(
+            "CREATE TABLE sweeps (transaction_hash TEXT, chain TEXT, amount REAL, "
+            "from_address TEXT, to_address TEXT, status TEXT DEFAULT 'pending')"
+        )
+
+    def tearDown(self):
+        self.db.close_all_connections()
+
+    def test_pool_is_lazy(self):
+        lazy = Database(backend='sqlite')
+        self.assertIsNone(lazy._pool)
+
+    def test_bulk_insert_keeps_defaults(self):
+        rows = [
+            {'transaction_hash': f'tx{i}', 'chain': 'solana', 'amount': i,
+             'from_address': 'a', 'to_address': 'b'}
+            for i in range(100)
+        ]
+        self.db.bulk_insert_sweeps(rows[:50])
+        self.db.bulk_insert_sweeps(rows[50:], use_copy=True)
+        res = self.db.query("SELECT COUNT(*) FROM sweeps WHERE status = %s", ('pending',))
+        self.assertEqual(res[0][0], 100)
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.db.transaction() as cursor:
+                cursor.execute("INSERT INTO sweeps (transaction_hash) VALUES ('x')")
+                raise ValueError
+        self.assertEqual(self.db.query("SELECT COUNT(*) FROM sweeps")[0][0], 0)
+
+    def test_exhaustion_is_counted(self):
+        checkouts = self.db.pool_metrics()['checkouts']
+        held = [self.db.get_connection(), self.db.get_connection()]
+        timer = threading.Timer(0.05, self.db.release_connection, args=(held.pop(),))
+        timer.start()
+        conn = self.db.get_connection()
+        self.db.release_connection(conn)
+        self.db.release_connection(held.pop())
+        timer.join()
+
+        metrics = self.db.pool_metrics()
+        self.assertEqual(metrics['exhaustion_events'], 1)
+        self.assertEqual(metrics['checkouts'], checkouts + 3)
+        self.assertEqual(metrics['in_use'], 0)
+
+
+class TestMigrationRunner(unittest.TestCase):
+
+    def setUp(self):
+        from database.run_migrations import run_migrations
+        self.run_migrations = run_migrations
+        self.db = Database(backend='sqlite')
+        self.dir = tempfile.TemporaryDirectory()
+        self.write('001_first.sql', 'CREATE TABLE first (id INTEGER)')
+        self.write('002_second.sql', 'CREATE TABLE second (id INTEGER)')
+
+    def tearDown(self):
+        self.db.close_all_connections()
+        self.dir.cleanup()
+
+    def write(self, filename, sql):
+        with open(os.path.join(self.dir.name, filename), 'w') as f:
+            f.write(sql)
+
+    def statuses(self, **kwargs):
+        results = self.run_migrations(migrations_dir=self.dir.name, database=self.db, **kwargs)
+        return [r['status'] for r in results]
+
+    def test_applies_only_pending_migrations(self):
+        self.assertEqual(self.statuses(dry_run=True), ['pending', 'pending'])
+        self.assertEqual(self.statuses(), ['migrated', 'migrated'])
+        self.write('003_third.sql', 'CREATE TABLE third (id INTEGER)')
+        self.assertEqual(self.statuses(), ['applied', 'applied', 'migrated'])
+
+    def test_failed_migration_is_not_recorded(self):
+        self.write('002_second.sql', 'CREATE TABLE broken (')
+        with self.assertRaises(Exception):
+            self.statuses()
+        self.assertEqual(self.db.query('SELECT version FROM schema_migrations'), [('001',)])
+
+    def test_multi_statement_migration_on_sqlite(self):
+        self.write('003_third.sql', (
+            '-- two tables and a seed row\n'
+            'CREATE TABLE third (id INTEGER);\n'
+            'CREATE TABLE fourth (id INTEGER);\n'
+            'INSERT INTO third (id) VALUES (1);\n'
+        ))
+        self.assertEqual(self.statuses(), ['migrated'] * 3)
+        self.assertEqual(self.db.query('SELECT id FROM third'), [(1,)])
+        self.assertEqual(self.db.query('SELECT id FROM fourth'), [])
+
+    def test_failed_multi_statement_migration_rolls_back(self):
+        self.write('002_second.sql', 'CREATE TABLE second (id INTEGER);\nCREATE TABLE broken (;')
+        with self.assertRaises(Exception):
+            self.statuses()
+        tables = self.db.query("SELECT name FROM sqlite_master WHERE type = 'table'")
+        self.assertNotIn(('second',), tables)
+        self.assertEqual(self.db.query('SELECT version FROM schema_migrations'), [('001',)])
+
+    def test_edited_migration_is_rejected(self):
+        from database.run_migrations import MigrationChecksumError
+        self.statuses()
+        self.write('001_first.sql', 'CREATE TABLE first (id INTEGER, name TEXT)')
+        with self.assertRaises(MigrationChecksumError):
+            self.statuses()
+
+
 if __name__ == '__main__':
     unittest.main()
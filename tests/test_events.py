@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from aiohttp.test_utils import TestClient, TestServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.agent import CryptoGeneOmega
+from agent.core.events import Event, EventBus, HeliusWebhookSource, ReplaySource
+from agent.strategies import BaseStrategy
+
+
+class SwapFollower(BaseStrategy):
+    """Buys the output mint of every SWAP event."""
+    event_types = ('SWAP',)
+
+    def __init__(self):
+        super().__init__('swap_follower', {})
+        self.seen = []
+
+    async def generate_signal(self):
+        return {'type': 'hold'}
+
+    async def on_event(self, event):
+        self.seen.append(event.payload['i'])
+        return {'type': 'buy', 'asset': event.payload['mint'], 'amount': 1, 'price': 1.0}
+
+
+class MemoryDatabase:
+
+    def __init__(self):
+        self.logged = []
+        self.snapshots = 0
+        self.belief_reads = 0
+
+    async def get_strategy_snapshot(self, names):
+        self.snapshots += 1
+        return {name: {'enabled': True, 'belief_score': 0.7} for name in names}
+
+    async def get_belief_score(self, strategy_name):
+        self.belief_reads += 1
+        return 0.7
+
+    async def log_execution(self, strategy_name, result):
+        self.logged.append((strategy_name, result))
+
+
+def swap(i, mint='SOL'):
+    return Event('SWAP', {'i': i, 'mint': mint}, timestamp=float(i))
+
+
+class TestEventBus(unittest.IsolatedAsyncioTestCase):
+
+    async def test_per_subscriber_order_and_filtering(self):
+        bus = EventBus(queue_size=4)
+        seen = {'all': [], 'swaps': []}
+
+        async def record(name, event):
+            seen[name].append(event.payload['i'])
+
+        bus.subscribe('all', lambda e: record('all', e))
+        bus.subscribe('swaps', lambda e: record('swaps', e), event_types=['SWAP'])
+        bus.start()
+        for i in range(20):
+            await bus.publish(swap(i) if i % 2 else Event('TRANSFER', {'i': i}))
+        await bus.stop()
+        self.assertEqual(seen['all'], list(range(20)))
+        self.assertEqual(seen['swaps'], list(range(1, 20, 2)))
+
+    async def test_publish_blocks_when_queue_full(self):
+        bus = EventBus(queue_size=2)
+        release = asyncio.Event()
+
+        async def slow(event):
+            await release.wait()
+
+        bus.subscribe('slow', slow)
+        bus.start()
+        # One event in the handler plus two queued fill the subscriber
+        for i in range(3):
+            await bus.publish(swap(i))
+            await asyncio.sleep(0)
+        blocked = asyncio.create_task(bus.publish(swap(3)))
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked.done())
+        release.set()
+        await asyncio.wait_for(blocked, 1.0)
+        await bus.stop()
+        self.assertEqual(bus.stats()['subscribers']['slow']['delivered'], 4)
+
+    async def test_drop_oldest(self):
+        bus = EventBus(queue_size=2, overflow='drop_oldest')
+        seen = []
+
+        async def record(event):
+            seen.append(event.payload['i'])
+
+        bus.subscribe('sub', record)
+        # Not started: the queue only holds the newest two events
+        for i in range(5):
+            await bus.publish(swap(i))
+        bus.start()
+        await bus.stop()
+        self.assertEqual(seen, [3, 4])
+        self.assertEqual(bus.stats()['subscribers']['sub']['dropped'], 3)
+
+    async def test_batch_is_queued_all_or_nothing(self):
+        bus = EventBus(queue_size=3)
+        seen = []
+
+        async def record(event):
+            seen.append(event.payload['i'])
+
+        bus.subscribe('sub', record)
+        await bus.publish(swap(0))
+        await bus.publish(swap(1))
+        # Not started: one free slot cannot take a batch of two
+        self.assertFalse(await bus.publish_batch([swap(2), swap(3)], timeout=0.01))
+        self.assertEqual(bus.stats()['subscribers']['sub']['queue_depth'], 2)
+        # Room freed by the worker lets a waiting batch through
+        pending = asyncio.create_task(bus.publish_batch([swap(2), swap(3)], timeout=1.0))
+        bus.start()
+        self.assertTrue(await pending)
+        await bus.stop()
+        self.assertEqual(seen, [0, 1, 2, 3])
+        with self.assertRaises(ValueError):
+            await bus.publish_batch([swap(i) for i in range(4)])
+
+    async def test_handler_errors_are_counted_not_fatal(self):
+        bus = EventBus()
+        seen = []
+
+        async def flaky(event):
+            if event.payload['i'] == 1:
+                raise ValueError('boom')
+            seen.append(event.payload['i'])
+
+        bus.subscribe('flaky', flaky)
+        bus.start()
+        for i in range(3):
+            await bus.publish(swap(i))
+        await bus.stop()
+        self.assertEqual(seen, [0, 2])
+        self.assertEqual(bus.stats()['subscribers']['flaky']['errors'], 1)
+
+
+class TestEventDrivenAgent(unittest.IsolatedAsyncioTestCase):
+
+    async def test_replay_executes_signals_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'events.jsonl')
+            with open(path, 'w') as f:
+                for i in range(5):
+                    record = {'type': 'SWAP' if i != 2 else 'TRANSFER',
+                              'payload': {'i': i, 'mint': 'SOL'}, 'timestamp': i}
+                    f.write(json.dumps(record) + '\n')
+
+            agent = CryptoGeneOmega(evolution_workers=1)
+            agent.database = MemoryDatabase()
+            follower = SwapFollower()
+            agent.strategies = {'follower': follower, 'belief': agent.strategies['belief']}
+            stats = await agent.run_event_driven([ReplaySource(path)], queue_size=2)
+
+        self.assertEqual(follower.seen, [0, 1, 3, 4])
+        self.assertEqual(list(stats['subscribers']), ['follower'])
+        self.assertEqual(len(agent.database.logged), 4)
+        self.assertTrue(all(result['success'] for _, result in agent.database.logged))
+        # Beliefs come from the startup snapshot, not one read per signal
+        self.assertEqual((agent.database.snapshots, agent.database.belief_reads), (1, 0))
+
+    async def test_belief_snapshot_is_reread_after_the_refresh_interval(self):
+        agent = CryptoGeneOmega(evolution_workers=1)
+        agent.database = MemoryDatabase()
+        agent.belief_refresh_interval = 0.0
+        follower = SwapFollower()
+        agent.strategies = {'follower': follower}
+        signal = await follower.on_event(swap(0))
+        await agent._execute_event_signal('follower', follower, signal)
+        await agent._execute_event_signal('follower', follower, signal)
+        self.assertEqual((agent.database.snapshots, agent.database.belief_reads), (2, 0))
+
+        async def snapshot_down(names):
+            raise ConnectionError('db unavailable')
+
+        agent.database.get_strategy_snapshot = snapshot_down
+        await agent._execute_event_signal('follower', follower, signal)
+        self.assertEqual(len(agent.database.logged), 3)
+        self.assertTrue(all(result['success'] for _, result in agent.database.logged))
+
+    async def test_saturated_bus_rejects_whole_webhook_batch(self):
+        bus = EventBus(queue_size=2)
+        seen = []
+
+        async def record(event):
+            seen.append(event.payload['signature'])
+
+        bus.subscribe('sub', record, event_types=['SWAP'])
+        source = HeliusWebhookSource(publish_timeout=0.01)
+        batch = [{'type': 'SWAP', 'signature': 'a'}, {'type': 'SWAP', 'signature': 'b'}]
+        async with TestClient(TestServer(source.build_app(bus))) as client:
+            await bus.publish(Event('SWAP', {'signature': 'queued'}))
+            response = await client.post(source.path, json=batch)
+            self.assertEqual(response.status, 503)
+            self.assertEqual(bus.stats()['subscribers']['sub']['delivered'], 1)
+
+            # Helius resends the same batch once the bus has drained
+            bus.start()
+            await bus.subscriptions['sub'].queue.join()
+            response = await client.post(source.path, json=batch)
+            self.assertEqual(response.status, 200)
+            self.assertEqual(await response.json(), {'accepted': 2})
+
+            response = await client.post(source.path, json=batch * 2)
+            self.assertEqual(response.status, 413)
+        await bus.stop()
+        self.assertEqual(seen, ['queued', 'a', 'b'])
+
+    def test_helius_payload_to_events(self):
+        body = [
+            {'type': 'SWAP', 'timestamp': 1700000000, 'signature': 'a'},
+            {'signature': 'b'},
+            'garbage'
+        ]
+        events = HeliusWebhookSource.to_events(body)
+        self.assertEqual([e.type for e in events], ['SWAP', 'UNKNOWN'])
+        self.assertEqual(events[0].timestamp, 1700000000.0)
+        self.assertEqual(events[0].source, 'helius')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.intelligence.fitness_cache import FitnessCache
+from agent.intelligence.fitness_pool import ParallelFitnessEvaluator
+from agent.intelligence.genetic_algorithm import GeneticAlgorithm, evaluate_population
+from agent.strategies import ArbitrageHunter, YieldHarvester
+
+
+def make_performance(names, rows=336, seed=1):
+    # Executions expecting less than 0.4% lose money on average
+    rng = np.random.default_rng(seed)
+    performance = []
+    for name in names:
+        for i in range(rows):
+            expected = float(rng.uniform(0.0, 0.01))
+            performance.append({
+                'strategy': name, 'timestamp': f'{i:05d}', 'success': True,
+                'profit_loss': expected - 0.004 + float(rng.normal(0.0, 0.002)),
+                'result': {'expected_return': expected}
+            })
+    return performance
+
+
+class TestGeneticAlgorithm(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.strategies = {'arbitrage': ArbitrageHunter(), 'arbitrage_b': ArbitrageHunter()}
+
+    async def test_evolves_only_declared_parameters_with_data(self):
+        strategies = dict(self.strategies, yield_harvester=YieldHarvester())
+        ga = GeneticAlgorithm(seed=3)
+        evolved = await ga.evolve(strategies, make_performance(['arbitrage', 'yield_harvester']), 10, 200)
+
+        self.assertEqual(list(evolved), ['arbitrage'])
+        result = evolved['arbitrage']
+        self.assertGreater(result['fitness_improvement'], 0)
+        self.assertEqual(set(result['parameters']), {'min_profit'})
+        self.assertGreater(result['parameters']['min_profit'], 0.002)
+        self.assertLess(result['parameters']['min_profit'], 0.006)
+
+    async def test_identical_rows_leave_parameters_unchanged(self):
+        performance = [
+            {'strategy': 'arbitrage', 'timestamp': f'{i:05d}', 'profit_loss': 1.0,
+             'result': {'expected_return': 0.01}}
+            for i in range(50)
+        ]
+        evolved = await GeneticAlgorithm(seed=3).evolve(self.strategies, performance, 5, 200)
+        self.assertEqual(evolved['arbitrage']['fitness_improvement'], 0)
+
+    async def test_deterministic_under_seed(self):
+        performance = make_performance(self.strategies)
+        first = await GeneticAlgorithm(seed=11).evolve(self.strategies, performance, 5, 500)
+        second = await GeneticAlgorithm(seed=11).evolve(self.strategies, performance, 5, 500)
+        self.assertEqual(first, second)
+
+    async def test_process_pool_matches_in_process(self):
+        performance = make_performance(self.strategies)
+        serial = await GeneticAlgorithm(seed=11).evolve(self.strategies, performance, 3, 1200)
+        evaluator = ParallelFitnessEvaluator(workers=2, min_chunk=100)
+        parallel = await GeneticAlgorithm(seed=11, evaluator=evaluator).evolve(self.strategies, performance, 3, 1200)
+        self.assertEqual(serial, parallel)
+
+    async def test_cache_preserves_results_and_reports_hits(self):
+        performance = make_performance(self.strategies)
+        uncached = await GeneticAlgorithm(seed=11).evolve(self.strategies, performance, 5, 500)
+        ga = GeneticAlgorithm(seed=11, cache=FitnessCache())
+        cached = await ga.evolve(self.strategies, performance, 5, 500)
+
+        self.assertEqual(uncached, cached)
+        self.assertGreater(ga.last_cache_stats['hit_rate'], 0.2)
+
+    def test_cache_lru_and_persistence(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'fitness.pkl')
+            cache = FitnessCache(max_entries=2, path=path)
+            window = cache.fingerprint(np.arange(3.0), ['min_profit'])
+            calls = []
+
+            def score(values):
+                calls.append(len(values))
+                return values[:, 0] * 2
+
+            cache.evaluate(window, np.array([[1.0], [2.0], [1.0]]), score)
+            cache.evaluate(window, np.array([[3.0]]), score)
+            self.assertEqual(calls, [2, 1])
+            self.assertEqual(cache.stats()['entries'], 2)
+            cache.save()
+
+            reloaded = FitnessCache(max_entries=2, path=path)
+            scores = reloaded.evaluate(window, np.array([[2.0], [3.0], [1.0]]), score)
+            np.testing.assert_array_equal(scores, [4.0, 6.0, 2.0])
+            # 1.0 was evicted as least recently used
+            self.assertEqual(calls, [2, 1, 1])
+            self.assertEqual(reloaded.hits, 2)
+
+    def test_sharpe_of_executions_above_min_profit(self):
+        returns = np.array([[1.0, np.inf], [-1.0, 0.0], [3.0, 0.02]])
+        values = np.array([[0.0], [0.01]])
+        scores = evaluate_population(values, ['min_profit'], returns)
+        # All taken: P&L 1, -1, 3; gated at 0.01: 1, 0, 3
+        np.testing.assert_allclose(scores, [1 / np.sqrt(8 / 3), (4 / 3) / np.sqrt(14 / 9)])
+
+        scaled = returns * [10.0, 1.0]
+        np.testing.assert_allclose(evaluate_population(values, ['min_profit'], scaled), scores)
+
+    async def test_population_is_scored_in_one_call_per_generation(self):
+        performance = make_performance(self.strategies)
+        sizes = []
+
+        def counting(values, *args):
+            sizes.append(len(values))
+            return evaluate_population(values, *args)
+
+        with mock.patch('agent.intelligence.genetic_algorithm.evaluate_population', counting):
+            result = await GeneticAlgorithm(seed=5).evolve(self.strategies, performance, 5, 5000)
+        # Per strategy: the baseline, the initial population, 5 generations
+        self.assertEqual(len(sizes), len(result) * 7)
+        self.assertEqual(sizes.count(5000), len(result) * 6)
+
+if __name__ == '__main__':
+    unittest.main()
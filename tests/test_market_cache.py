@@ -0,0 +1,184 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.agent import CryptoGeneOmega
+from agent.core.events import Event, ReplaySource
+from agent.core.market_cache import MarketDataCache
+from agent.strategies import BaseStrategy
+
+
+class Upstream:
+    """Counts calls to a slow price endpoint."""
+
+    def __init__(self, delay=0.01, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def price(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError('upstream down')
+        return 150.0 + self.calls
+
+
+class PriceReader(BaseStrategy):
+
+    def __init__(self, name, upstream):
+        super().__init__(name, {})
+        self.upstream = upstream
+
+    async def generate_signal(self):
+        price = await self.fetch(('price', 'SOL'), self.upstream.price)
+        return {'type': 'hold', 'price': price}
+
+
+class EventPriceReader(PriceReader):
+    event_types = ('SWAP',)
+
+    async def on_event(self, event):
+        return await self.generate_signal()
+
+
+class MemoryDatabase:
+
+    async def get_portfolio_value(self):
+        return None
+
+    async def get_strategy_snapshot(self, names):
+        return {name: {'enabled': True} for name in names}
+
+
+class TestMarketDataCache(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_requests_coalesce(self):
+        cache = MarketDataCache()
+        upstream = Upstream()
+        values = await asyncio.gather(
+            *(cache.get(('price', 'SOL'), upstream.price) for _ in range(10))
+        )
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(set(values), {151.0})
+        self.assertEqual(await cache.get(('price', 'SOL'), upstream.price), 151.0)
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['coalesced'], stats['hits']), (1, 9, 1))
+        self.assertEqual(stats['in_flight'], 0)
+
+    async def test_entries_expire_each_cycle_unless_ttl(self):
+        now = [0.0]
+        cache = MarketDataCache(clock=lambda: now[0])
+        upstream = Upstream(delay=0)
+        await cache.get('cycle', upstream.price)
+        await cache.get('pool', upstream.price, ttl=30)
+        cache.new_cycle()
+        await cache.get('cycle', upstream.price)
+        await cache.get('pool', upstream.price)
+        self.assertEqual(upstream.calls, 3)
+        now[0] = 31.0
+        await cache.get('pool', upstream.price)
+        self.assertEqual(upstream.calls, 4)
+
+    async def test_counters_cover_the_current_cycle(self):
+        cache = MarketDataCache()
+        upstream = Upstream(delay=0)
+        for _ in range(3):
+            await cache.get('k', upstream.price)
+        cache.new_cycle()
+        await cache.get('k', upstream.price)
+        stats = cache.stats()
+        self.assertEqual((stats['cycle'], stats['misses'], stats['hits']), (1, 1, 0))
+
+    async def test_time_boundary_cycles(self):
+        now = [0.0]
+        cache = MarketDataCache(clock=lambda: now[0])
+        upstream = Upstream(delay=0)
+        for step in range(10):
+            now[0] = step * 0.3
+            cache.new_cycle_after(1.0)
+            await cache.get('k', upstream.price)
+        # Cycles start at 0.0, 1.2 and 2.4
+        self.assertEqual((cache.cycle, upstream.calls), (2, 3))
+
+    async def test_fetch_spanning_a_cycle_does_not_serve_the_next(self):
+        cache = MarketDataCache()
+        slow, fast = Upstream(delay=0.05), Upstream(delay=0)
+        old = asyncio.create_task(cache.get('k', slow.price))
+        await asyncio.sleep(0)
+        cache.new_cycle()
+        self.assertEqual(await cache.get('k', fast.price), 151.0)
+        self.assertEqual(await old, 151.0)
+        self.assertEqual((slow.calls, fast.calls), (1, 1))
+        # The slow fetch finished last but neither replaced the newer entry
+        # nor carried over into the cycle after
+        self.assertEqual(await cache.get('k', slow.price), 151.0)
+        self.assertEqual(cache.stats()['hits'], 1)
+        cache.new_cycle()
+        await cache.get('k', slow.price)
+        self.assertEqual(slow.calls, 2)
+
+    async def test_ttl_fetch_in_flight_is_kept_across_cycles(self):
+        cache = MarketDataCache()
+        upstream = Upstream(delay=0.02)
+        first = asyncio.create_task(cache.get('k', upstream.price, ttl=30))
+        await asyncio.sleep(0)
+        cache.new_cycle()
+        self.assertEqual(await cache.get('k', upstream.price, ttl=30), await first)
+        self.assertEqual(upstream.calls, 1)
+
+    async def test_failures_are_shared_but_not_cached(self):
+        cache = MarketDataCache()
+        upstream = Upstream(fail=True)
+        results = await asyncio.gather(
+            *(cache.get('k', upstream.price) for _ in range(3)), return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertEqual(upstream.calls, 1)
+        upstream.fail = False
+        self.assertEqual(await cache.get('k', upstream.price), 152.0)
+        self.assertEqual(cache.errors, 1)
+
+    async def test_cancelled_waiter_does_not_cancel_fetch(self):
+        cache = MarketDataCache()
+        upstream = Upstream(delay=0.05)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(cache.get('k', upstream.price), 0.01)
+        self.assertEqual(await cache.get('k', upstream.price), 151.0)
+        self.assertEqual(upstream.calls, 1)
+
+    async def test_agent_strategies_share_one_call_per_cycle(self):
+        agent = CryptoGeneOmega(evolution_workers=1)
+        upstream = Upstream()
+        readers = [PriceReader(f'reader{i}', upstream) for i in range(5)]
+        for reader in readers:
+            reader.market_data = agent.market_data
+        for cycle in range(3):
+            agent.market_data.new_cycle()
+            await asyncio.gather(*(reader.generate_signal() for reader in readers))
+        self.assertEqual(upstream.calls, 3)
+
+    async def test_event_mode_shares_data_within_interval(self):
+        agent = CryptoGeneOmega(evolution_workers=1)
+        agent.database = MemoryDatabase()
+        upstream = Upstream(delay=0)
+        reader = EventPriceReader('reader', upstream)
+        reader.market_data = agent.market_data
+        agent.strategies = {'reader': reader}
+        events = [Event('SWAP', {'i': i}) for i in range(20)]
+        await agent.run_event_driven([ReplaySource(events)], market_data_interval=60.0)
+        self.assertEqual(upstream.calls, 1)
+
+    async def test_without_cache_fetches_directly(self):
+        upstream = Upstream(delay=0)
+        reader = PriceReader('solo', upstream)
+        await reader.generate_signal()
+        await reader.generate_signal()
+        self.assertEqual(upstream.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
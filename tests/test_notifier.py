@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.integrations.notifier import (
+    MAX_MESSAGE_LENGTH, NotificationDispatcher, NotificationError, RetryAfter, TokenBucket
+)
+from agent.integrations.telegram import TelegramClient
+
+
+class FakeTransport:
+    def __init__(self, failures=(), delay=0.0):
+        self.failures = list(failures)
+        self.delay = delay
+        self.sent = []
+
+    async def __call__(self, chat, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append((chat, text, time.monotonic()))
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=2.0, capacity=2.0)
+        now = bucket.updated
+        bucket.consume(now)
+        bucket.consume(now)
+        self.assertAlmostEqual(bucket.delay(now), 0.5)
+        self.assertEqual(bucket.delay(now + 0.5), 0.0)
+
+
+class TestNotificationDispatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_notify_never_waits_on_the_transport(self):
+        transport = FakeTransport(delay=1.0)
+        dispatcher = NotificationDispatcher(chat_id='1', transport=transport)
+        start = time.monotonic()
+        for i in range(100):
+            await TelegramClient(dispatcher).send_notification(f"trade {i}")
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertEqual(dispatcher.stats()['pending'], 100)
+        await dispatcher.close(timeout=0)
+
+    async def test_burst_is_merged_into_one_digest(self):
+        transport = FakeTransport()
+        dispatcher = NotificationDispatcher(chat_id='1', digest_window=0.05, transport=transport)
+        for i in range(5):
+            dispatcher.notify(f"msg {i}")
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(transport.sent), 1)
+        self.assertEqual(transport.sent[0][1].split('\n\n'), [f"msg {i}" for i in range(5)])
+        self.assertEqual(dispatcher.stats()['sent'], 5)
+        await dispatcher.close()
+
+    async def test_digests_split_at_telegram_limit(self):
+        transport = FakeTransport()
+        dispatcher = NotificationDispatcher(chat_id='1', digest_window=0, chat_burst=10, transport=transport)
+        for _ in range(3):
+            dispatcher.notify('x' * 3000)
+        await dispatcher.close()
+        self.assertEqual(len(transport.sent), 3)
+        self.assertTrue(all(len(text) <= MAX_MESSAGE_LENGTH for _, text, _ in transport.sent))
+
+    async def test_per_chat_rate_limit(self):
+        transport = FakeTransport()
+        dispatcher = NotificationDispatcher(
+            digest_window=0, chat_rate=20.0, chat_burst=1.0, transport=transport
+        )
+        for i in range(3):
+            dispatcher.notify('a', chat_id='a', urgent=True)
+            dispatcher.notify('b', chat_id='b', urgent=True)
+            await asyncio.sleep(0.01)
+        await dispatcher.close()
+        times_a = [t for chat, _, t in transport.sent if chat == 'a']
+        times_b = [t for chat, _, t in transport.sent if chat == 'b']
+        # Chats are limited independently, ~50ms apart within each chat
+        self.assertGreaterEqual(len(times_a), 2)
+        self.assertGreaterEqual(len(times_b), 2)
+        for times in (times_a, times_b):
+            for earlier, later in zip(times, times[1:]):
+                self.assertGreaterEqual(later - earlier, 0.04)
+
+    async def test_retries_with_backoff_and_retry_after(self):
+        transport = FakeTransport(failures=[RuntimeError('502'), RetryAfter(0.02)])
+        dispatcher = NotificationDispatcher(chat_id='1', digest_window=0, backoff=0.01, transport=transport)
+        dispatcher.notify('hello')
+        await dispatcher.close()
+        self.assertEqual([text for _, text, _ in transport.sent], ['hello'])
+        self.assertEqual(dispatcher.stats()['retries'], 2)
+
+    async def test_permanent_errors_are_not_retried(self):
+        transport = FakeTransport(failures=[NotificationError('chat not found')])
+        dispatcher = NotificationDispatcher(chat_id='1', digest_window=0, transport=transport)
+        dispatcher.notify('hello')
+        await dispatcher.close()
+        stats = dispatcher.stats()
+        self.assertEqual((stats['failed'], stats['retries'], stats['sent']), (1, 0, 0))
+
+    async def test_flush_returns_when_the_last_send_finishes(self):
+        transport = FakeTransport(delay=0.05)
+        dispatcher = NotificationDispatcher(chat_id='1', digest_window=60, transport=transport)
+        dispatcher.notify('a')
+        dispatcher.notify('b', chat_id='2')
+        await dispatcher.flush(timeout=1.0)
+        self.assertEqual(len(transport.sent), 2)
+        self.assertEqual(dispatcher.stats()['pending'], 0)
+        await dispatcher.close()
+
+    async def test_stdout_fallback_keeps_alerts_distinct(self):
+        with mock.patch.dict(os.environ, {'TELEGRAM_BOT_TOKEN': ''}):
+            client = TelegramClient(NotificationDispatcher(chat_id='1'))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            await client.send_notification('cycle done')
+            await client.send_alert('health check failed')
+        self.assertEqual(out.getvalue().splitlines(), [
+            'TELEGRAM NOTIFICATION: cycle done',
+            'TELEGRAM ALERT: health check failed'
+        ])
+        await client.close()
+
+    async def test_close_flushes_the_digest_window(self):
+        transport = FakeTransport()
+        dispatcher = NotificationDispatcher(chat_id='1', digest_window=60, transport=transport)
+        dispatcher.notify('shutting down')
+        await dispatcher.close(timeout=1.0)
+        self.assertEqual(len(transport.sent), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
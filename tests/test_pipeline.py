@@ -0,0 +1,102 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.pipeline import Pipeline, Stage
+
+
+class TestPipeline(unittest.IsolatedAsyncioTestCase):
+
+    async def test_single_workers_keep_input_order(self):
+        async def double(x):
+            await asyncio.sleep(0.001 * (x % 3))
+            return x * 2
+
+        async def drop_odd(x):
+            return x if x % 4 == 0 else None
+
+        pipeline = Pipeline([Stage('double', double), Stage('filter', drop_odd)])
+        self.assertEqual(await pipeline.run(range(10)), [0, 4, 8, 12, 16])
+        stats = pipeline.stats()
+        self.assertEqual((stats['double']['processed'], stats['double']['emitted']), (10, 10))
+        self.assertEqual((stats['filter']['processed'], stats['filter']['emitted']), (10, 5))
+
+    async def test_fan_out_emits_each_item(self):
+        async def explode(n):
+            return [f'{n}.{i}' for i in range(n)]
+
+        async def identity(x):
+            return x
+
+        pipeline = Pipeline([Stage('explode', explode, 2, fan_out=True), Stage('out', identity)])
+        results = await pipeline.run([1, 2, 3])
+        self.assertEqual(sorted(results), ['1.0', '2.0', '2.1', '3.0', '3.1', '3.2'])
+        self.assertEqual(pipeline.stats()['explode']['emitted'], 6)
+
+    async def test_batches_take_what_is_already_queued(self):
+        batches = []
+
+        async def record(items):
+            batches.append(list(items))
+            return [item * 10 for item in items if item % 2 == 0]
+
+        pipeline = Pipeline([Stage('batch', record, batch_size=4)])
+        self.assertEqual(await pipeline.run(range(10)), [0, 20, 40, 60, 80])
+        self.assertEqual(sum(batches, []), list(range(10)))
+        self.assertTrue(all(len(batch) <= 4 for batch in batches))
+        stats = pipeline.stats()['batch']
+        self.assertEqual((stats['processed'], stats['emitted']), (10, 5))
+
+    async def test_errors_are_counted_and_skip_the_item(self):
+        async def fragile(x):
+            if x == 3:
+                raise ValueError('boom')
+            return x
+
+        pipeline = Pipeline([Stage('fragile', fragile, concurrency=3)])
+        self.assertEqual(sorted(await pipeline.run(range(6))), [0, 1, 2, 4, 5])
+        stats = pipeline.stats()['fragile']
+        self.assertEqual((stats['processed'], stats['errors'], stats['emitted']), (6, 1, 5))
+
+    async def test_cancellation_stops_every_worker(self):
+        started = asyncio.Event()
+
+        async def hang(x):
+            started.set()
+            await asyncio.sleep(60)
+
+        before = asyncio.all_tasks()
+        run = asyncio.create_task(Pipeline([Stage('a', hang, 2), Stage('b', hang, 2)]).run(range(5)))
+        await started.wait()
+        run.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await run
+        await asyncio.sleep(0)
+        leftover = [t for t in asyncio.all_tasks() - before if not t.done()]
+        self.assertEqual(leftover, [])
+
+    async def test_bounded_queues_hold_back_fast_stages(self):
+        release = asyncio.Event()
+
+        async def fast(x):
+            return x
+
+        async def slow(x):
+            await release.wait()
+            return x
+
+        fast_stage = Stage('fast', fast, queue_size=1)
+        pipeline = Pipeline([fast_stage, Stage('slow', slow, queue_size=2)])
+        run = asyncio.create_task(pipeline.run(range(100)))
+        await asyncio.sleep(0.05)
+        # One item in the slow worker, two queued for it, one blocked in put
+        self.assertEqual(fast_stage.processed, 4)
+        release.set()
+        self.assertEqual(await run, list(range(100)))
+
+
+if __name__ == '__main__':
+    unittest.main()
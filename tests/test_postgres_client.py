@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.agent import CryptoGeneOmega
+from agent.core.state_manager import StateManager
+from agent.integrations.database import PostgresDatabaseClient
+from test_profiler import FakeOrchestrator, FakeTelegram
+
+
+class EmptyStrategiesPool:
+    """asyncpg pool stand-in over an empty strategies table; records writes."""
+
+    def __init__(self):
+        self.executed = []
+
+    async def fetch(self, query, *args):
+        return []
+
+    async def fetchval(self, query, *args):
+        return None
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+    def acquire(self):
+        return self
+
+    def transaction(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestEmptyStrategiesTable(unittest.IsolatedAsyncioTestCase):
+
+    async def test_new_strategies_execute(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            agent = CryptoGeneOmega(evolution_workers=1)
+            agent.database = PostgresDatabaseClient(write_behind=False)
+            agent.database.pool = EmptyStrategiesPool()
+            agent.orchestrator = FakeOrchestrator()
+            agent.telegram = FakeTelegram()
+            agent.state_manager = StateManager(os.path.join(tmp, 'state.json'))
+            await agent.execute_cycle()
+
+        snapshot = await agent.database.get_strategy_snapshot(['arbitrage'])
+        self.assertGreaterEqual(snapshot['arbitrage']['belief_score'], agent.executor.min_confidence)
+
+        logged = [
+            result
+            for query, args in agent.database.pool.executed
+            if query == PostgresDatabaseClient.SQL_INSERT_EXECUTIONS
+            for result in args[3]
+        ]
+        self.assertEqual(len(logged), len(agent.strategies))
+        self.assertNotIn('insufficient_confidence', [result.get('reason') for result in logged])
+
+
+if __name__ == '__main__':
+    unittest.main()
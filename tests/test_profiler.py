@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'skills', 'ralph-analytics', 'scripts'))
+
+from agent.core.agent import CryptoGeneOmega
+from agent.core.profiler import CycleProfiler, LatencyHistogram
+from agent.core.state_manager import StateManager
+from compare_sessions import load_session_metrics
+
+
+class FakeDatabase:
+    buffer = None
+
+    async def get_strategy_snapshot(self, names):
+        return {name: {'enabled': True, 'belief_score': 0.7, 'parameters': {}} for name in names}
+
+    async def log_execution(self, strategy_name, result):
+        pass
+
+    async def update_belief_score(self, strategy_name, score):
+        pass
+
+    async def flush(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+
+class FakeOrchestrator:
+    async def health_check(self):
+        return {'ok': True}
+
+
+class FakeTelegram:
+    async def send_notification(self, message):
+        pass
+
+    async def send_alert(self, message):
+        pass
+
+    async def close(self):
+        pass
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles_within_bucket_resolution(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(float(ms))
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.summary()['mean_ms'], 500.5)
+        # Bucket edges are 2 ** (1/4) apart: upper edges overshoot by < 19%
+        for q, exact in ((0.5, 500), (0.95, 950), (0.99, 990)):
+            self.assertGreaterEqual(histogram.percentile(q), exact)
+            self.assertLess(histogram.percentile(q), exact * 1.19)
+        self.assertEqual(histogram.percentile(1.0), 1000.0)
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = CycleProfiler(enabled=False)
+        with profiler.stage('signal', 'yield'):
+            pass
+        self.assertEqual(profiler.histograms, {})
+
+
+class TestCycleProfiling(unittest.IsolatedAsyncioTestCase):
+
+    async def test_records_are_written_off_the_event_loop_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'performance.jsonl')
+            profiler = CycleProfiler(path)
+            for iteration in (1, 2, 3):
+                profiler.begin_cycle(iteration)
+                profiler.end_cycle()
+            self.assertFalse(os.path.exists(path))
+            await profiler.flush()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        durations = [r['iteration'] for r in records if r['metric']['type'] == 'iteration_duration']
+        self.assertEqual(durations, [1, 2, 3])
+
+    async def test_cycle_writes_ralph_compatible_stream(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'performance.jsonl')
+            agent = CryptoGeneOmega(evolution_workers=1, performance_log=path)
+            agent.database = FakeDatabase()
+            agent.orchestrator = FakeOrchestrator()
+            agent.telegram = FakeTelegram()
+            agent.state_manager = StateManager(os.path.join(tmp, 'state.json'))
+            agent.profiler.profile_next_cycle(os.path.join(tmp, 'cycle.prof'))
+
+            await agent.execute_cycle()
+            await agent.execute_cycle()
+            await agent.shutdown()
+
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'cycle.prof')))
+            metrics = load_session_metrics(tmp)
+
+        durations = [r for r in records if r['metric']['type'] == 'iteration_duration']
+        self.assertEqual([r['iteration'] for r in durations], [1, 2])
+        self.assertGreater(metrics['avg_iteration_ms'], 0)
+
+        stages = {
+            (r['metric']['stage'], r['metric'].get('strategy'))
+            for r in records if r['metric']['type'] == 'stage_duration'
+        }
+        for stage in ('health_check', 'db_snapshot', 'strategies', 'notification', 'state_save'):
+            self.assertIn((stage, None), stages)
+        for stage in ('total', 'signal', 'db_log'):
+            self.assertIn((stage, 'yield_harvester'), stages)
+
+        histograms = [r for r in records if r['metric']['type'] == 'latency_histogram']
+        cycle = next(r['metric'] for r in histograms if r['metric']['stage'] == 'cycle')
+        self.assertEqual(cycle['count'], 2)
+        self.assertIn('p95_ms', cycle)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.executor import StrategyExecutor
+from agent.core.risk_engine import RiskEngine
+
+
+def buy(asset, size, **extra):
+    return {'type': 'buy', 'asset': asset, 'size': size, **extra}
+
+
+class TestRiskEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = RiskEngine(portfolio_value=10000.0, max_orders=3, rate_window=60.0)
+
+    def test_size_and_slippage_reasons_unchanged(self):
+        executor = StrategyExecutor()
+        self.assertEqual(executor._run_risk_management({'size': 0.2}), 'max_position_size_exceeded')
+        self.assertEqual(executor._run_risk_management({'slippage': 0.05}), 'max_slippage_exceeded')
+        self.assertIsNone(executor._run_risk_management({'type': 'buy', 'size': 0.05, 'asset': 'SOL'}))
+
+    def test_exposure_updates_incrementally_per_fill(self):
+        for now in (0.0, 100.0):
+            self.assertIsNone(self.engine.check(buy('SOL', 0.1), now=now))
+            self.engine.record_fill('SOL', 1000.0, now=now)
+        self.assertEqual(self.engine.check(buy('SOL', 0.1), now=200.0), 'max_asset_exposure_exceeded')
+        # Reducing exposure is always allowed
+        self.assertIsNone(self.engine.check({'type': 'sell', 'asset': 'SOL', 'size': 0.1}, now=200.0))
+        self.assertEqual(self.engine.gross_exposure, 2000.0)
+
+    def test_concentration(self):
+        self.engine.record_fill('SOL', 2000.0, now=-1000.0)
+        self.engine.record_fill('ETH', 500.0, now=-1000.0)
+        self.assertEqual(self.engine.check(buy('SOL', 0.02), now=0.0), 'max_concentration_exceeded')
+        self.assertIsNone(self.engine.check(buy('ETH', 0.02), now=0.0))
+
+    def test_rate_limit(self):
+        for now in (0.0, 1.0, 2.0):
+            self.engine.record_fill('SOL', 1.0, now=now)
+        self.assertEqual(self.engine.check(buy('ETH', 0.01), now=30.0), 'rate_limit_exceeded')
+        self.assertIsNone(self.engine.check(buy('ETH', 0.01), now=60.5))
+
+    def test_executor_limits_follow_portfolio_value(self):
+        executor = StrategyExecutor(portfolio_value=10000.0)
+        executor.risk_engine.record_fill('SOL', 2000.0, now=-1000.0)
+        executor.risk_engine.record_fill('ETH', 3000.0, now=-1000.0)
+        self.assertIsNone(executor._run_risk_management(buy('SOL', 0.05)))
+        executor.update_portfolio_value(5000.0)
+        self.assertEqual(executor._run_risk_management(buy('SOL', 0.05)), 'max_asset_exposure_exceeded')
+        # A missing valuation keeps the last one
+        self.assertEqual(executor.update_portfolio_value(None), 5000.0)
+
+    def test_arbitrage_is_sized_and_rate_limited_without_exposure(self):
+        cycle = {'type': 'arbitrage', 'asset': 'SOL', 'amount': 5.0, 'price': 100.0}
+        self.assertEqual(self.engine.order_notional(cycle), 500.0)
+        self.assertEqual(self.engine.signal_notional(cycle), 0.0)
+        self.assertEqual(self.engine.check({**cycle, 'amount': 20.0}), 'max_position_size_exceeded')
+        self.assertEqual(self.engine.check_signals([{**cycle, 'amount': 20.0}]), ['max_position_size_exceeded'])
+        self.engine.record_fill('SOL', 2500.0, now=-1000.0)
+        self.assertIsNone(self.engine.check(cycle, now=0.0))
+        for now in (0.0, 1.0, 2.0):
+            self.engine.record_fill('SOL', self.engine.signal_notional(cycle), now=now)
+        self.assertEqual(self.engine.gross_exposure, 2500.0)
+        self.assertEqual(self.engine.check(cycle, now=3.0), 'rate_limit_exceeded')
+
+    def test_batch_matches_sequential_checks(self):
+        signals = [
+            buy('SOL', 0.2),
+            buy('SOL', 0.1),
+            {'type': 'sell', 'asset': 'ETH', 'size': 0.05, 'slippage': 0.03},
+            buy('SOL', 0.1),
+            buy('SOL', 0.1),
+            {'type': 'hold'},
+            buy('ETH', 0.05),
+            buy('ETH', 0.05),
+        ]
+        self.assertEqual(self.engine.check_signals(signals, now=0.0), [
+            'max_position_size_exceeded',
+            None,
+            'max_slippage_exceeded',
+            None,
+            'max_asset_exposure_exceeded',
+            None,
+            None,
+            'rate_limit_exceeded',
+        ])
+
+    def test_batch_reuses_buffers(self):
+        rng = np.random.default_rng(0)
+        n = 1000
+        args = (rng.uniform(0, 0.12, n), rng.uniform(0, 0.03, n), rng.integers(-1, 4, n), rng.normal(0, 100, n))
+        first = self.engine.check_batch(*args, now=0.0)
+        second = self.engine.check_batch(*args, now=0.0)
+        self.assertTrue(np.shares_memory(first, second))
+
+
+if __name__ == '__main__':
+    unittest.main()
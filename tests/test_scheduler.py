@@ -0,0 +1,107 @@
+import asyncio
+import os
+import signal
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.scheduler import Scheduler
+
+
+class TestScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def run_for(self, scheduler, seconds):
+        runner = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await runner
+
+    async def test_fires_are_anchored_to_the_schedule(self):
+        scheduler = Scheduler()
+        starts = []
+
+        async def work():
+            starts.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+        scheduler.add('job', work, interval=0.05)
+        await self.run_for(scheduler, 0.52)
+        # Run time does not push later fires back: ~11 fires at 0.05s
+        self.assertGreaterEqual(len(starts), 10)
+        offsets = [(t - starts[0]) / 0.05 for t in starts]
+        for i, offset in enumerate(offsets):
+            self.assertAlmostEqual(offset, i, delta=0.4)
+
+    async def test_overlapping_fires_are_skipped(self):
+        scheduler = Scheduler()
+        job = scheduler.add('slow', lambda: asyncio.sleep(0.12), interval=0.05)
+        await self.run_for(scheduler, 0.3)
+        self.assertGreater(job.skipped, 0)
+        self.assertLessEqual(job.runs, 3)
+
+    async def test_overlapping_fires_coalesce_into_one_run(self):
+        scheduler = Scheduler()
+        starts = []
+
+        async def work():
+            starts.append(time.monotonic())
+            await asyncio.sleep(0.12)
+
+        job = scheduler.add('slow', work, interval=0.05, overlap='coalesce')
+        await self.run_for(scheduler, 0.14)
+        # Fires at 0.05 and 0.10 fold into a single run right after the first
+        self.assertEqual(job.coalesced, 2)
+        self.assertEqual(len(starts), 2)
+        self.assertAlmostEqual(starts[1] - starts[0], 0.12, delta=0.04)
+
+    async def test_stop_drains_in_flight_work(self):
+        scheduler = Scheduler(drain_timeout=1.0)
+        finished = []
+
+        async def work():
+            await asyncio.sleep(0.1)
+            finished.append(True)
+
+        scheduler.add('job', work, interval=10)
+        await self.run_for(scheduler, 0.01)
+        self.assertEqual(finished, [True])
+
+    async def test_drain_timeout_cancels(self):
+        scheduler = Scheduler(drain_timeout=0.05)
+        job = scheduler.add('stuck', lambda: asyncio.sleep(10), interval=10)
+        start = time.monotonic()
+        await self.run_for(scheduler, 0.01)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertFalse(job.running)
+
+    async def test_errors_do_not_stop_the_schedule(self):
+        scheduler = Scheduler()
+
+        async def fail():
+            raise RuntimeError('boom')
+
+        job = scheduler.add('flaky', fail, interval=0.02)
+        await self.run_for(scheduler, 0.1)
+        self.assertGreaterEqual(job.errors, 3)
+        self.assertEqual(job.errors, job.runs)
+
+    @unittest.skipUnless(hasattr(signal, 'SIGTERM') and os.name == 'posix', 'POSIX signals')
+    async def test_sigterm_stops_gracefully(self):
+        scheduler = Scheduler()
+        job = scheduler.add('job', lambda: asyncio.sleep(0.05), interval=10)
+        runner = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0)
+        scheduler.install_signal_handlers((signal.SIGTERM,))
+        try:
+            await asyncio.sleep(0.01)
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.wait_for(runner, 1.0)
+        finally:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGTERM)
+        self.assertEqual(job.runs, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.core.state_manager import StateManager
+
+
+class TestStateManager(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    async def test_missing_state_returns_none(self):
+        self.assertIsNone(await StateManager(self.path('state.json')).load_state())
+
+    async def test_round_trip_replays_delta_log(self):
+        for name in ('state.json', 'state.pickle'):
+            manager = StateManager(self.path(name))
+            await manager.save_state({'execution_count': 1, 'last_summary': {'total': 6}})
+            await manager.save_state({'execution_count': 2, 'last_summary': {'total': 6}})
+            await manager.save_state({'execution_count': 3})
+
+            state = await StateManager(self.path(name)).load_state()
+            self.assertEqual(state, {'execution_count': 3})
+
+    async def test_saves_append_only_changes(self):
+        manager = StateManager(self.path('state.json'))
+        await manager.save_state({'execution_count': 1, 'history': list(range(1000))})
+        snapshot_size = os.path.getsize(manager.filepath)
+
+        await manager.save_state({'execution_count': 2, 'history': list(range(1000))})
+        self.assertEqual(os.path.getsize(manager.filepath), snapshot_size)
+        self.assertLess(os.path.getsize(manager.log_path), 100)
+
+    async def test_compacts_into_snapshot(self):
+        manager = StateManager(self.path('state.pickle'), compact_every=3)
+        for i in range(4):
+            await manager.save_state({'execution_count': i, 'pnl': Decimal('0.01') * i})
+        self.assertEqual(os.path.getsize(manager.log_path), 0)
+
+        state = await StateManager(self.path('state.pickle')).load_state()
+        self.assertEqual(state, {'execution_count': 3, 'pnl': Decimal('0.03')})
+
+    async def test_discards_torn_tail(self):
+        manager = StateManager(self.path('state.json'))
+        await manager.save_state({'execution_count': 1})
+        await manager.save_state({'execution_count': 2})
+        with open(manager.log_path, 'ab') as f:
+            f.write(b'{"set":{"execution_c')
+
+        reloaded = StateManager(self.path('state.json'))
+        self.assertEqual(await reloaded.load_state(), {'execution_count': 2})
+        await reloaded.save_state({'execution_count': 3})
+        self.assertEqual(await StateManager(self.path('state.json')).load_state(), {'execution_count': 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import utils
+
+
+@mock.patch.dict(os.environ, {'TELEGRAM_BOT_TOKEN': 'token', 'TELEGRAM_CHAT_ID': 'main'})
+class TestTelegramSender(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        utils._telegram_pending.clear()
+        utils._telegram_buckets.clear()
+        self.posts = []
+
+        async def post(message, chat_id):
+            self.posts.append((asyncio.get_running_loop().time(), chat_id, message))
+
+        patcher = mock.patch.object(utils, '_post_telegram', post)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addAsyncCleanup(utils.flush_notifications)
+
+    async def test_messages_within_the_window_are_one_digest(self):
+        with mock.patch.object(utils, 'TELEGRAM_DIGEST_WINDOW', 0.05):
+            for text in ('a', 'b', 'c'):
+                await utils.send_telegram_notification(text)
+            await asyncio.sleep(0.1)
+        self.assertEqual([(chat, message) for _, chat, message in self.posts], [('main', 'a\n\nb\n\nc')])
+
+    async def test_each_chat_is_paced_by_its_own_bucket(self):
+        with mock.patch.multiple(utils, TELEGRAM_CHAT_RATE=10.0, TELEGRAM_CHAT_BURST=1.0):
+            await utils.send_telegram_notification('first')
+            await utils.flush_notifications()
+            await utils.send_telegram_notification('second')
+            await utils.send_telegram_notification('other', chat_id='side')
+            await utils.flush_notifications()
+        self.assertEqual([message for _, _, message in self.posts], ['first', 'other', 'second'])
+        self.assertGreaterEqual(self.posts[2][0] - self.posts[0][0], 0.09)
+
+    async def test_messages_queued_after_the_worker_stops_are_kept(self):
+        await utils.send_telegram_notification('a')
+        utils._telegram_worker.cancel()
+        await asyncio.gather(utils._telegram_worker, return_exceptions=True)
+        await utils.send_telegram_notification('b')
+        await utils.flush_notifications()
+        self.assertEqual([message for _, _, message in self.posts], ['a\n\nb'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'crypto-agent-omega'))
+
+from agent.integrations.database import WriteBehindBuffer
+
+
+class TestWriteBehindBuffer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.batches = []
+
+        async def writer(records):
+            self.batches.append(list(records))
+
+        self.writer = writer
+
+    async def test_flushes_on_size_threshold(self):
+        buffer = WriteBehindBuffer({'execution': self.writer}, batch_size=3, flush_interval=60)
+        buffer.start()
+        for i in range(3):
+            await buffer.put('execution', i)
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.batches, [[0, 1, 2]])
+        await buffer.stop()
+
+    async def test_flushes_on_time_threshold(self):
+        buffer = WriteBehindBuffer({'execution': self.writer}, batch_size=100, flush_interval=0.02)
+        buffer.start()
+        await buffer.put('execution', 'a')
+        await asyncio.sleep(0.06)
+        self.assertEqual(self.batches, [['a']])
+        await buffer.stop()
+
+    async def test_stop_drains_queue(self):
+        buffer = WriteBehindBuffer({'execution': self.writer}, batch_size=2, flush_interval=60)
+        for i in range(5):
+            await buffer.put('execution', i)
+        await buffer.stop()
+        self.assertEqual(self.batches, [[0, 1], [2, 3], [4]])
+        stats = buffer.stats()
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['flushed'], 5)
+
+    async def test_full_queue_applies_backpressure(self):
+        buffer = WriteBehindBuffer({'execution': self.writer}, max_size=2, flush_interval=60)
+        await buffer.put('execution', 1)
+        await buffer.put('execution', 2)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(buffer.put('execution', 3), timeout=0.02)
+
+    async def test_stop_during_flush_loses_nothing(self):
+        written = []
+
+        async def slow_writer(records):
+            await asyncio.sleep(0.05)
+            written.extend(records)
+
+        buffer = WriteBehindBuffer({'execution': slow_writer}, batch_size=2, flush_interval=60)
+        buffer.start()
+        for i in range(4):
+            await buffer.put('execution', i)
+        await asyncio.sleep(0.01)  # background flush is mid-write
+        await buffer.stop()
+        self.assertEqual(sorted(written), [0, 1, 2, 3])
+        self.assertEqual(buffer.stats()['dropped'], 0)
+
+    async def test_failed_writes_are_retried(self):
+        attempts = []
+
+        async def flaky_writer(records):
+            attempts.append(list(records))
+            if len(attempts) == 1:
+                raise ConnectionError('database down')
+
+        buffer = WriteBehindBuffer({'execution': flaky_writer}, batch_size=10, flush_interval=60)
+        await buffer.put('execution', 'a')
+        await buffer.flush()
+        self.assertEqual(buffer.stats()['retry_backlog'], 1)
+        await buffer.put('execution', 'b')
+        await buffer.stop()
+        self.assertEqual(attempts, [['a'], ['a'], ['b']])
+        stats = buffer.stats()
+        self.assertEqual((stats['flushed'], stats['dropped'], stats['retried']), (2, 0, 1))
+
+    async def test_stop_drops_records_that_keep_failing(self):
+        async def broken_writer(records):
+            raise ConnectionError('database down')
+
+        buffer = WriteBehindBuffer({'execution': broken_writer}, flush_interval=60)
+        await buffer.put('execution', 'a')
+        await buffer.stop()
+        self.assertEqual(buffer.stats()['dropped'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()